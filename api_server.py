@@ -1,10 +1,15 @@
 from fastapi import FastAPI, HTTPException, APIRouter
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response
+import asyncio
 import json
 import os
 from pathlib import Path
 from typing import Optional, List
 import uvicorn
+from pyquotex.utils.metrics import REGISTRY, CONTENT_TYPE, MetricsMiddleware, register_process_metrics, watch_event_loop
+from pyquotex.utils.market_status import MarketStatusStore
+from pyquotex.utils.bus import open_bus, MarketView
 
 app = FastAPI(
     title="OTC Market Data API",
@@ -20,16 +25,51 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(MetricsMiddleware)
+register_process_metrics()
+
+@app.on_event("startup")
+async def start_metrics():
+    asyncio.create_task(watch_event_loop())
+    if VIEW is not None:
+        VIEW.start(await open_bus(BUS_URL))
+
+@app.get("/metrics")
+async def metrics():
+    """Prometheus scrape endpoint"""
+    return Response(REGISTRY.render(), media_type=CONTENT_TYPE)
 
 # Prefix all routes with /lux
 router = APIRouter(prefix="/lux")
 
 # Data directories
 DATA_DIR = Path(__file__).parent / "data"
+MARKET_STATUS = MarketStatusStore(DATA_DIR / "market_status.json")
 RECENT_DIR = DATA_DIR / "recent"
 DAILY_DIR = DATA_DIR / "24h"
 MONTHLY_DIR = DATA_DIR / "monthly"
 
+# Follow the ingest process on the pub/sub bus instead of polling data/ files,
+# e.g. LUX_BUS=unix:///tmp/pyquotex.sock
+BUS_URL = os.getenv("LUX_BUS")
+VIEW = MarketView() if BUS_URL else None
+
+def read_live_candle(asset: str):
+    """Current 1M candle of an asset, from the bus view or the collector's snapshot file"""
+    if VIEW is not None:
+        candle = VIEW.candle(asset)
+        if candle and asset in VIEW.status:
+            candle = dict(candle, market_open=VIEW.status[asset]['open'])
+        return candle
+    snapshot_file = DATA_DIR / "live_snapshot.json"
+    if snapshot_file.exists():
+        try:
+            with open(snapshot_file, 'r') as f:
+                return json.load(f).get(asset)
+        except:
+            pass
+    return None
+
 @router.get("/")
 async def root():
     """API Information"""
@@ -88,15 +128,7 @@ async def get_recent_data(asset: str, limit: Optional[int] = None):
             candles = json.load(f)
         
         # 2. Get Live Snapshot (for 1s level accuracy)
-        snapshot_file = DATA_DIR / "live_snapshot.json"
-        live_candle = None
-        if snapshot_file.exists():
-            try:
-                with open(snapshot_file, 'r') as f:
-                    snapshot = json.load(f)
-                    live_candle = snapshot.get(asset)
-            except:
-                pass
+        live_candle = read_live_candle(asset)
         
         # 3. Merge Live Candle into History if newer
         if live_candle and candles:
@@ -201,26 +233,19 @@ async def get_latest_price(asset: str):
     Returns live data if market is OPEN, or last known data with CLOSED status
     """
     try:
-        # 1. Try Live Snapshot first (Real-time aggregated by collector)
-        snapshot_file = DATA_DIR / "live_snapshot.json"
-        if snapshot_file.exists():
-            try:
-                with open(snapshot_file, 'r') as f:
-                    snapshot = json.load(f)
-                    if asset in snapshot:
-                        live_data = snapshot[asset]
-                        status = "LIVE" if live_data.get('market_open', True) else "CLOSED"
-                        return {
-                            "asset": asset,
-                            "price": live_data['close'],
-                            "timestamp": live_data['time'],
-                            "market_open": live_data.get('market_open', True),
-                            "status": status,
-                            "candle": live_data,
-                            "source": "live_streaming"
-                        }
-            except:
-                pass
+        # 1. Try Live Snapshot first (Real-time aggregated by collector, or the bus view)
+        live_data = read_live_candle(asset)
+        if live_data:
+            status = "LIVE" if live_data.get('market_open', True) else "CLOSED"
+            return {
+                "asset": asset,
+                "price": live_data['close'],
+                "timestamp": live_data['time'],
+                "market_open": live_data.get('market_open', True),
+                "status": status,
+                "candle": live_data,
+                "source": "live_streaming"
+            }
 
         # 2. Fallback to Recent files (Saved every 10s)
         file_path = RECENT_DIR / f"{asset}.json"
@@ -280,13 +305,10 @@ async def get_latest_price(asset: str):
 async def get_market_status(asset: str):
     """Get real-time market status from broker"""
     try:
-        # Read from a status cache file that the harvester updates
-        status_file = DATA_DIR / "market_status.json"
-        if status_file.exists():
-            with open(status_file, 'r') as f:
-                all_status = json.load(f)
-                return all_status.get(asset)
-        return None
+        if VIEW is not None and asset in VIEW.status:
+            return VIEW.status[asset]
+        # The harvester rewrites the file atomically, it is parsed again only when it changed
+        return MARKET_STATUS.get(asset)
     except:
         return None
 
@@ -6,7 +6,6 @@ import random
 import asyncio
 import logging
 import argparse
-import pyfiglet
 from pathlib import Path
 from typing import Optional, Tuple, List, Dict, Any, Callable
 from functools import wraps
@@ -155,6 +154,7 @@ class PyQuotexCLI:
 
     def display_banner(self):
         """Displays the application banner, including the private version ad."""
+        import pyfiglet
         custom_font = pyfiglet.Figlet(font="ansi_shadow")
         ascii_art = custom_font.renderText("PyQuotex")
 
@@ -375,7 +375,7 @@ class PyQuotexCLI:
         """Gets payment information (payout) for all assets."""
         logger.info("Getting payment information.")
 
-        all_data = self.client.get_payment()
+        all_data = await self.client.get_payment()
         if not all_data:
             logger.warning("No payment information found.")
             print("⚠️ No payment information found.")
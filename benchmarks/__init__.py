@@ -0,0 +1,5 @@
+"""Benchmarks for the pyquotex client.
+
+``python -m benchmarks`` runs the tracked suite (see ``benchmarks/__main__.py``),
+the standalone scenarios run with ``python -m benchmarks.<name>``.
+"""
@@ -0,0 +1,79 @@
+"""Run the benchmark suite and optionally diff it against a baseline.
+
+    python -m benchmarks --quick --json bench.json
+    python -m benchmarks --compare benchmarks/baseline.json --threshold 0.25
+    python -m benchmarks indicators processor --save-baseline
+
+Results are written as JSON (``{"meta": ..., "results": {case: timings}}``),
+so two commits can be compared with ``--compare`` or any JSON diff. With
+``--compare`` the exit status is 1 when a case got slower than the threshold.
+"""
+import os
+import sys
+import json
+import argparse
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+BASELINE = os.path.join(ROOT, "benchmarks", "baseline.json")
+
+from benchmarks import harness  # noqa: E402
+
+
+def load_suites():
+    # pyquotex.config resolves session.json against the cwd at import time.
+    cwd = os.getcwd()
+    os.chdir(tempfile.mkdtemp(prefix="pyquotex-bench-"))
+    try:
+        from benchmarks import suite_client, suite_processing, suite_servers  # noqa: F401
+    finally:
+        os.chdir(cwd)
+
+
+def print_comparison(rows):
+    print(f"\n{'case':<48}{'baseline':>12}{'current':>12}{'ratio':>8}  status")
+    for key, previous, current, ratio, status in rows:
+        previous = f"{previous * 1000:>9.3f} ms" if previous is not None else f"{'-':>12}"
+        ratio = f"{ratio:>8.2f}" if ratio is not None else f"{'-':>8}"
+        print(f"{key:<48}{previous}{current * 1000:>9.3f} ms{ratio}  {status}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("select", nargs="*", help="Only run cases whose name contains one of these.")
+    parser.add_argument("--quick", action="store_true", help="Smaller inputs, for a fast smoke run.")
+    parser.add_argument("--min-time", type=float, default=0.5, help="Seconds spent timing each case at least.")
+    parser.add_argument("--json", help="Write the results to this file.")
+    parser.add_argument("--compare", nargs="?", const=BASELINE, help="Baseline results to diff against.")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Relative slowdown counted as a regression.")
+    parser.add_argument("--save-baseline", action="store_true", help=f"Merge the results into {BASELINE}.")
+    args = parser.parse_args()
+
+    load_suites()
+    results = harness.run_cases(args.select, quick=args.quick, min_time=args.min_time)
+    report = {"meta": harness.metadata(args.quick), "results": results}
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.save_baseline:
+        baseline = {"meta": report["meta"], "results": {}}
+        if os.path.exists(BASELINE):
+            with open(BASELINE) as f:
+                baseline["results"] = json.load(f)["results"]
+        baseline["results"].update(results)
+        with open(BASELINE, "w") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        rows = harness.compare(results, baseline["results"], args.threshold)
+        print_comparison(rows)
+        if any(status == "regression" for *_, status in rows):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
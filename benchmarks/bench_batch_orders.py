@@ -0,0 +1,73 @@
+"""Sequential ``Quotex.buy`` against pipelined ``Quotex.buy_many`` on the mock broker.
+
+The broker delays every ack by ``--ack-delay`` to stand in for the network
+round trip, so the batch should cost about one delay instead of one per order.
+
+    python -m benchmarks.bench_batch_orders --orders 20 --ack-delay 0.05
+"""
+import io
+import os
+import json
+import time
+import asyncio
+import argparse
+import contextlib
+
+from benchmarks.bench_order_path import ROOT, DURATION, connect_client
+from mock_broker import MockBroker
+
+ASSETS = [f"ASSET{i:02d}_otc" for i in range(100)]
+
+
+async def run_sequential(client, orders):
+    started = time.perf_counter()
+    for asset in ASSETS[:orders]:
+        status, _ = await client.buy(1, asset, "call", DURATION)
+        if not status:
+            raise RuntimeError("Order was not acknowledged by the mock broker.")
+    return (time.perf_counter() - started) * 1000
+
+
+async def run_batch(client, orders):
+    started = time.perf_counter()
+    results = await client.buy_many([(1, asset, "call", DURATION) for asset in ASSETS[:orders]])
+    elapsed = (time.perf_counter() - started) * 1000
+    if not all(r["success"] for r in results):
+        raise RuntimeError("Order was not acknowledged by the mock broker.")
+    return elapsed, [r["ack_ms"] for r in results]
+
+
+async def main(args):
+    broker = MockBroker(ack_delay=args.ack_delay).start_in_thread()
+    client = await connect_client(broker)
+    try:
+        for asset in ASSETS[:args.orders]:
+            await client.arm_order(asset, DURATION)
+        with contextlib.redirect_stdout(io.StringIO()):
+            sequential_ms = await run_sequential(client, args.orders)
+            batch_ms, ack_ms = await run_batch(client, args.orders)
+    finally:
+        await client.close()
+        broker.stop()
+
+    results = {
+        "orders": args.orders,
+        "ack_delay_ms": args.ack_delay * 1000,
+        "sequential_ms": sequential_ms,
+        "batch_ms": batch_ms,
+        "batch_ack_ms_max": max(ack_ms),
+        "speedup": sequential_ms / batch_ms,
+    }
+    for key, value in results.items():
+        print(f"{key:<18}{value:>12.3f}")
+    if args.json:
+        with open(os.path.join(ROOT, args.json), "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--orders", type=int, default=20, help="Orders per run, at most 100.")
+    parser.add_argument("--ack-delay", type=float, default=0.05, help="Broker-side ack delay in seconds.")
+    parser.add_argument("--json", help="Write the summary to this file (relative to the repo root).")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,80 @@
+"""Cold-start budget: import time of the client and the CLI, and the modules they load.
+
+    python -m benchmarks.bench_import --runs 10 --budget-ms 150
+
+Every run is a fresh interpreter with ``-X importtime``; the median of the
+cumulative time of the top-level import is reported. Exits with status 1
+when a median exceeds the budget or a deferred module is loaded eagerly,
+so it can gate a CI job.
+"""
+import os
+import re
+import sys
+import argparse
+import statistics
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Loaded on first use only: login page parsing, indicators, http pool, banner.
+DEFERRED = ("bs4", "numpy", "httpx", "pyfiglet", "requests", "certifi", "pyquotex.http.user_agents")
+
+TARGETS = {
+    "pyquotex.stable_api": ["-c", "import pyquotex.stable_api"],
+    "app.py --help": ["app.py", "--help"],
+}
+
+LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)")
+
+
+def profile(args):
+    """One cold run: ``({top-level module: cumulative µs}, {module: cumulative µs})``."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", *args], cwd=ROOT,
+        capture_output=True, text=True, env=dict(os.environ, PYTHONPATH=ROOT)
+    )
+    top, modules = {}, {}
+    for line in result.stderr.splitlines():
+        match = LINE.match(line)
+        if match is None:
+            continue
+        _, cumulative, indent, name = match.groups()
+        modules[name] = int(cumulative)
+        if not indent:
+            top[name] = int(cumulative)
+    return top, modules
+
+
+def main(args):
+    # Whatever the bare interpreter loads (site, .pth hooks) is not ours to defer.
+    _, startup = profile(["-c", "pass"])
+    failed = False
+    for name, command in TARGETS.items():
+        if args.only and name not in args.only:
+            continue
+        totals = []
+        for _ in range(args.runs):
+            top, modules = profile(command)
+            totals.append(sum(us for module, us in top.items() if module not in startup))
+        median = statistics.median(totals) / 1000
+        ours = [(m, us) for m, us in modules.items() if m not in startup]
+        slowest = sorted(ours, key=lambda item: item[1], reverse=True)[:args.top]
+        eager = [m for m in DEFERRED if m in modules and m not in startup]
+        over = args.budget_ms and median > args.budget_ms
+        print(f"{name:<24}{median:9.1f} ms  (min {min(totals) / 1000:.1f}, runs {args.runs})"
+              + ("  OVER BUDGET" if over else ""))
+        for module, cumulative in slowest:
+            print(f"    {module:<40}{cumulative / 1000:9.1f} ms")
+        if eager:
+            print(f"    eagerly imported: {', '.join(eager)}")
+        failed = failed or over or bool(eager)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("only", nargs="*", help=f"Targets to run, among {list(TARGETS)}.")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=8, help="Slowest modules listed per target.")
+    parser.add_argument("--budget-ms", type=float, default=0, help="Fail above this median, 0 to only report.")
+    sys.exit(main(parser.parse_args()))
@@ -0,0 +1,126 @@
+"""Submit-to-ack breakdown of ``Quotex.buy`` against the local mock broker.
+
+Compares the legacy path (re-subscribe and digest fetch on every order) with
+the pre-armed path, where only ``orders/open`` goes out at fire time.
+
+    python -m benchmarks.bench_order_path --orders 50 --json order_path.json
+"""
+import io
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import tempfile
+import statistics
+import contextlib
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+# pyquotex.config resolves session.json against the cwd at import time.
+os.chdir(tempfile.mkdtemp(prefix="pyquotex-bench-"))
+
+from mock_broker import MockBroker  # noqa: E402
+from pyquotex import global_value  # noqa: E402
+from pyquotex.api import QuotexAPI  # noqa: E402
+from pyquotex.stable_api import Quotex  # noqa: E402
+
+ASSET = "EURUSD_otc"
+DURATION = 60
+STAGES = ("prepare_ms", "ack_ms", "wakeup_ms", "total_ms")
+
+
+async def connect_client(broker):
+    client = Quotex(email="mock@localhost", password="mock")
+    api = QuotexAPI(
+        "127.0.0.1",
+        client.email,
+        client.password,
+        client.lang,
+        resource_path=client.resource_path,
+        subscriptions=client.subscriptions,
+        tick_listeners=client.tick_listeners,
+        catalog=client.catalog
+    )
+    api.wss_url = broker.url
+    api.https_url = broker.http_url
+    api.session_data = {"cookies": "", "token": "mock-token", "user_agent": "pyquotex-bench"}
+    api.current_asset = ASSET
+    api.current_period = DURATION
+    global_value.SSID = "mock-token"
+    client.api = api
+    check, reason = await api.connect(client.account_is_demo)
+    if not check:
+        raise ConnectionError(reason)
+    return client
+
+
+async def place_orders(client, broker, orders, armed):
+    timings = []
+    frames_before = len(broker.received)
+    if armed:
+        await client.arm_order(ASSET, DURATION)
+        frames_before = len(broker.received)
+    for _ in range(orders):
+        digest_ms = 0.0
+        if not armed:
+            # Before the fast path every order re-subscribed and fetched the digest.
+            client.armed_assets.clear()
+            started = time.perf_counter()
+            await client.get_profile(force=True)
+            digest_ms = (time.perf_counter() - started) * 1000
+        with contextlib.redirect_stdout(io.StringIO()):
+            status, _ = await client.buy(1, ASSET, "call", DURATION)
+        if not status:
+            raise RuntimeError("Order was not acknowledged by the mock broker.")
+        order_timings = dict(client.last_buy_timings)
+        order_timings["prepare_ms"] += digest_ms
+        order_timings["total_ms"] += digest_ms
+        timings.append(order_timings)
+    frames = (len(broker.received) - frames_before) / orders
+    return timings, frames
+
+
+def summarize(timings, frames):
+    summary = {"frames_per_order": frames}
+    for stage in STAGES:
+        values = sorted(t[stage] for t in timings)
+        summary[stage] = {
+            "p50": statistics.median(values),
+            "p95": values[int(0.95 * (len(values) - 1))],
+            "max": values[-1],
+        }
+    return summary
+
+
+async def main(args):
+    broker = MockBroker(ack_delay=args.ack_delay).start_in_thread()
+    client = await connect_client(broker)
+    results = {}
+    try:
+        for name, armed in (("legacy", False), ("armed", True)):
+            timings, frames = await place_orders(client, broker, args.orders, armed)
+            results[name] = summarize(timings, frames)
+    finally:
+        await client.close()
+        broker.stop()
+
+    print(f"{'path':<8}{'frames':>8}" + "".join(f"{s[:-3] + ' p50/p95':>22}" for s in STAGES))
+    for name, summary in results.items():
+        cells = "".join(
+            f"{summary[s]['p50']:>11.3f}/{summary[s]['p95']:<10.3f}" for s in STAGES
+        )
+        print(f"{name:<8}{summary['frames_per_order']:>8.1f}{cells}")
+
+    if args.json:
+        with open(os.path.join(ROOT, args.json), "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--orders", type=int, default=20, help="Orders per path.")
+    parser.add_argument("--ack-delay", type=float, default=0.0, help="Broker-side ack delay in seconds.")
+    parser.add_argument("--json", help="Write the summary to this file (relative to the repo root).")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,72 @@
+"""Replay a recorded journal or a synthetic trading day through the ingestion path.
+
+Frames go through ``WebsocketClient.on_message`` while a consumer drains the
+tick buffers into a :class:`CandleStore` every 100 ms, like the dashboard's
+harvester loop.
+
+    python -m benchmarks.bench_replay --assets 20 --hours 24
+    python -m benchmarks.bench_replay --journal data/journal --speed 10
+"""
+import os
+import sys
+import json
+import asyncio
+import argparse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from pyquotex.utils.candle_store import CandleStore  # noqa: E402
+from pyquotex.utils.replay import ReplayDriver, synthetic_frames, journal_frames  # noqa: E402
+
+
+async def drain(driver, store):
+    api = driver.api
+    while True:
+        for asset in list(api.realtime_price.keys()):
+            ticks = api.realtime_price[asset]
+            if ticks:
+                api.realtime_price[asset] = []
+                for tick in ticks:
+                    store.add_tick(asset, tick["price"], tick["time"])
+        if driver.stats is not None:
+            return
+        await asyncio.sleep(0.1)
+
+
+async def main(args):
+    if args.journal:
+        frames = journal_frames(os.path.join(ROOT, args.journal))
+    else:
+        assets = [f"ASSET{i:02d}_otc" for i in range(args.assets)]
+        frames = synthetic_frames(assets, seconds=args.hours * 3600, ticks_per_second=args.tps)
+    driver = ReplayDriver(frames, speed=args.speed)
+    store = CandleStore(60)
+    driver.start()
+    await drain(driver, store)
+    stats = driver.join()
+    stats["candles"] = sum(len(t) for t in store.times.values())
+
+    print(f"frames         {stats['frames']:>14,}")
+    print(f"elapsed        {stats['elapsed_s']:>14.2f} s")
+    print(f"recorded span  {stats['recorded_span_s']:>14.0f} s")
+    print(f"throughput     {stats['frames_per_s']:>14,.0f} frames/s")
+    print(f"max lag        {stats['max_lag_ms']:>14.2f} ms")
+    print(f"rss growth     {stats['max_rss_growth_kb']!s:>14} kB")
+    print(f"candles built  {stats['candles']:>14,}")
+    for stage, values in sorted(stats["stages"].items()):
+        print(f"  {stage:<14}{values['count']:>12,}  p50 {values['p50_us']:8.1f} us  p99 {values['p99_us']:8.1f} us")
+    if args.json:
+        with open(os.path.join(ROOT, args.json), "w") as f:
+            json.dump(stats, f, indent=2)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--journal", help="Journal directory to replay (relative to the repo root).")
+    parser.add_argument("--assets", type=int, default=10, help="Synthetic assets.")
+    parser.add_argument("--hours", type=float, default=24, help="Synthetic hours of market data.")
+    parser.add_argument("--tps", type=float, default=1.0, help="Synthetic ticks per second per asset.")
+    parser.add_argument("--speed", type=float, default=0, help="1 for real time, N for N times faster, 0 for max.")
+    parser.add_argument("--json", help="Write the report to this file (relative to the repo root).")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,178 @@
+"""Sharded harvesting against the local mock broker.
+
+Runs :class:`shard_supervisor.Supervisor` with `--workers` connections over
+the mock's open assets, kills one worker half way and reports per-shard
+throughput, the merged stream's lag and ordering, and how long the dead
+shard's assets went without ticks. With `--bus` the merged stream is also
+published and read back by a separate subscriber, as an API server would.
+
+    python -m benchmarks.bench_shards --workers 4 --assets 80 --seconds 20
+    python -m benchmarks.bench_shards --bus unix:///tmp/pyquotex-bench.sock
+    python -m benchmarks.bench_shards --mock-redis
+"""
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import tempfile
+import statistics
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+# pyquotex.config resolves session.json against the cwd at import time.
+os.chdir(tempfile.mkdtemp(prefix="pyquotex-bench-"))
+
+from pyquotex import global_value  # noqa: E402
+from pyquotex.api import QuotexAPI  # noqa: E402
+from pyquotex.stable_api import Quotex  # noqa: E402
+from pyquotex.utils.bus import open_bus, TICK  # noqa: E402
+from shard_supervisor import Supervisor  # noqa: E402
+
+
+async def mock_client(shard, options):
+    """Client factory of the workers, pointed at the mock broker."""
+    client = Quotex(email="mock@localhost", password="mock", root_path=f"shard-{shard}")
+    api = QuotexAPI(
+        "127.0.0.1",
+        client.email,
+        client.password,
+        client.lang,
+        resource_path=client.resource_path,
+        subscriptions=client.subscriptions,
+        tick_listeners=client.tick_listeners,
+        catalog=client.catalog
+    )
+    api.wss_url = options["broker_url"]
+    api.https_url = options["broker_http_url"]
+    api.session_data = {"cookies": "", "token": f"mock-token-{shard}", "user_agent": "pyquotex-bench"}
+    api.current_asset = client.asset_default
+    api.current_period = client.period_default
+    global_value.SSID = f"mock-token-{shard}"
+    client.api = api
+    check, reason = await api.connect(client.account_is_demo)
+    if not check:
+        raise ConnectionError(reason)
+    return client
+
+
+async def run(args):
+    from mock_broker import MockBroker
+    broker = MockBroker(assets=args.assets, tick_rate=args.tick_rate)
+    broker.start_in_thread()
+    redis = None
+    if args.mock_redis:
+        from mock_redis import MockRedis
+        redis = MockRedis().start_in_thread()
+        args.bus = redis.url
+    bus = reader = None
+    if args.bus:
+        bus = await open_bus(args.bus, serve=True)
+        reader = bus if args.bus.startswith("local:") else await open_bus(args.bus)
+    supervisor = Supervisor(
+        args.workers,
+        {
+            "client_factory": "benchmarks.bench_shards:mock_client",
+            "broker_url": broker.url,
+            "broker_http_url": broker.http_url,
+            "log_level": "WARNING",
+        },
+        restart_backoff=args.restart_backoff,
+        report_interval=args.seconds,
+        bus=bus
+    )
+    merged = supervisor.subscribe(maxsize=0)
+    received = []
+    killed = {}
+    bus_events = {}
+    bus_lags = []
+
+    async def read_bus():
+        async for topic, event in reader.subscribe():
+            bus_events[topic] = bus_events.get(topic, 0) + 1
+            if topic == TICK:
+                bus_lags.append((time.time() - event["time"]) * 1000)
+
+    async def consume():
+        while True:
+            tick = await merged.get()
+            received.append((time.time(), tick))
+
+    async def kill():
+        await asyncio.sleep(args.seconds / 2)
+        victim = supervisor.shards[0]
+        killed["assets"] = set(supervisor.assignment.get(0, []))
+        killed["at"] = time.time()
+        victim["process"].kill()
+
+    consumer = asyncio.create_task(consume())
+    killer = asyncio.create_task(kill())
+    bus_reader = asyncio.create_task(read_bus()) if reader is not None else None
+    try:
+        await supervisor.run(duration=args.seconds)
+        await asyncio.sleep(0.5)
+    finally:
+        consumer.cancel()
+        killer.cancel()
+        if bus_reader is not None:
+            bus_reader.cancel()
+            if reader is not bus:
+                await reader.close()
+            await bus.close()
+        if redis is not None:
+            redis.stop()
+        broker.stop()
+
+    stamps = [tick[0] for _, tick in received]
+    inversions = sum(1 for a, b in zip(stamps, stamps[1:]) if b < a)
+    lags = sorted((at - tick[0]) * 1000 for at, tick in received)
+    per_shard = {}
+    for _, tick in received:
+        per_shard[tick[1]] = per_shard.get(tick[1], 0) + 1
+    # Gap of the dead shard's assets: from the kill to their first tick elsewhere.
+    resumed = {}
+    for at, tick in received:
+        if killed and at > killed["at"] and tick[2] in killed["assets"] and tick[2] not in resumed:
+            resumed[tick[2]] = at - killed["at"]
+    bus_lags.sort()
+    return {
+        "bus": args.bus,
+        "bus_events": bus_events,
+        "bus_lag_p50_ms": statistics.median(bus_lags) if bus_lags else None,
+        "bus_lag_p99_ms": bus_lags[int(len(bus_lags) * 0.99)] if bus_lags else None,
+        "workers": args.workers,
+        "assets": args.assets,
+        "ticks": len(received),
+        "ticks_per_s": len(received) / args.seconds,
+        "per_shard": per_shard,
+        "out_of_order": inversions,
+        "late": supervisor.merge.late,
+        "lag_p50_ms": statistics.median(lags) if lags else None,
+        "lag_p99_ms": lags[int(len(lags) * 0.99)] if lags else None,
+        "killed_assets": len(killed.get("assets", ())),
+        "resumed_assets": len(resumed),
+        "failover_max_s": max(resumed.values()) if resumed else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--assets", type=int, default=80)
+    parser.add_argument("--tick-rate", type=float, default=2.0)
+    parser.add_argument("--seconds", type=float, default=20.0)
+    parser.add_argument("--restart-backoff", type=float, default=2.0)
+    parser.add_argument("--bus", help="Publish on this bus and read it back, e.g. unix:///tmp/pyquotex-bench.sock.")
+    parser.add_argument("--mock-redis", action="store_true", help="Publish through a local Redis stand-in.")
+    parser.add_argument("--json", help="Write the results to this file.")
+    args = parser.parse_args()
+    results = asyncio.run(run(args))
+    print(json.dumps(results, indent=2))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
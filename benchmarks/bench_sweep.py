@@ -0,0 +1,55 @@
+"""Throughput of :class:`pyquotex.utils.sweep.Sweep` as the worker count grows.
+
+    python -m benchmarks.bench_sweep --assets 80 --days 30 --workers 1 2 4 8 16 32
+"""
+import os
+import sys
+import time
+import argparse
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from pyquotex.utils.backtest import Candles, crossover, sma  # noqa: E402
+from pyquotex.utils.sweep import Sweep, format_table  # noqa: E402
+
+
+def sma_cross(candles, fast, slow):
+    return crossover(sma(candles.close, fast), sma(candles.close, slow))
+
+
+def synthetic(assets, bars, seed=0):
+    rng = np.random.default_rng(seed)
+    times = 1_700_000_000 // 60 * 60 + np.arange(bars, dtype=np.int64) * 60
+    series = {}
+    for i in range(assets):
+        close = (1 + rng.random()) * np.exp(np.cumsum(rng.normal(0, 2e-4, bars)))
+        series[f"SYN{i:03d}_otc"] = Candles(times, close, close, close, close)
+    return series
+
+
+def main(args):
+    candles = synthetic(args.assets, args.days * 1440)
+    parameters = {"fast": [3, 5, 8, 13], "slow": [21, 34, 55], "expiry": [60, 300, 900]}
+    baseline = None
+    for workers in args.workers:
+        sweep = Sweep(candles, sma_cross, parameters, workers=workers, martingale=args.martingale)
+        started = time.perf_counter()
+        cells = sweep.run()
+        elapsed = time.perf_counter() - started
+        baseline = baseline or elapsed * workers
+        print(f"workers {workers:>3}  cells {cells:>6}  {elapsed:8.2f} s  "
+              f"{cells / elapsed:10.1f} cells/s  efficiency {baseline / elapsed / workers:6.1%}")
+    print()
+    print(format_table(sweep.ranked(top=10)))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--assets", type=int, default=20)
+    parser.add_argument("--days", type=int, default=30, help="Days of 1 minute bars per asset.")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, os.cpu_count() or 1])
+    parser.add_argument("--martingale", type=int, default=0)
+    main(parser.parse_args())
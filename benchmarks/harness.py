@@ -0,0 +1,137 @@
+"""Registry, timer and baseline comparison behind ``python -m benchmarks``.
+
+A case is a setup function decorated with :func:`benchmark`. It receives the
+input size and returns the callable (or coroutine function) to time, so
+building the inputs never counts against the measurement.
+"""
+import gc
+import sys
+import time
+import asyncio
+import platform
+import statistics
+import subprocess
+
+CASES = []
+
+
+def benchmark(name, sizes=(None,), quick=None):
+    """Register a case.
+
+    :param str name: Dotted case name, e.g. ``processor.calculate_candles``.
+    :param sizes: Input sizes of a full run, every size is a separate result.
+    :param quick: (optional) Sizes used with ``--quick``, defaults to the smallest.
+    """
+    def decorator(setup):
+        CASES.append({
+            "name": name,
+            "setup": setup,
+            "sizes": tuple(sizes),
+            "quick": tuple(quick) if quick is not None else tuple(sorted(sizes, key=lambda s: s or 0)[:1]),
+        })
+        return setup
+    return decorator
+
+
+def case_key(name, size):
+    return name if size is None else f"{name}[{size}]"
+
+
+def measure(fn, loop, min_runs=3, max_runs=50, min_time=0.5):
+    """Time `fn` until `min_runs` are done and `min_time` seconds are spent.
+
+    :returns: The list of wall times in seconds.
+    """
+    run = (lambda: loop.run_until_complete(fn())) if asyncio.iscoroutinefunction(fn) else fn
+    run()  # Warm-up: first-call imports, caches and lazy allocations.
+    times = []
+    started = time.perf_counter()
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        while len(times) < max_runs and (len(times) < min_runs or time.perf_counter() - started < min_time):
+            t0 = time.perf_counter()
+            run()
+            times.append(time.perf_counter() - t0)
+            gc.collect()
+    finally:
+        if gc_enabled:
+            gc.enable()
+    return times
+
+
+def summarize(times, items):
+    median = statistics.median(times)
+    return {
+        "runs": len(times),
+        "min_s": min(times),
+        "median_s": median,
+        "mean_s": statistics.fmean(times),
+        "stdev_s": statistics.stdev(times) if len(times) > 1 else 0.0,
+        "items": items,
+        "items_per_s": items / median if items and median else None,
+    }
+
+
+def run_cases(selected=None, quick=False, min_time=0.5, out=sys.stdout):
+    """Run every registered case whose name contains one of `selected`.
+
+    :returns: ``{case key: summary}``.
+    """
+    results = {}
+    loop = asyncio.new_event_loop()
+    try:
+        for case in CASES:
+            if selected and not any(s in case["name"] for s in selected):
+                continue
+            for size in case["quick"] if quick else case["sizes"]:
+                key = case_key(case["name"], size)
+                fn = case["setup"](size)
+                items = getattr(fn, "items", size)
+                summary = summarize(measure(fn, loop, min_time=min_time), items)
+                results[key] = summary
+                rate = f"{summary['items_per_s']:>14,.0f}/s" if summary["items_per_s"] else " " * 16
+                print(f"{key:<48}{summary['median_s'] * 1000:>12.3f} ms{rate}  x{summary['runs']}", file=out)
+    finally:
+        loop.close()
+    return results
+
+
+def metadata(quick=False):
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=10
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        "commit": commit,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "quick": quick,
+    }
+
+
+def compare(results, baseline, threshold=0.2):
+    """Median ratio of every case found in both runs.
+
+    :param float threshold: Relative slowdown above which a case is a regression.
+    :returns: A list of ``(key, baseline median, current median, ratio, status)``.
+    """
+    rows = []
+    for key, current in results.items():
+        previous = baseline.get(key)
+        if previous is None:
+            rows.append((key, None, current["median_s"], None, "new"))
+            continue
+        ratio = current["median_s"] / previous["median_s"] if previous["median_s"] else float("inf")
+        if ratio > 1 + threshold:
+            status = "regression"
+        elif ratio < 1 / (1 + threshold):
+            status = "improvement"
+        else:
+            status = "ok"
+        rows.append((key, previous["median_s"], current["median_s"], ratio, status))
+    return rows
@@ -0,0 +1,87 @@
+"""Client-side cases: frame ingestion and the history merge of ``get_candles_v3``."""
+import os
+import json
+import random
+from bisect import bisect_right
+from unittest import mock
+
+from pyquotex import stable_api
+from pyquotex.stable_api import Quotex
+from pyquotex.utils.replay import ReplayDriver, synthetic_frames, journal_frames, PLACEHOLDER
+
+from .harness import benchmark
+
+ASSETS = [f"ASSET{i:02d}_otc" for i in range(20)]
+
+
+def recorded_frames(count):
+    """`count` frames from ``BENCH_JOURNAL`` when set, a synthetic mix otherwise.
+
+    The mix interleaves tick pairs with a history answer every 1000 ticks,
+    roughly what a dashboard session sends.
+    """
+    if os.getenv("BENCH_JOURNAL"):
+        frames = []
+        for _, frame in journal_frames(os.environ["BENCH_JOURNAL"]):
+            frames.append((0.0, frame))
+            if len(frames) == count:
+                break
+        return frames
+    rng = random.Random(0)
+    frames = []
+    for i, item in enumerate(synthetic_frames(ASSETS, seconds=count, ticks_per_second=1 / len(ASSETS))):
+        frames.append(item)
+        if i % 2000 == 1999:
+            start = int(item[0]) - 3600
+            history = [[start + s, round(1 + rng.random() / 100, 5), 0] for s in range(0, 3600, 2)]
+            frames.append((item[0], PLACEHOLDER % "history/list/v2"))
+            frames.append((item[0], b"\x04" + json.dumps(
+                {"asset": ASSETS[0], "period": 60, "history": history, "candles": []}
+            ).encode()))
+        if len(frames) >= count:
+            break
+    return frames[:count]
+
+
+@benchmark("client.on_message", sizes=(100_000, 1_000_000), quick=(100_000,))
+def on_message(count):
+    frames = recorded_frames(count)
+
+    def run():
+        ReplayDriver(frames).run()
+
+    run.items = len(frames)
+    return run
+
+
+def history_blocks(count, period=60, block=200, overlap=20):
+    """Candles served by a fake `get_candles`, consecutive blocks overlap like the real API."""
+    end = 1_700_000_000 // period * period
+    candles = [
+        {"time": end - i * period, "open": 1.0, "close": 1.0, "high": 1.0, "low": 1.0}
+        for i in range(count + block)
+    ][::-1]
+    times = [c["time"] for c in candles]
+
+    async def get_candles(asset, end_from_time, offset, period):
+        last = bisect_right(times, end_from_time) + overlap
+        return candles[max(last - block, 0):last]
+
+    return get_candles
+
+
+async def _no_sleep(delay, result=None):
+    return result
+
+
+@benchmark("client.get_candles_v3", sizes=(600, 3000), quick=(600,))
+def get_candles_v3(count):
+    client = Quotex(email="bench@localhost", password="bench")
+    client.get_candles = history_blocks(count)
+
+    async def run():
+        # The 0.2 s pause between blocks is rate limiting, not merge cost.
+        with mock.patch.object(stable_api.asyncio, "sleep", _no_sleep):
+            await client.get_candles_v3("EURUSD_otc", count, 60)
+
+    return run
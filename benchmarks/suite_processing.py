@@ -0,0 +1,86 @@
+"""Candle building and indicator cases on synthetic random-walk data."""
+import random
+
+import numpy as np
+
+from pyquotex.utils import backtest, processor
+from pyquotex.utils.indicators import TechnicalIndicators
+
+from .harness import benchmark
+
+
+def tick_history(count, start=1_700_000_000, seed=0):
+    """``[timestamp, price, 0]`` ticks, a bit over two per second."""
+    rng = random.Random(seed)
+    price = 1.1
+    history = []
+    for i in range(count):
+        price = round(price * (1 + rng.gauss(0, 5e-5)), 5)
+        history.append([start + i * 0.45, price, 0])
+    return history
+
+
+def price_series(count, seed=0):
+    rng = random.Random(seed)
+    price = 100.0
+    closes, highs, lows = [], [], []
+    for _ in range(count):
+        price *= 1 + rng.gauss(0, 1e-3)
+        spread = abs(rng.gauss(0, 5e-4)) * price
+        closes.append(price)
+        highs.append(price + spread)
+        lows.append(price - spread)
+    return closes, highs, lows
+
+
+@benchmark("processor.calculate_candles", sizes=(1_000_000,), quick=(100_000,))
+def calculate_candles(count):
+    history = tick_history(count)
+    return lambda: processor.calculate_candles(history, 60)
+
+
+@benchmark("processor.process_candles", sizes=(1_000_000,), quick=(100_000,))
+def process_candles(count):
+    history = tick_history(count)
+    return lambda: processor.process_candles(history, 60)
+
+
+@benchmark("processor.merge_candles", sizes=(1_000_000,), quick=(100_000,))
+def merge_candles(count):
+    # Two overlapping history answers, as merged by the candle getters.
+    candles = processor.calculate_candles(tick_history(count), 5)
+    overlapping = candles[len(candles) // 2:] + candles
+    fn = lambda: processor.merge_candles(overlapping)  # noqa: E731
+    fn.items = len(overlapping)
+    return fn
+
+
+def _indicator(name, call):
+    @benchmark(f"indicators.{name}", sizes=(10_000, 100_000), quick=(10_000,))
+    def setup(count):
+        closes, highs, lows = price_series(count)
+        return lambda: call(closes, highs, lows)
+    return setup
+
+
+_indicator("calculate_sma", lambda c, h, lo: TechnicalIndicators.calculate_sma(c, 20))
+_indicator("calculate_ema", lambda c, h, lo: TechnicalIndicators.calculate_ema(c, 20))
+_indicator("calculate_rsi", lambda c, h, lo: TechnicalIndicators.calculate_rsi(c, 14))
+_indicator("calculate_macd", lambda c, h, lo: TechnicalIndicators.calculate_macd(c))
+_indicator("calculate_bollinger_bands", lambda c, h, lo: TechnicalIndicators.calculate_bollinger_bands(c, 20))
+_indicator("calculate_stochastic", lambda c, h, lo: TechnicalIndicators.calculate_stochastic(c, h, lo))
+_indicator("calculate_atr", lambda c, h, lo: TechnicalIndicators.calculate_atr(h, lo, c))
+_indicator("calculate_adx", lambda c, h, lo: TechnicalIndicators.calculate_adx(h, lo, c))
+_indicator("calculate_ichimoku", lambda c, h, lo: TechnicalIndicators.calculate_ichimoku(h, lo))
+
+
+@benchmark("backtest.run", sizes=(525_600,))
+def backtest_run(count):
+    # A year of 1 minute bars, SMA crossover settled at 1 minute with martingale.
+    closes, highs, lows = price_series(count)
+    series = backtest.Candles(
+        np.arange(count, dtype=np.int64) * 60, np.array(closes), np.array(highs), np.array(lows), np.array(closes)
+    )
+    bt = backtest.Backtest(series, payout=0.85)
+    signal = backtest.crossover(backtest.sma(series.close, 5), backtest.sma(series.close, 20))
+    return lambda: bt.run(signal, 60, martingale=3)
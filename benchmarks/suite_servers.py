@@ -0,0 +1,75 @@
+"""REST endpoints of ``api_server`` and ``dashboard_server`` under concurrent load.
+
+Requests go through :class:`httpx.ASGITransport`, in process and without a
+socket, so the numbers are the cost of routing, handlers and serialization.
+The lifespan is not run, the dashboard never logs in to the broker.
+"""
+import random
+import asyncio
+
+import httpx
+
+import api_server
+import dashboard_server
+
+from .harness import benchmark
+
+CONCURRENCY = 50
+
+
+def load(app, paths, requests):
+    """Coroutine function issuing `requests` GETs over `paths`, `CONCURRENCY` at a time."""
+    transport = httpx.ASGITransport(app=app)
+
+    async def run():
+        semaphore = asyncio.Semaphore(CONCURRENCY)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            async def get(path):
+                async with semaphore:
+                    response = await client.get(path)
+                    response.raise_for_status()
+            await asyncio.gather(*(get(paths[i % len(paths)]) for i in range(requests)))
+
+    run.items = requests
+    return run
+
+
+def recent_assets():
+    return sorted(p.stem for p in api_server.RECENT_DIR.glob("*.json")) or ["EURUSD_otc"]
+
+
+@benchmark("servers.api_server.recent", sizes=(1000,))
+def api_recent(requests):
+    return load(api_server.app, [f"/lux/api/recent/{a}" for a in recent_assets()], requests)
+
+
+@benchmark("servers.api_server.mixed", sizes=(1000,))
+def api_mixed(requests):
+    assets = recent_assets()
+    paths = ["/lux/api/assets", "/lux/api/health"]
+    paths += [f"/lux/api/price/{a}" for a in assets] + [f"/lux/api/ohlc/{a}?period=5" for a in assets]
+    return load(api_server.app, paths, requests)
+
+
+def fill_snapshot(assets=115, seed=0):
+    rng = random.Random(seed)
+    for i in range(assets):
+        price = round(1 + rng.random(), 5)
+        dashboard_server.MASTER_SNAPSHOT[f"SYN{i:03d}_otc"] = {
+            "time": 1_700_000_000, "open": price, "high": price, "low": price, "close": price
+        }
+
+
+@benchmark("servers.dashboard.snapshot", sizes=(1000,))
+def dashboard_snapshot(requests):
+    fill_snapshot()
+    return load(dashboard_server.app, ["/lux/api/snapshot"], requests)
+
+
+@benchmark("servers.dashboard.mixed", sizes=(1000,))
+def dashboard_mixed(requests):
+    fill_snapshot()
+    assets = list(dashboard_server.MASTER_SNAPSHOT)
+    paths = ["/lux/health", "/lux/api/assets", "/lux/api/completeness"]
+    paths += [f"/lux/api/price/{a}" for a in assets]
+    return load(dashboard_server.app, paths, requests)
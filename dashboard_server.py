@@ -4,17 +4,24 @@ import asyncio
 import json
 import os
 import time
+from collections import deque
 from pathlib import Path
 from typing import Optional, Dict
 import uvicorn
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, Response
 from pyquotex.stable_api import Quotex
 from pyquotex.config import credentials
-from supabase_db import save_candle_realtime
+from pyquotex.utils.candle_store import CandleStore, GapBackfiller
+from pyquotex.utils.journal import FrameJournal
+from pyquotex.utils.tracing import TRACER
+from pyquotex.utils.bus import open_bus, TICK
+from pyquotex.utils.metrics import REGISTRY, CONTENT_TYPE, MetricsMiddleware, register_process_metrics, watch_event_loop
+from supabase_db import save_candle_realtime, save_candles
 
 # --- CONFIGURATION ---
 app = FastAPI(title="LUX Master Hub Pro", version="3.2.0")
 app.add_middleware(CORSMiddleware, allow_origins=["*"], allow_credentials=True, allow_methods=["*"], allow_headers=["*"])
+app.add_middleware(MetricsMiddleware)
 
 DATA_DIR = Path(__file__).parent / "data"
 RECENT_DIR = DATA_DIR / "recent"
@@ -22,14 +29,66 @@ RECENT_DIR.mkdir(parents=True, exist_ok=True)
 
 router = APIRouter(prefix="/lux")
 
+# Optional raw frame journal for audits and replays, e.g. LUX_JOURNAL_DIR=data/journal
+JOURNAL = FrameJournal(os.environ["LUX_JOURNAL_DIR"]) if os.getenv("LUX_JOURNAL_DIR") else None
+
+# Follow the ingest process (shard_supervisor.py) on the pub/sub bus instead of
+# logging into the broker, e.g. LUX_BUS=unix:///tmp/pyquotex.sock
+BUS_URL = os.getenv("LUX_BUS")
+
 # --- GLOBAL STATE ENGINE ---
 MASTER_SNAPSHOT: Dict[str, dict] = {}
+CANDLE_STORE = CandleStore(60, maxlen=1440)
+backfiller: Optional[GapBackfiller] = None
 client = None
 broker_status = "DISCONNECTED"
 last_login_attempt = 0
 
+# --- METRICS ---
+register_process_metrics()
+SUPABASE_FLUSH = REGISTRY.histogram("lux_supabase_flush_seconds", "Latency of one Supabase write.", ("kind",))
+SUPABASE_BACKLOG = REGISTRY.gauge("lux_supabase_backlog", "Candles of the current harvester pass not yet written.")
+WS_CLIENTS = REGISTRY.gauge("lux_ws_clients", "Connected dashboard websocket clients.")
+WS_SEND_LAG = REGISTRY.gauge("lux_ws_send_lag_seconds", "Time the last snapshot push took, per client.", ("client",))
+SUBSCRIPTIONS = REGISTRY.gauge("lux_subscriptions", "Live (asset, period) subscriptions.")
+OUTBOUND_QUEUE = REGISTRY.gauge("lux_outbound_queue_frames", "Subscription frames waiting to be sent.")
+JOURNAL_PENDING = REGISTRY.gauge("lux_journal_pending_frames", "Frames waiting for the journal writer.")
+JOURNAL_DROPPED = REGISTRY.gauge("lux_journal_dropped_frames", "Frames the journal dropped since start.")
+BACKFILL_PENDING = REGISTRY.gauge("lux_backfill_pending_ranges", "Candle gaps queued for backfill.")
+BACKFILL_BARS = REGISTRY.gauge("lux_backfill_bars_filled", "Bars merged by the backfiller since start.")
+OPEN_POSITIONS = REGISTRY.gauge("lux_open_positions", "Positions waiting for their deal.")
+ASSETS_TRACKING = REGISTRY.gauge("lux_assets_tracking", "Assets in the live snapshot.")
+ASSETS_TRACKING.set_function(lambda: len(MASTER_SNAPSHOT))
+
+def collect_metrics():
+    """Copy the engine stats into gauges at scrape time."""
+    if client is not None:
+        stats = client.subscriptions.stats()
+        SUBSCRIPTIONS.set(stats["interests"])
+        OUTBOUND_QUEUE.set(stats["pending_frames"])
+        OPEN_POSITIONS.set(len(client.api.deals.open_positions))
+    if JOURNAL is not None:
+        stats = JOURNAL.stats()
+        JOURNAL_PENDING.set(stats["pending"])
+        JOURNAL_DROPPED.set(stats["frames_dropped"])
+    if backfiller is not None:
+        stats = backfiller.stats()
+        BACKFILL_PENDING.set(stats["pending"])
+        BACKFILL_BARS.set(stats["bars_filled"])
+
+REGISTRY.add_collector(collect_metrics)
+
+# Sampled tick traces persisted but not yet pushed to a websocket client
+FANOUT_TRACES = deque(maxlen=1000)
+
+async def persist_backfill(asset, candles):
+    """Mirror repaired bars to Supabase, existing rows are left untouched."""
+    rows = [(asset, c['time'], c['open'], c['high'], c['low'], c['close']) for c in candles]
+    with SUPABASE_FLUSH.labels("backfill").time():
+        await asyncio.to_thread(save_candles, rows)
+
 async def get_client():
-    global client, broker_status, last_login_attempt
+    global client, broker_status, last_login_attempt, backfiller
     if client is not None:
         return client
     
@@ -44,7 +103,7 @@ async def get_client():
     try:
         email, password = credentials()
         # Always start with a fresh instance to clear "No response stored" errors
-        cl = Quotex(email=email, password=password)
+        cl = Quotex(email=email, password=password, journal=JOURNAL)
         
         check = False
         reason = "Unknown"
@@ -66,6 +125,8 @@ async def get_client():
         broker_status = "CONNECTED"
         client = cl
         asyncio.create_task(broad_subscribe_task(cl))
+        backfiller = GapBackfiller(cl, CANDLE_STORE, lookback=6 * 3600, on_merge=persist_backfill)
+        backfiller.start()
         return cl
         
     except Exception as e:
@@ -81,10 +142,23 @@ async def broad_subscribe_task(cl):
         count = 0
         for i in instr:
             if len(i) > 14 and i[14]: 
-                cl.start_candles_stream(i[1], 60)
+                # The subscription manager paces the burst, no manual throttle needed.
+                cl.start_candles_stream(i[1], 60, owner="dashboard")
                 count += 1
-                if count % 15 == 0: await asyncio.sleep(2) # Slower throttle for stability
         print(f"🚀 [MASTER] Harvesting {count} assets in parallel.")
+        # The first list may come from the catalog snapshot, follow what the live ones change.
+        async for diff in cl.catalog.stream():
+            for i in diff["added"]:
+                if len(i) > 14 and i[14]:
+                    cl.start_candles_stream(i[1], 60, owner="dashboard")
+            for symbol, fields in diff["changed"].items():
+                if 14 in fields:
+                    if fields[14][1]:
+                        cl.start_candles_stream(symbol, 60, owner="dashboard")
+                    else:
+                        cl.stop_candles_stream(symbol, owner="dashboard")
+            for symbol in diff["removed"]:
+                cl.stop_candles_stream(symbol, owner="dashboard")
     except Exception as e:
         print(f"⚠️ [MASTER] Broad Subscribe Error: {e}")
 
@@ -98,10 +172,17 @@ async def live_harvester_loop():
             
         try:
             current_assets = list(cl.api.realtime_price.keys())
+            SUPABASE_BACKLOG.set(sum(1 for a in current_assets if cl.api.realtime_price.get(a)))
+            realtime_flush = SUPABASE_FLUSH.labels("realtime")
             for asset in current_assets:
                 ticks = cl.api.realtime_price.get(asset, [])
                 if ticks:
                     cl.api.realtime_price[asset] = []
+                    traces = [t['trace'] for t in ticks if 'trace' in t] if TRACER.enabled else ()
+                    for trace in traces:
+                        trace.mark("poll")
+                    for tick in ticks:
+                        CANDLE_STORE.add_tick(asset, tick['price'], tick['time'])
                     last = ticks[-1]
                     price = last['price']
                     ts = last['time']
@@ -117,9 +198,19 @@ async def live_harvester_loop():
                         c['close'] = price
                         c['high'] = max(c['high'], price)
                         c['low'] = min(c['low'], price)
+                    for trace in traces:
+                        trace.mark("aggregate")
                     
                     # --- SUPABASE PUSH ---
-                    save_candle_realtime(asset, MASTER_SNAPSHOT[asset])
+                    with realtime_flush.time():
+                        save_candle_realtime(asset, MASTER_SNAPSHOT[asset])
+                    SUPABASE_BACKLOG.dec()
+                    for trace in traces:
+                        trace.mark("persist")
+                        if WS_CLIENTS.get() > 0:
+                            FANOUT_TRACES.append(trace)
+                        else:
+                            TRACER.finish(trace)
             
             # Write periodic snapshot for REST API Fallback
             if int(time.time()) % 3 == 0:
@@ -129,9 +220,20 @@ async def live_harvester_loop():
         except Exception: pass
         await asyncio.sleep(0.1)
 
+async def bus_follower_loop():
+    """Memory engine fed by the ingest process; persistence is left to its recorders"""
+    global broker_status
+    bus = await open_bus(BUS_URL)
+    broker_status = f"BUS: {BUS_URL}"
+    print(f"🛰️ [MASTER] Following {BUS_URL}, no broker login from this process.")
+    async for topic, event in bus.subscribe(TICK):
+        asset = event['asset']
+        MASTER_SNAPSHOT[asset] = CANDLE_STORE.add_tick(asset, event['price'], event['time'])
+
 @app.on_event("startup")
 async def start_engines():
-    asyncio.create_task(live_harvester_loop())
+    asyncio.create_task(bus_follower_loop() if BUS_URL else live_harvester_loop())
+    asyncio.create_task(watch_event_loop())
 
 # --- REST API ENDPOINTS ---
 
@@ -139,6 +241,31 @@ async def start_engines():
 async def health():
     return {"status": broker_status, "assets_tracking": len(MASTER_SNAPSHOT)}
 
+@router.get("/api/completeness")
+async def get_completeness(window: int = 3600):
+    """REST: Share of closed 1M bars held per asset over the last `window` seconds"""
+    return {
+        "window": window,
+        "backfill": backfiller.stats() if backfiller else None,
+        "data": CANDLE_STORE.completeness_report(window),
+    }
+
+@router.get("/api/traces")
+async def get_traces():
+    """REST: Per-stage tick latency percentiles and the slowest sampled traces"""
+    return TRACER.report()
+
+@router.post("/api/traces")
+async def set_tracing(enabled: bool = True, sample_every: Optional[int] = None, reset: bool = False):
+    """REST: Switch tick tracing on or off at runtime, e.g. ?enabled=true&sample_every=100"""
+    if reset:
+        TRACER.reset()
+    if enabled:
+        TRACER.enable(sample_every)
+    else:
+        TRACER.disable()
+    return {"enabled": TRACER.enabled, "sample_every": TRACER.sample_every}
+
 @router.get("/api/assets")
 async def get_assets():
     """REST: Get all assets from disk cache or memory"""
@@ -180,6 +307,11 @@ async def get_price(asset: str):
 
     return {"asset": asset, "status": "PENDING", "broker_status": broker_status}
 
+@app.get("/metrics")
+async def metrics():
+    """Prometheus scrape endpoint"""
+    return Response(REGISTRY.render(), media_type=CONTENT_TYPE)
+
 @app.get("/")
 async def ui():
     return HTMLResponse(content=open("index.html", encoding="utf-8").read())
@@ -187,14 +319,26 @@ async def ui():
 @app.websocket("/ws")
 async def ws_handler(websocket: WebSocket):
     await websocket.accept()
+    peer = f"{websocket.client.host}:{websocket.client.port}" if websocket.client else str(id(websocket))
+    send_lag = WS_SEND_LAG.labels(peer)
+    WS_CLIENTS.inc()
     try:
         while True:
-            for asset, c in MASTER_SNAPSHOT.items():
+            started = time.perf_counter()
+            traces = list(FANOUT_TRACES)
+            FANOUT_TRACES.clear()
+            for asset, c in list(MASTER_SNAPSHOT.items()):
                 await websocket.send_json({"type": "tick", "asset": asset, "data": {"price": c['close'], "time": c['time']}})
+            send_lag.set(time.perf_counter() - started)
+            for trace in traces:
+                TRACER.finish(trace, "fanout")
             await asyncio.sleep(1)
             try: await asyncio.wait_for(websocket.receive_text(), timeout=0.1)
             except: pass
     except: pass
+    finally:
+        WS_CLIENTS.dec()
+        WS_SEND_LAG.remove(peer)
 
 app.include_router(router)
 
@@ -36,7 +36,7 @@ async def calculate_profit(asset_name, amount, balance):
     Returns:
         tuple: The updated balance and the profit earned.
     """
-    payout = client.get_payout_by_asset(asset_name)
+    payout = await client.get_payout_by_asset(asset_name)
     profit = ((payout / 100) * amount)
     balance += amount + profit
     return balance, profit
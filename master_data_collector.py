@@ -6,13 +6,16 @@ import os
 from datetime import datetime
 from pyquotex.stable_api import Quotex
 from pyquotex.config import credentials
+from pyquotex.utils.candle_store import CandleStore, GapBackfiller
 
 class MasterDataCollector:
     def __init__(self, email, password, timeframe=60, history_count=600):
         self.client = Quotex(email=email, password=password)
         self.timeframe = timeframe
         self.history_count = history_count
-        self.markets = {} # {asset_name: [candles]}
+        self.store = CandleStore(timeframe, maxlen=history_count)
+        self.backfiller = GapBackfiller(self.client, self.store, lookback=timeframe * history_count)
+        self.assets = []
         self.is_running = False
         self.update_count = 0
 
@@ -40,33 +43,27 @@ class MasterDataCollector:
             # count=600 history load
             candles = await self.client.get_candles_v3(asset, self.history_count, self.timeframe)
             if candles:
-                self.markets[asset] = candles
+                self.store.merge(asset, candles)
                 return True
             else:
-                self.markets[asset] = []
                 return False
         except Exception as e:
-            self.markets[asset] = []
             return False
 
     async def subscribe_all(self, assets):
         print(f"Subscribing to live updates for {len(assets)} assets...")
-        # Small batches to avoid disconnect
-        batch_size = 10
-        for i in range(0, len(assets), batch_size):
-            batch = assets[i:i + batch_size]
-            for asset in batch:
-                self.client.api.subscribe_realtime_candle(asset, self.timeframe)
-            print(f"  Subscribed to batch {i//batch_size + 1}")
-            await asyncio.sleep(0.5)
+        # The subscription manager batches and paces the frames and replays them after a reconnect.
+        for asset in assets:
+            self.client.start_candles_stream(asset, self.timeframe, owner="collector")
 
     async def run_live_processor(self):
         print("\n--- Live Data Collector Active ---")
-        print(f"Monitoring {len(self.markets)} markets at {self.timeframe}s timeframe.")
+        print(f"Monitoring {len(self.assets)} markets at {self.timeframe}s timeframe.")
+        self.backfiller.start()
         
         while self.is_running:
             updated_this_tick = 0
-            for asset, history in self.markets.items():
+            for asset in self.assets:
                 ticks = self.client.api.realtime_price.get(asset, [])
                 if not ticks:
                     continue
@@ -75,38 +72,30 @@ class MasterDataCollector:
                 updated_this_tick += 1
                 
                 for tick in ticks:
-                    ts = tick['time']
-                    price = tick['price']
-                    candle_start = int(ts // self.timeframe * self.timeframe)
-                    
-                    if not history or candle_start > history[-1]['time']:
-                        new_candle = {
-                            'time': candle_start,
-                            'open': price,
-                            'high': price,
-                            'low': price,
-                            'close': price
-                        }
-                        history.append(new_candle)
-                        if len(history) > self.history_count:
-                            history.pop(0)
+                    if self.store.bar_time(tick['time']) not in self.store.candles.get(asset, {}):
                         self.update_count += 1
-                    else:
-                        current = history[-1]
-                        current['close'] = price
-                        current['high'] = max(current['high'], price)
-                        current['low'] = min(current['low'], price)
+                    self.store.add_tick(asset, tick['price'], tick['time'])
 
             if updated_this_tick > 0:
-                print(f"\rCaptured updates for {updated_this_tick} assets. Total new candles: {self.update_count}", end="")
+                print(f"\rCaptured updates for {updated_this_tick} assets. Total new candles: {self.update_count}. "
+                  f"Backfilled: {self.backfiller.bars_filled}", end="")
 
             await asyncio.sleep(0.1)
 
+    @property
+    def markets(self):
+        """{asset_name: [candles]}"""
+        return {asset: self.store.series(asset) for asset in self.store.assets()}
+
+    def completeness(self, window=3600):
+        return self.store.completeness_report(window)
+
     async def start(self):
         if not await self.connect():
             return
 
         open_assets = await self.initialize_assets()
+        self.assets = open_assets
         
         print("\nPhase 1: Fetching 600 Candles History for ALL assets...")
         # Parallel history loading (limited concurrency)
@@ -116,11 +105,11 @@ class MasterDataCollector:
             async with semaphore:
                 success = await self.load_history(asset)
                 if success:
-                    print(f"\r  Progress: {len(self.markets)}/{len(open_assets)} loaded", end="")
+                    print(f"\r  Progress: {len(self.store.assets())}/{len(open_assets)} loaded", end="")
 
         tasks = [fetch_with_sem(asset) for asset in open_assets]
         await asyncio.gather(*tasks)
-        print(f"\nCompleted history load for {len(self.markets)} assets.")
+        print(f"\nCompleted history load for {len(self.store.assets())} assets.")
         
         print("\nPhase 2: Live Subscription")
         await self.subscribe_all(open_assets)
@@ -132,6 +121,7 @@ class MasterDataCollector:
             self.is_running = False
             print("\nShutting down collector...")
         finally:
+            self.backfiller.stop()
             await self.client.close()
 
 if __name__ == "__main__":
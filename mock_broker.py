@@ -0,0 +1,395 @@
+"""Local stand-in for the Quotex socket.io broker.
+
+Speaks the Engine.IO v3 / socket.io framing used by ``ws2.market-qx.trade``
+(text ``451-`` placeholder frames followed by a ``\\x04`` binary payload) so
+the client can be exercised on a machine with no network access.
+
+Implements ``authorization``, ``instruments/list``, ``instruments/update``,
+``depth/follow``, ``history/load``, ``orders/open`` and ``tick``, streams
+synthetic ticks for any number of assets, settles orders at expiry, and can
+inject latency and disconnects for chaos tests.
+
+    python mock_broker.py --port 8765 --assets 300 --tick-rate 2 --disconnect-every 60
+"""
+import json
+import math
+import time
+import uuid
+import random
+import asyncio
+import hashlib
+import logging
+import argparse
+import threading
+from pathlib import Path
+from websockets.asyncio.server import serve
+
+logger = logging.getLogger(__name__)
+
+PROFILE = {
+    "nickname": "mock",
+    "id": 1,
+    "demoBalance": 10000.0,
+    "liveBalance": 0.0,
+    "avatar": "",
+    "currencyCode": "USD",
+    "country": "BR",
+    "countryName": "Brazil",
+    "currencySymbol": "$",
+    "timeOffset": 0,
+}
+
+INSTRUMENTS_FILE = Path(__file__).parent / "all_instruments.json"
+
+
+def build_instruments(count):
+    """Instrument rows in the platform's array layout.
+
+    Starts from the recorded ``all_instruments.json`` and adds synthetic OTC
+    rows, cloned from the first recorded one, until `count` rows exist.
+    """
+    template = []
+    if INSTRUMENTS_FILE.exists():
+        with open(INSTRUMENTS_FILE) as f:
+            template = json.load(f)
+    if not template:
+        template = [[
+            1, "EURUSD_otc", "EUR/USD (OTC)", "currency", 5, 85, 60, 30, 3, 1, 0, 0,
+            [[30, "put"], [60, "call"]], 0, True, [], 15, 0, 85, 85, 0, 0, 0, 0, 0, 0, 0
+        ]]
+    instruments = [list(row) for row in template[:count]]
+    for i in range(len(instruments), count):
+        row = list(template[0])
+        row[0] = 10000 + i
+        row[1] = f"SYN{i:03d}_otc"
+        row[2] = f"Synthetic {i:03d} (OTC)"
+        row[14] = True
+        instruments.append(row)
+    return instruments
+
+
+class MockBroker:
+    """Socket.io broker answering the client's frames with synthetic data."""
+
+    def __init__(
+            self,
+            host="127.0.0.1",
+            port=0,
+            ack_delay=0.0,
+            assets=115,
+            tick_rate=1.0,
+            broadcast=False,
+            latency=0.0,
+            jitter=0.0,
+            disconnect_every=None,
+            reject_auth=False,
+            settle_orders=True,
+            payout=0.85,
+            seed=0
+    ):
+        """
+        :param str host: The interface to bind.
+        :param int port: The port to bind, ``0`` picks a free one.
+        :param float ack_delay: Seconds to wait before acknowledging an order.
+        :param int assets: Instruments listed, padded with synthetic OTC assets.
+        :param float tick_rate: Ticks per second per streamed asset, ``0`` disables ticks.
+        :param bool broadcast: Stream every listed asset instead of the followed ones.
+        :param float latency: Seconds added before every answer and tick batch.
+        :param float jitter: Upper bound of a random extra delay on top of `latency`.
+        :param float disconnect_every: Mean seconds between forced disconnects.
+        :param bool reject_auth: Answer ``authorization`` with ``authorization/reject``.
+        :param bool settle_orders: Send ``s_orders/close`` deals when orders expire.
+        :param float payout: Profit ratio of a winning order.
+        :param int seed: Seed of every random choice, for reproducible runs.
+        """
+        self.host = host
+        self.port = port
+        self.ack_delay = ack_delay
+        self.tick_rate = tick_rate
+        self.broadcast = broadcast
+        self.latency = latency
+        self.jitter = jitter
+        self.disconnect_every = disconnect_every
+        self.reject_auth = reject_auth
+        self.settle_orders = settle_orders
+        self.payout = payout
+        self.rng = random.Random(seed)
+        self.seed = seed
+        self.profile = dict(PROFILE)
+        self.instruments = build_instruments(assets)
+        self.symbols = [row[1] for row in self.instruments]
+        self.orders = {}
+        self.received = []
+        self.connections = set()
+        self.frames_sent = 0
+        self.disconnects = 0
+        self._server = None
+        self._loop = None
+        self._thread = None
+        self._ready = threading.Event()
+
+    @property
+    def url(self):
+        return f"ws://{self.host}:{self.port}/socket.io/?EIO=3&transport=websocket"
+
+    @property
+    def http_url(self):
+        return f"http://{self.host}:{self.port}"
+
+    @staticmethod
+    def parse(frame):
+        """Split a ``42[...]`` frame into its event name and payload."""
+        data = json.loads(frame[2:])
+        return data[0], data[1] if len(data) > 1 else None
+
+    def price(self, asset, timestamp):
+        """Deterministic price of `asset` at `timestamp`, shared by ticks and history."""
+        phase = int(hashlib.md5(f"{self.seed}:{asset}".encode()).hexdigest()[:8], 16)
+        base = 1.0 + (phase % 1000) / 1000
+        t = float(timestamp)
+        wave = math.sin(t / 300 + phase) * 2e-3 + math.sin(t / 17 + phase / 7) * 3e-4
+        noise = ((int(t * 10) * 2654435761 + phase) % 1000 - 500) * 2e-7
+        return round(base * (1 + wave + noise), 5)
+
+    async def delay(self):
+        if self.latency or self.jitter:
+            await asyncio.sleep(self.latency + self.rng.random() * self.jitter)
+
+    async def send(self, websocket, frame):
+        await websocket.send(frame)
+        self.frames_sent += 1
+
+    async def emit(self, websocket, event, data):
+        """Send an event the way the platform does, placeholder then binary."""
+        await self.send(websocket, f'451-["{event}",{{"_placeholder":true,"num":0}}]')
+        await self.send(websocket, b"\x04" + json.dumps(data).encode())
+
+    def process_request(self, connection, request):
+        """Serve the few HTTP endpoints the client reads besides the socket."""
+        if request.path.startswith("/api/v1/cabinets/digest"):
+            return connection.respond(200, json.dumps({"data": self.profile}))
+        if request.path.startswith("/api/v1/cabinets/trades/history"):
+            closed = [o for o in self.orders.values() if "profitAmount" in o]
+            closed.sort(key=lambda o: o["closeTimestamp"], reverse=True)
+            page = int(request.path.rsplit("page=", 1)[-1]) if "page=" in request.path else 1
+            return connection.respond(200, json.dumps({"data": closed[(page - 1) * 30:page * 30]}))
+        return None
+
+    async def handler(self, websocket):
+        state = {"followed": set(), "tasks": []}
+        self.connections.add(websocket)
+        await self.send(
+            websocket,
+            '0{"sid":"%s","upgrades":[],"pingInterval":25000,"pingTimeout":20000}' % uuid.uuid4().hex
+        )
+        await self.send(websocket, "40")
+        if self.tick_rate:
+            state["tasks"].append(asyncio.create_task(self.stream_ticks(websocket, state)))
+        if self.disconnect_every:
+            state["tasks"].append(asyncio.create_task(self.chaos(websocket)))
+        try:
+            async for frame in websocket:
+                if frame == "2":
+                    await self.send(websocket, "3")
+                    continue
+                if not isinstance(frame, str) or not frame.startswith("42"):
+                    continue
+                try:
+                    event, payload = self.parse(frame)
+                except (ValueError, IndexError):
+                    continue
+                self.received.append((time.perf_counter(), event))
+                callback = getattr(self, "on_" + event.replace("/", "_"), None)
+                if callback:
+                    await callback(websocket, payload, state)
+        except Exception as e:
+            logger.debug(f"Connection ended: {e}")
+        finally:
+            self.connections.discard(websocket)
+            for task in state["tasks"]:
+                task.cancel()
+
+    async def on_authorization(self, websocket, payload, state):
+        await self.delay()
+        if self.reject_auth:
+            await self.emit(websocket, "authorization/reject", {})
+            return
+        await self.emit(websocket, "s_authorization", {})
+        await self.emit(websocket, "instruments/list", self.instruments)
+
+    async def on_instruments_list(self, websocket, payload, state):
+        await self.delay()
+        await self.emit(websocket, "instruments/list", self.instruments)
+
+    async def on_instruments_update(self, websocket, payload, state):
+        state["followed"].add(payload.get("asset"))
+
+    async def on_depth_follow(self, websocket, payload, state):
+        state["followed"].add(payload)
+
+    async def on_depth_unfollow(self, websocket, payload, state):
+        state["followed"].discard(payload)
+
+    async def on_subfor(self, websocket, payload, state):
+        state["followed"].discard(payload)
+
+    async def on_tick(self, websocket, payload, state):
+        pass
+
+    async def on_history_load(self, websocket, payload, state):
+        await self.delay()
+        asset = payload.get("asset")
+        end = int(payload.get("time") or time.time())
+        offset = int(payload.get("offset") or 3600)
+        period = int(payload.get("period") or 60)
+        ticks = [[t, self.price(asset, t), 0] for t in range(end - offset, end)]
+        candles = []
+        for start in range(end - offset - (end - offset) % period, end, period):
+            prices = [self.price(asset, t) for t in range(max(start, end - offset), min(start + period, end))]
+            if prices:
+                candles.append([start, prices[0], prices[-1], max(prices), min(prices), len(prices)])
+        await self.emit(websocket, "history/list/v2", {
+            "asset": asset,
+            "period": period,
+            "history": ticks,
+            "candles": candles,
+        })
+
+    async def on_orders_open(self, websocket, payload, state):
+        if self.ack_delay or self.latency or self.jitter:
+            # Latency is per order, pipelined orders must not queue behind each other.
+            asyncio.create_task(self.ack_order(websocket, payload))
+        else:
+            await self.ack_order(websocket, payload)
+
+    async def ack_order(self, websocket, payload):
+        if self.ack_delay:
+            await asyncio.sleep(self.ack_delay)
+        await self.delay()
+        now = time.time()
+        expiration = int(payload.get("time", 60))
+        # Timer options (optionType 100) carry a duration, the others an expiration time.
+        close_at = now + expiration if payload.get("optionType") == 100 else expiration
+        order = {
+            "id": str(uuid.uuid4()),
+            "openTimestamp": now,
+            "closeTimestamp": close_at,
+            "asset": payload.get("asset"),
+            "amount": payload.get("amount"),
+            "command": 0 if payload.get("action") == "call" else 1,
+            "isDemo": payload.get("isDemo"),
+            "requestId": payload.get("requestId"),
+            "openPrice": self.price(payload.get("asset"), now),
+        }
+        self.orders[order["id"]] = order
+        await self.emit(websocket, "s_orders/open", order)
+        if self.settle_orders:
+            asyncio.create_task(self.settle_order(websocket, order))
+
+    async def settle_order(self, websocket, order):
+        await asyncio.sleep(max(order["closeTimestamp"] - time.time(), 0))
+        close_price = self.price(order["asset"], order["closeTimestamp"])
+        if order["command"] == 0:
+            won = close_price > order["openPrice"]
+        else:
+            won = close_price < order["openPrice"]
+        profit = round(order["amount"] * self.payout, 2) if won else -order["amount"]
+        deal = dict(order, closePrice=close_price, profit=profit)
+        order.update(closePrice=close_price, profitAmount=profit, ticket=order["id"])
+        try:
+            await self.emit(websocket, "s_orders/close", {"profit": profit, "deals": [deal]})
+        except Exception as e:
+            logger.debug(f"Settlement of {order['id']} not delivered: {e}")
+
+    async def stream_ticks(self, websocket, state):
+        interval = 1.0 / self.tick_rate
+        placeholder = '451-["quotes/stream",{"_placeholder":true,"num":0}]'
+        next_at = time.monotonic()
+        while True:
+            next_at += interval
+            await asyncio.sleep(max(next_at - time.monotonic(), 0))
+            assets = self.symbols if self.broadcast else list(state["followed"])
+            if not assets:
+                continue
+            now = round(time.time(), 3)
+            await self.delay()
+            for asset in assets:
+                await self.send(websocket, placeholder)
+                await self.send(websocket, b"\x04" + json.dumps([[asset, now, self.price(asset, now), 1]]).encode())
+
+    async def chaos(self, websocket):
+        await asyncio.sleep(self.rng.expovariate(1.0 / self.disconnect_every))
+        await self.drop(websocket)
+
+    async def drop(self, websocket):
+        """Force a disconnect the way the platform does, ``41`` then close."""
+        self.disconnects += 1
+        try:
+            await self.send(websocket, "41")
+        finally:
+            await websocket.close()
+
+    def drop_all(self):
+        """Disconnect every client, callable from any thread."""
+        for websocket in list(self.connections):
+            asyncio.run_coroutine_threadsafe(self.drop(websocket), self._loop)
+
+    async def serve(self):
+        self._loop = asyncio.get_running_loop()
+        async with serve(
+                self.handler,
+                self.host,
+                self.port,
+                process_request=self.process_request,
+                compression=None
+        ) as server:
+            self._server = server
+            self.port = server.sockets[0].getsockname()[1]
+            self._ready.set()
+            await server.serve_forever()
+
+    def start_in_thread(self):
+        """Run the broker on its own event loop so blocking clients can reach it."""
+
+        def run():
+            try:
+                asyncio.run(self.serve())
+            except asyncio.CancelledError:
+                pass
+
+        self._thread = threading.Thread(target=run, daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        return self
+
+    def stop(self):
+        if self._server and self._loop:
+            self._loop.call_soon_threadsafe(self._server.close)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local mock Quotex broker.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--assets", type=int, default=115)
+    parser.add_argument("--tick-rate", type=float, default=1.0)
+    parser.add_argument("--broadcast", action="store_true")
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--disconnect-every", type=float)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    broker = MockBroker(
+        args.host,
+        args.port,
+        assets=args.assets,
+        tick_rate=args.tick_rate,
+        broadcast=args.broadcast,
+        latency=args.latency,
+        jitter=args.jitter,
+        disconnect_every=args.disconnect_every,
+        seed=args.seed
+    )
+    print(f"Mock broker listening on {broker.url}")
+    asyncio.run(broker.serve())
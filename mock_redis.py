@@ -0,0 +1,154 @@
+"""Local stand-in for a Redis server's pub/sub.
+
+Speaks enough RESP2 for :class:`pyquotex.utils.bus.RedisBus`: ``PING``,
+``AUTH``, ``PUBLISH``, ``SUBSCRIBE``, ``PSUBSCRIBE``, ``UNSUBSCRIBE``,
+``PUNSUBSCRIBE`` and ``QUIT``, so the Redis backend can be exercised on a
+machine with no Redis installed.
+
+    python mock_redis.py --port 6379
+"""
+import asyncio
+import fnmatch
+import logging
+import argparse
+import threading
+
+from pyquotex.utils.bus import read_resp
+
+logger = logging.getLogger(__name__)
+
+
+def _reply(value):
+    if isinstance(value, int):
+        return b":%d\r\n" % value
+    if isinstance(value, list):
+        return b"*%d\r\n" % len(value) + b"".join(_reply(v) for v in value)
+    if isinstance(value, str):
+        value = value.encode()
+    return b"$%d\r\n%s\r\n" % (len(value), value)
+
+
+class MockRedis:
+    """Redis pub/sub answering on a local port."""
+
+    def __init__(self, host="127.0.0.1", port=0, password=None):
+        """
+        :param str host: The interface to bind.
+        :param int port: The port to bind, ``0`` picks a free one.
+        :param str password: (optional) Require ``AUTH`` with it.
+        """
+        self.host = host
+        self.port = port
+        self.password = password
+        self.published = 0
+        self.channels = {}
+        self.patterns = {}
+        self._server = None
+        self._loop = None
+        self._stopped = None
+        self._handlers = set()
+        self._thread = None
+        self._ready = threading.Event()
+
+    @property
+    def url(self):
+        auth = f":{self.password}@" if self.password else ""
+        return f"redis://{auth}{self.host}:{self.port}"
+
+    async def handler(self, reader, writer):
+        self._handlers.add((asyncio.current_task(), writer))
+        authed = self.password is None
+        subscribed = set()
+        patterns = set()
+        try:
+            while True:
+                command = await read_resp(reader)
+                if not isinstance(command, list) or not command:
+                    continue
+                name = command[0].decode().upper()
+                args = [a.decode() if isinstance(a, bytes) else a for a in command[1:]]
+                if name == "AUTH":
+                    authed = args[-1] == self.password
+                    writer.write(b"+OK\r\n" if authed else b"-WRONGPASS invalid password\r\n")
+                elif not authed:
+                    writer.write(b"-NOAUTH Authentication required.\r\n")
+                elif name == "PING":
+                    writer.write(b"+PONG\r\n")
+                elif name == "PUBLISH":
+                    writer.write(_reply(self.publish(args[0], command[2])))
+                elif name in ("SUBSCRIBE", "PSUBSCRIBE"):
+                    registry, mine = (self.channels, subscribed) if name == "SUBSCRIBE" else (self.patterns, patterns)
+                    for channel in args:
+                        registry.setdefault(channel, set()).add(writer)
+                        mine.add(channel)
+                        writer.write(_reply([name.lower(), channel, len(subscribed) + len(patterns)]))
+                elif name in ("UNSUBSCRIBE", "PUNSUBSCRIBE"):
+                    registry, mine = (self.channels, subscribed) if name == "UNSUBSCRIBE" else (self.patterns, patterns)
+                    for channel in args or list(mine):
+                        registry.get(channel, set()).discard(writer)
+                        mine.discard(channel)
+                        writer.write(_reply([name.lower(), channel, len(subscribed) + len(patterns)]))
+                elif name == "QUIT":
+                    writer.write(b"+OK\r\n")
+                    break
+                else:
+                    writer.write(b"-ERR unknown command '%s'\r\n" % name.encode())
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            for channel in subscribed:
+                self.channels.get(channel, set()).discard(writer)
+            for pattern in patterns:
+                self.patterns.get(pattern, set()).discard(writer)
+            writer.close()
+            self._handlers.discard((asyncio.current_task(), writer))
+
+    def publish(self, channel, payload):
+        self.published += 1
+        receivers = 0
+        for writer in list(self.channels.get(channel, ())):
+            writer.write(_reply(["message", channel, payload]))
+            receivers += 1
+        for pattern, writers in self.patterns.items():
+            if fnmatch.fnmatchcase(channel, pattern):
+                for writer in list(writers):
+                    writer.write(_reply(["pmessage", pattern, channel, payload]))
+                    receivers += 1
+        return receivers
+
+    async def serve(self):
+        self._loop = asyncio.get_running_loop()
+        self._stopped = asyncio.Event()
+        self._server = await asyncio.start_server(self.handler, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._ready.set()
+        await self._stopped.wait()
+        self._server.close()
+        handlers = list(self._handlers)
+        for _, writer in handlers:
+            writer.close()
+        if handlers:
+            await asyncio.wait([task for task, _ in handlers], timeout=1)
+        await self._server.wait_closed()
+
+    def start_in_thread(self):
+        """Run the server on its own event loop."""
+        self._thread = threading.Thread(target=asyncio.run, args=(self.serve(),), daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        return self
+
+    def stop(self):
+        if self._stopped and self._loop:
+            self._loop.call_soon_threadsafe(self._stopped.set)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local Redis pub/sub stand-in.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=6379)
+    parser.add_argument("--password")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(MockRedis(args.host, args.port, args.password).serve())
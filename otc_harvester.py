@@ -1,105 +1,157 @@
+import os
+import sys
 import asyncio
-import json
-import time
+import logging
 from pyquotex.stable_api import Quotex
+from pyquotex.ws.state import AUTHORIZED, FAILURES
 from pyquotex.config import credentials
+from pyquotex.utils.bus import open_bus, MARKET_STATUS
+from pyquotex.utils.market_status import MarketStatusStore
+
+logging.basicConfig(
+    level=os.getenv("HARVESTER_LOG_LEVEL", "INFO").upper(),
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger("otc_harvester")
+
+OWNER = "otc_harvester"
+STATUS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'market_status.json')
+HEARTBEAT = 60
+
+
+def status_of(row):
+    return {'name': row[2], 'open': bool(row[14])}
+
+
+def market_changes(catalog, diff):
+    """``{symbol: {"name", "open"}}`` for the rows of a catalog diff that matter here."""
+    symbols = [i[1] for i in diff["added"]]
+    symbols += [symbol for symbol, fields in diff["changed"].items() if 14 in fields or 2 in fields]
+    # The catalog holds the newest row, even if more pushes came in meanwhile.
+    rows = [catalog.get(symbol) for symbol in symbols]
+    return {row[1]: status_of(row) for row in rows if row is not None}
+
+
+def apply(client, store, tracked, changes, removed=()):
+    """Update the status store and the subscriptions; opened and closed assets act immediately."""
+    if changes:
+        store.update(changes)
+    if removed:
+        store.remove(removed)
+
+    for symbol, change in changes.items():
+        if change['open'] and symbol not in tracked:
+            logger.info(f"🟢 MARKET OPENED: {symbol}. Auto-subscribing for live data...")
+            client.start_candles_stream(symbol, 60, owner=OWNER)
+            tracked.add(symbol)
+        elif not change['open'] and symbol in tracked:
+            logger.info(f"🔴 MARKET CLOSED: {symbol}. Stopping data collection.")
+            client.stop_candles_stream(symbol, owner=OWNER)
+            tracked.discard(symbol)
+    for symbol in removed:
+        if symbol in tracked:
+            logger.info(f"🔴 MARKET REMOVED: {symbol}. Stopping data collection.")
+            client.stop_candles_stream(symbol, owner=OWNER)
+            tracked.discard(symbol)
+
 
 async def run_otc_harvester():
-    print("🚀 Initializing OTC Data Harvester Engine...")
-    
+    logger.info("🚀 Initializing OTC Data Harvester Engine...")
+
     # 1. Login
     email, password = credentials()
     client = Quotex(email=email, password=password)
     check, reason = await client.connect()
-    
+
     if not check:
-        print(f"❌ Connection Failed: {reason}")
-        return
-
-    print("✅ Connected to Quotex Broker.")
-    
-    # Track state
-    known_open_assets = set()
-    
+        logger.error(f"❌ Connection Failed: {reason}")
+        sys.exit(1)
+
+    logger.info("✅ Connected to Quotex Broker.")
+
+    store = MarketStatusStore(STATUS_FILE, heartbeat=HEARTBEAT)
+    tracked = set()
+    # Subscribe before reading the rows, so no push falls between the two.
+    diffs = client.catalog.subscribe()
+    rows = await client.get_instruments()
+    logger.info(f"🔍 {len(rows)} assets from the {client.catalog.source} catalog.")
+    current = {i[1]: status_of(i) for i in rows}
+    apply(client, store, tracked, current, [s for s in store.all() if s not in current])
+    logger.info(f"📊 Tracking {len(tracked)} Active Broker Assets.")
+
+    # Every instruments/list push is diffed against the catalog, only changes arrive here.
     while True:
         try:
-            print("\n🔍 Scanning Market Status...")
-            instruments = await client.get_instruments()
-            
-            broker_assets = [
-                {'symbol': i[1], 'name': i[2], 'open': bool(i[14])} 
-                for i in instruments 
-            ]
-            with open("harvester_debug.txt", "a") as f:
-                f.write(f"[{time.ctime()}] Discovered {len(broker_assets)} assets\n")
-                if len(broker_assets) > 0:
-                    f.write(f"Sample: {broker_assets[0]['symbol']}\n")
-                f.write(f"Is AUDCAD present? {any(a['symbol'] == 'AUDCAD' for a in broker_assets)}\n")
-            
-            print(f"   [Harvester] Discovered {len(broker_assets)} assets. sample: {broker_assets[0]['symbol'] if broker_assets else 'None'}", flush=True)
-            
-            # Check for a specific regular one
-            found_audcad = any(a['symbol'] == 'AUDCAD' for a in broker_assets)
-            if not found_audcad:
-                print("   [Harvester] WARNING: AUDCAD not found in instruments list!", flush=True)
-            else:
-                print("   [Harvester] OK: AUDCAD found.", flush=True)
-            
-            current_open = {a['symbol'] for a in broker_assets if a['open']}
-            current_closed = {a['symbol'] for a in broker_assets if not a['open']}
-            
-            # Save market status to file for API
-            import os
-            data_dir = os.path.join(os.path.dirname(__file__), 'data')
-            os.makedirs(data_dir, exist_ok=True)
-            status_file = os.path.join(data_dir, 'market_status.json')
-            
-            market_status = {}
-            for asset_info in broker_assets:
-                market_status[asset_info['symbol']] = {
-                    'name': asset_info['name'],
-                    'open': asset_info['open'],
-                    'last_checked': time.time()
-                }
-            
-            with open(status_file, 'w') as f:
-                json.dump(market_status, f)
-            
-            # Detect Changes
-            newly_opened = current_open - known_open_assets
-            newly_closed = known_open_assets - current_open
-            
-            # Handle Closed Markets
-            for asset in newly_closed:
-                print(f"🔴 MARKET CLOSED: {asset}. Stopping data collection.")
-                client.stop_candles_stream(asset)
-                known_open_assets.remove(asset)
-                
-            # Handle Opened Markets
-            for asset in newly_opened:
-                print(f"🟢 MARKET OPENED: {asset}. Auto-subscribing for live data...")
-                # Subscribe to 1M candles
-                client.start_candles_stream(asset, 60)
-                known_open_assets.add(asset)
-            
-            print(f"📊 Tracking {len(known_open_assets)} Active Broker Assets.", flush=True)
-            
-            # Process Live Data for ALL tracked assets
-            # In a real engine, you would dump this to a DB
-            if known_open_assets:
-                sample_asset = list(known_open_assets)[0]
+            diff = await asyncio.wait_for(diffs.get(), HEARTBEAT)
+        except asyncio.TimeoutError:
+            if client.api.state.state in FAILURES:
+                # Subscriptions are replayed and the new list is diffed against the catalog.
+                state = client.api.state
+                logger.warning(f"🔌 Connection {state.state}" + (f" ({state.reason})" if state.reason else "") + ". Reconnecting...")
+                check, reason = await client.connect()
+                if not check:
+                    # Exit so the platform restarts the worker; the heartbeat has stopped meanwhile.
+                    logger.error(f"❌ Reconnection Failed: {reason}")
+                    sys.exit(1)
+                logger.info("✅ Reconnected to Quotex Broker.")
+                continue
+            if not client.api.state.reached(AUTHORIZED):
+                continue
+            store.touch()
+            if logger.isEnabledFor(logging.DEBUG) and tracked:
+                sample_asset = next(iter(tracked))
                 price_data = client.api.realtime_price.get(sample_asset)
                 if price_data:
-                    print(f"   ⚡ Data Flowing... (Sample: {sample_asset} @ {price_data[-1]['price']})")
+                    logger.debug(f"⚡ Data Flowing... (Sample: {sample_asset} @ {price_data[-1]['price']})")
                 else:
-                    print("   ⏳ Waiting for first ticks...")
-            
-            await asyncio.sleep(10) # Scan every 10 seconds
-            
+                    logger.debug("⏳ Waiting for first ticks...")
+            continue
+        try:
+            logger.debug(
+                f"Catalog diff: {len(diff['added'])} added, {len(diff['removed'])} removed, "
+                f"{len(diff['changed'])} changed"
+            )
+            apply(client, store, tracked, market_changes(client.catalog, diff), diff["removed"])
+            logger.debug(f"📊 Tracking {len(tracked)} Active Broker Assets.")
         except Exception as e:
-            print(f"⚠️ Error in loop: {e}")
-            await asyncio.sleep(5)
-            # Reconnect logic could go here
+            logger.error(f"⚠️ Error applying market changes: {e}")
+
+
+async def follow_bus(url):
+    """Keep the status file from the bus' market.status events, without a broker session of its own.
+
+    The shard supervisor publishes every change and the whole market every
+    minute, so the file is only heartbeated while those keep coming.
+    """
+    logger.info(f"📡 Following market status on {url}...")
+    store = MarketStatusStore(STATUS_FILE, heartbeat=HEARTBEAT)
+    bus = await open_bus(url)
+    events = bus.subscribe(MARKET_STATUS)
+    try:
+        while True:
+            batch = [await events.get()]
+            while True:
+                try:
+                    batch.append(events.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+            known = store.all()
+            changes = {}
+            for _, event in batch:
+                change = {'name': event['name'], 'open': event['open']}
+                current = known.get(event['asset']) or {}
+                if {k: current.get(k) for k in change} != change:
+                    changes[event['asset']] = change
+            if changes:
+                for symbol in store.update(changes):
+                    logger.info(f"{'🟢 MARKET OPENED' if changes[symbol]['open'] else '🔴 MARKET CLOSED'}: {symbol}.")
+            else:
+                store.touch()
+    finally:
+        await bus.close()
+
 
 if __name__ == "__main__":
-    asyncio.run(run_otc_harvester())
+    # With a bus the sharded harvester is already logged in, follow it instead.
+    bus_url = os.getenv("LUX_BUS")
+    asyncio.run(follow_bus(bus_url) if bus_url else run_otc_harvester())
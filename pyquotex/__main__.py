@@ -1,6 +1,5 @@
 import sys
 import locale
-import pyfiglet
 
 __author__ = "Cleiton Leonel Creton"
 __version__ = "1.0.3"
@@ -43,6 +42,7 @@ def detect_user_language() -> str:
 
 def display_banner():
     """Displays the application banner, including the private version ad."""
+    import pyfiglet
     custom_font = pyfiglet.Figlet(font="ansi_shadow")
     ascii_art = custom_font.renderText("PyQuotex")
 
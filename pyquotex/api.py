@@ -5,9 +5,6 @@ import time
 import json
 import ssl
 import asyncio
-import urllib3
-import requests
-import certifi
 import logging
 import platform
 import threading
@@ -16,7 +13,8 @@ from .http.login import Login
 from .http.logout import Logout
 from .http.settings import Settings
 from .http.history import GetHistory
-from .http.navigator import Browser
+from .http.session import SessionManager
+from .http.async_navigator import AsyncBrowser
 from .ws.channels.ssid import Ssid
 from .ws.channels.buy import Buy
 from .ws.channels.candles import GetCandles
@@ -25,24 +23,42 @@ from .ws.objects.timesync import TimeSync
 from .ws.objects.candles import Candles
 from .ws.objects.profile import Profile
 from .ws.objects.listinfodata import ListInfoData
+from .ws.objects.dealtracker import DealTracker
+from .ws.objects.catalog import InstrumentCatalog
 from .ws.client import WebsocketClient
+from .ws.subscriptions import SubscriptionManager
+from .ws.state import ConnectionState, CONNECTING, OPEN, AUTHORIZED, READY, REJECTED, CLOSED
+from .utils.cache import CachedValue
 from collections import defaultdict
+from functools import lru_cache
 
-urllib3.disable_warnings()
 logger = logging.getLogger(__name__)
 
-cert_path = certifi.where()
-os.environ['SSL_CERT_FILE'] = cert_path
-os.environ['WEBSOCKET_CLIENT_CA_BUNDLE'] = cert_path
-cacert = os.environ.get('WEBSOCKET_CLIENT_CA_BUNDLE')
 
-ssl_context = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
-ssl_context.check_hostname = False
-ssl_context.verify_mode = ssl.CERT_NONE
-ssl_context.options |= ssl.OP_NO_TLSv1 | ssl.OP_NO_TLSv1_1 | ssl.OP_NO_TLSv1_2
-ssl_context.minimum_version = ssl.TLSVersion.TLSv1_3
+@lru_cache(maxsize=None)
+def websocket_ssl():
+    """The CA bundle and TLS context of the websocket, built on the first connection.
 
-ssl_context.load_verify_locations(cert_path)
+    Locating the certifi bundle and loading it into a context takes longer
+    than importing the rest of the package, so processes that never connect
+    do not pay for it.
+
+    :returns: ``(cacert, ssl_context)``.
+    """
+    import certifi
+    cert_path = certifi.where()
+    os.environ['SSL_CERT_FILE'] = cert_path
+    os.environ['WEBSOCKET_CLIENT_CA_BUNDLE'] = cert_path
+    cacert = os.environ.get('WEBSOCKET_CLIENT_CA_BUNDLE')
+
+    ssl_context = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+    ssl_context.check_hostname = False
+    ssl_context.verify_mode = ssl.CERT_NONE
+    ssl_context.options |= ssl.OP_NO_TLSv1 | ssl.OP_NO_TLSv1_1 | ssl.OP_NO_TLSv1_2
+    ssl_context.minimum_version = ssl.TLSVersion.TLSv1_3
+
+    ssl_context.load_verify_locations(cert_path)
+    return cacert, ssl_context
 
 
 def nested_dict(n, type):
@@ -52,6 +68,11 @@ def nested_dict(n, type):
         return defaultdict(lambda: nested_dict(n - 1, type))
 
 
+def _set_future_result(future, result):
+    if not future.done():
+        future.set_result(result)
+
+
 class QuotexAPI(object):
     """Class for communication with Quotex API."""
     socket_option_opened = {}
@@ -70,7 +91,6 @@ class QuotexAPI(object):
     profit_in_operation = None
     sold_options_respond = None
     sold_digital_options_respond = None
-    listinfodata = ListInfoData()
     timesync = TimeSync()
     candles = Candles()
     profile = Profile()
@@ -83,7 +103,13 @@ class QuotexAPI(object):
             lang,
             proxies=None,
             resource_path=None,
-            user_data_dir="."
+            user_data_dir=".",
+            http=None,
+            profile_ttl=300,
+            subscriptions=None,
+            journal=None,
+            tick_listeners=None,
+            catalog=None
     ):
         """
         :param str host: The hostname or ip address of a Quotex server.
@@ -92,6 +118,19 @@ class QuotexAPI(object):
         :param str lang: The lang of a Quotex platform.
         :param proxies: The proxies of a Quotex server.
         :param user_data_dir: The path browser user data dir.
+        :param http: (optional) The :class:`AsyncBrowser
+            <pyquotex.http.async_navigator.AsyncBrowser>` pool to share.
+        :param float profile_ttl: Seconds the account digest stays cached.
+        :param subscriptions: (optional) The :class:`SubscriptionManager
+            <pyquotex.ws.subscriptions.SubscriptionManager>` to carry over from
+            a previous connection, its live set is replayed once authorized.
+        :param journal: (optional) The :class:`FrameJournal
+            <pyquotex.utils.journal.FrameJournal>` receiving every raw frame.
+        :param tick_listeners: (optional) List of ``listener(asset, timestamp, price)``
+            called on the websocket thread for every tick, shared across reconnections.
+        :param catalog: (optional) The :class:`InstrumentCatalog
+            <pyquotex.ws.objects.catalog.InstrumentCatalog>` reconciled with every
+            instrument list, shared across reconnections.
         """
         self.host = host
         self.https_url = f"https://{host}"
@@ -116,14 +155,26 @@ class QuotexAPI(object):
         self.historical_candles = {}
         self.candle_v2_data = {}
         self.realtime_price = {}
+        self.tick_listeners = tick_listeners if tick_listeners is not None else []
         self.realtime_price_data = []
         self.realtime_candles = {}
         self.realtime_sentiment = {}
         self.top_list_leader = {}
         self.session_data = {}
-        self.browser = Browser()
-        self.browser.set_headers()
+        self.order_waiters = {}
+        self._order_waiters_lock = threading.Lock()
+        self._last_request_id = 0
+        self.listinfodata = ListInfoData()
+        self.deals = DealTracker()
+        self.http = http or AsyncBrowser(proxies=proxies)
         self.settings = Settings(self)
+        self.profile_cache = CachedValue(self._fetch_profile, ttl=profile_ttl)
+        self.subscriptions = subscriptions or SubscriptionManager()
+        self.subscriptions.bind(self)
+        self.journal = journal
+        self.catalog = catalog if catalog is not None else InstrumentCatalog()
+        self.session_manager = SessionManager(self)
+        self.state = ConnectionState()
 
     @property
     def websocket(self):
@@ -174,7 +225,7 @@ class QuotexAPI(object):
             "settings": {
                 "chartId": "graph",
                 "chartType": 2,
-                "currentExpirationTime": int(time.time()) if not is_fast_option else end_time,
+                "currentExpirationTime": int(self.timesync.now_server()) if not is_fast_option else end_time,
                 "isFastOption": is_fast_option,
                 "isFastAmountOption": percent_mode,
                 "isIndicatorsMinimized": False,
@@ -218,6 +269,7 @@ class QuotexAPI(object):
         }
         data = f'42["account/change",{json.dumps(payload)}]'
         self.send_websocket_request(data)
+        self.profile_cache.invalidate()
 
     def get_history_line(self, asset_id, index, end_from_time, offset):
         payload = {
@@ -344,13 +396,14 @@ class QuotexAPI(object):
         """
         return GetHistory(self)
 
-    def send_http_request_v1(
+    async def send_http_request_v1(
             self,
             resource,
             method,
             data=None,
             params=None,
-            headers=None
+            headers=None,
+            timeout=None
     ):
         """Send http request to Quotex server.
 
@@ -360,46 +413,141 @@ class QuotexAPI(object):
         :param dict data: (optional) The http request data.
         :param dict params: (optional) The http request params.
         :param dict headers: (optional) The http request headers.
-        :returns: The instance of :class:`Response <requests.Response>`.
+        :param float timeout: (optional) The timeout for this request.
+        :returns: The instance of :class:`httpx.Response`.
         """
         url = resource.url
         logger.debug(url)
+        headers = headers or {}
+        request_headers = {
+            "Connection": "keep-alive",
+            "Accept-Encoding": "gzip, deflate, br",
+            "Accept-Language": "pt-BR,pt;q=0.8,en-US;q=0.5,en;q=0.3",
+            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8",
+            "Upgrade-Insecure-Requests": "1",
+            "Sec-Ch-Ua": '"Not_A Brand";v="8", "Chromium";v="120", "Google Chrome";v="120"',
+            "Sec-Ch-Ua-Mobile": "?0",
+            "Sec-Ch-Ua-Platform": '"Linux"',
+            "Sec-Fetch-Site": "same-origin",
+            "Sec-Fetch-User": "?1",
+            "Sec-Fetch-Dest": "document",
+            "Sec-Fetch-Mode": "navigate",
+            "Dnt": "1",
+        }
+        if headers.get('referer'):
+            request_headers["Referer"] = headers['referer']
         cookies = self.session_data.get('cookies')
         user_agent = self.session_data.get('user_agent')
         if cookies:
-            self.browser.headers["Cookie"] = cookies
+            request_headers["Cookie"] = cookies
         if user_agent:
-            self.browser.headers["User-Agent"] = user_agent
-        self.browser.headers["Connection"] = "keep-alive"
-        self.browser.headers["Accept-Encoding"] = "gzip, deflate, br"
-        self.browser.headers["Accept-Language"] = "pt-BR,pt;q=0.8,en-US;q=0.5,en;q=0.3"
-        self.browser.headers["Accept"] = (
-            "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8"
-        )
-        self.browser.headers["Referer"] = headers.get('referer')
-        self.browser.headers["Upgrade-Insecure-Requests"] = "1"
-        self.browser.headers["Sec-Ch-Ua"] = '"Not_A Brand";v="8", "Chromium";v="120", "Google Chrome";v="120"'
-        self.browser.headers["Sec-Ch-Ua-Mobile"] = "?0"
-        self.browser.headers["Sec-Ch-Ua-Platform"] = '"Linux"'
-        self.browser.headers["Sec-Fetch-Site"] = "same-origin"
-        self.browser.headers["Sec-Fetch-User"] = "?1"
-        self.browser.headers["Sec-Fetch-Dest"] = "document"
-        self.browser.headers["Sec-Fetch-Mode"] = "navigate"
-        self.browser.headers["Dnt"] = "1"
-        response = self.browser.send_request(
+            request_headers["User-Agent"] = user_agent
+        response = await self.http.send_request(
             method=method,
             url=url,
+            headers=request_headers,
             data=data,
-            params=params
+            params=params,
+            timeout=timeout
         )
+        import httpx
         try:
             response.raise_for_status()
-        except requests.exceptions.HTTPError:
+        except httpx.HTTPStatusError:
             return None
         return response
 
-    async def get_profile(self):
-        user_settings = self.settings.get_settings()
+    async def wait_ready(self, timeout=None):
+        """Wait until the websocket is authorized.
+
+        :returns: True if it is, False if the connection failed or after `timeout` seconds.
+        """
+        return await self.state.wait(AUTHORIZED, timeout) in (AUTHORIZED, READY)
+
+    def next_request_id(self):
+        """Get a `requestId` unique for this client, millisecond based."""
+        with self._order_waiters_lock:
+            self._last_request_id = max(self._last_request_id + 1, int(time.time() * 1000))
+            return self._last_request_id
+
+    def create_order_waiter(self, request_id, asset=None, amount=None, direction=None):
+        """Register an order waiting for the ack with `request_id`.
+
+        :returns: The waiter dict; its `future` is resolved with the ack,
+            `sent_at` and `ack_at` hold the :func:`time.perf_counter` times the
+            order went out and the ack arrived, `sent_time` the wall time it went out.
+        """
+        waiter = {
+            "request_id": request_id,
+            "future": asyncio.get_running_loop().create_future(),
+            "asset": asset,
+            "amount": amount,
+            "command": 0 if direction == "call" else 1,
+            "sent_at": None,
+            "sent_time": None,
+            "ack_at": None,
+        }
+        with self._order_waiters_lock:
+            self.order_waiters[request_id] = waiter
+        return waiter
+
+    def order_sent(self, request_id, sent_at, sent_time):
+        """Record when the order with `request_id` went out, on its waiter."""
+        with self._order_waiters_lock:
+            waiter = self.order_waiters.get(request_id)
+            if waiter is not None:
+                waiter["sent_at"] = sent_at
+                waiter["sent_time"] = sent_time
+
+    def discard_order_waiter(self, request_id):
+        with self._order_waiters_lock:
+            return self.order_waiters.pop(request_id, None)
+
+    def resolve_order_waiter(self, message):
+        """Match an ack, or an error, back to its pending order from the websocket thread.
+
+        Acks are matched by `requestId`, falling back to the oldest pending
+        order with the same asset, amount and direction. Errors carry no
+        `requestId` and resolve the oldest pending order with ``None``.
+
+        :returns: The resolved waiter, None if no order was pending.
+        """
+        with self._order_waiters_lock:
+            if not self.order_waiters:
+                return
+            request_id = message.get("requestId") if message else None
+            if request_id not in self.order_waiters:
+                request_id = next((
+                    key for key, waiter in self.order_waiters.items()
+                    if message is None or (
+                        waiter["asset"] == message.get("asset")
+                        and waiter["amount"] == message.get("amount")
+                        and waiter["command"] == message.get("command")
+                    )
+                ), None)
+            waiter = self.order_waiters.pop(request_id, None)
+        if waiter is None:
+            return None
+        waiter["ack_at"] = time.perf_counter()
+        future = waiter["future"]
+        if not future.done():
+            future.get_loop().call_soon_threadsafe(_set_future_result, future, message)
+        return waiter
+
+    async def get_profile(self, force=False):
+        """Get the account profile, cached for `profile_cache.ttl` seconds.
+
+        The cache is invalidated by balance updates, account changes and time
+        offset changes, and concurrent callers share one digest request.
+
+        :param bool force: Bypass the cache and fetch the digest.
+        :returns: The instance of :class:`Profile
+            <pyquotex.ws.objects.profile.Profile>`.
+        """
+        return await self.profile_cache.get(force)
+
+    async def _fetch_profile(self):
+        user_settings = await self.settings.get_settings()
         self.profile.nick_name = user_settings.get("data")["nickname"]
         self.profile.profile_id = user_settings.get("data")["id"]
         self.profile.demo_balance = float(user_settings.get("data").get("demoBalance", 0))
@@ -416,9 +564,10 @@ class QuotexAPI(object):
         history = await self.get_history(account_type, page_number)
         return history.get("data", {})
 
-    def change_time_offset(self, time_offset):
-        user_settings = self.settings.set_time_offset(time_offset)
+    async def change_time_offset(self, time_offset):
+        user_settings = await self.settings.set_time_offset(time_offset)
         self.profile.offset = user_settings.get("data").get("timeOffset")
+        self.profile_cache.invalidate()
         return self.profile
 
     def send_websocket_request(self, data, no_force_send=True):
@@ -452,13 +601,21 @@ class QuotexAPI(object):
 
         self.is_logged = True
 
-    async def start_websocket(self):
+    async def start_websocket(self, timeout=15):
+        """Open the websocket and wait for the handshake, without authorizing.
+
+        :param float timeout: Seconds the handshake may take.
+        :returns: The connection status and message.
+        """
         global_value.check_websocket_if_connect = None
         global_value.check_websocket_if_error = False
         global_value.websocket_error_reason = None
         if not global_value.SSID:
             await self.authenticate()
         self.websocket_client = WebsocketClient(self)
+        self.state.bind(asyncio.get_running_loop())
+        self.state.transition(CONNECTING)
+        cacert, ssl_context = websocket_ssl()
         payload = {
             "suppress_origin": True,    # CloudFlare handshake status 403 forbidden fix
             "ping_interval": 24,
@@ -482,55 +639,73 @@ class QuotexAPI(object):
         )
         self.websocket_thread.daemon = True
         self.websocket_thread.start()
-        while True:
+        state = await self.state.wait(OPEN, timeout)
+        if state is None:
+            logger.debug("Websocket handshake timed out.")
+            return False, "Websocket handshake timed out."
+        if state == CLOSED:
             if global_value.check_websocket_if_error:
                 return False, global_value.websocket_error_reason
-            elif global_value.check_websocket_if_connect == 0:
-                logger.debug("Websocket connection closed.")
-                return False, "Websocket connection closed."
-            elif global_value.check_websocket_if_connect == 1:
-                logger.debug("Websocket connected successfully!!!")
-                return True, "Websocket connected successfully!!!"
-            elif global_value.check_rejected_connection == 1:
-                global_value.SSID = None
-                logger.debug("Websocket Token Rejected.")
-                return True, "Websocket Token Rejected."
-
-    def send_ssid(self, timeout=10):
-        self.wss_message = None
+            logger.debug("Websocket connection closed.")
+            return False, "Websocket connection closed."
+        logger.debug("Websocket connected successfully!!!")
+        return True, "Websocket connected successfully!!!"
+
+    def send_ssid(self):
         if not global_value.SSID:
             return False
 
         self.ssid(global_value.SSID)
-        start_time = time.time()
+        return True
 
-        while self.wss_message is None:
-            if time.time() - start_time > timeout:
-                return False
-            time.sleep(0.5)
+    async def authorize(self, timeout=10):
+        """Send the session token and wait for the server's answer.
 
-        return True
+        :returns: True if accepted, False if the token was rejected, None
+            without an answer.
+        """
+        if self.state.reached(AUTHORIZED):
+            return True
+        # Back from a previous rejection, so the wait ends on the new answer.
+        self.state.transition(OPEN)
+        if not self.send_ssid():
+            return False
+        state = await self.state.wait(AUTHORIZED, timeout)
+        if state == REJECTED:
+            return False
+        return None if state in (None, CLOSED) else True
 
-    async def connect(self, is_demo):
-        """Method for connection to Quotex API."""
+    async def connect(self, is_demo, timeout=15):
+        """Method for connection to Quotex API.
+
+        :param is_demo: 1 for the practice account, 0 for the real one.
+        :param float timeout: Seconds each of the handshake and the authorization may take.
+        :returns: The connection status and message.
+        """
         self.account_type = is_demo
+        self.state.bind(asyncio.get_running_loop())
         global_value.ssl_Mutual_exclusion = False
         global_value.ssl_Mutual_exclusion_write = False
         if global_value.check_websocket_if_connect:
             logger.info("Closing websocket connection...")
             await self.close()
 
-        check_websocket, websocket_reason = await self.start_websocket()
+        check_websocket, websocket_reason = await self.start_websocket(timeout)
 
         if not check_websocket:
             return check_websocket, websocket_reason
-        check_ssid = self.send_ssid()
+        # The stored token costs one round trip, the html login only runs when it is rejected.
+        accepted = await self.authorize(timeout)
 
-        if not check_ssid:
+        if accepted is False:
             await self.authenticate()
             if self.is_logged:
-                self.send_ssid()
+                accepted = await self.authorize(timeout)
 
+        if not accepted:
+            reason = "rejected" if accepted is False else "not answered"
+            return False, f"Websocket authorization {reason}."
+        self.session_manager.start()
         return check_websocket, websocket_reason
 
     async def reconnect(self):
@@ -539,10 +714,10 @@ class QuotexAPI(object):
         await self.start_websocket()
 
     async def close(self):
+        self.session_manager.stop()
         if self.websocket_client:
             self.websocket.close()
-            await asyncio.sleep(1)
-            self.websocket_thread.join()
+            await asyncio.to_thread(self.websocket_thread.join, 5)
         return True
 
     def websocket_alive(self):
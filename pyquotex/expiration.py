@@ -95,7 +95,7 @@ def get_next_timeframe(timestamp, time_zone, timeframe: int, open_time: str = No
 
 
 def get_expiration_time(timestamp, duration):
-    now = datetime.now()
+    now = datetime.fromtimestamp(timestamp)
     new_date = now.replace(second=0, microsecond=0)
     exp = new_date + timedelta(seconds=duration)
     exp_date = exp.replace(second=0, microsecond=0)
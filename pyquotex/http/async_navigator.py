@@ -0,0 +1,116 @@
+"""Module for the shared asynchronous Quotex http client."""
+import ssl
+import asyncio
+import logging
+
+RETRY_STATUS = {429, 500, 502, 503, 504}
+USER_AGENT = "Mozilla/5.0 (X11; Ubuntu; Linux x86_64; rv:109.0) Gecko/20100101 Firefox/119.0"
+
+logger = logging.getLogger(__name__)
+
+
+def create_ssl_context(cipher_suite="DEFAULT@SECLEVEL=1", ecdh_curve="prime256v1"):
+    """Build the TLS context used by :class:`navigator.CipherSuiteAdapter`, for httpx."""
+    context = ssl.create_default_context(ssl.Purpose.SERVER_AUTH)
+    context.set_ciphers(cipher_suite)
+    context.set_ecdh_curve(ecdh_curve)
+    context.minimum_version = ssl.TLSVersion.TLSv1_2
+    context.maximum_version = ssl.TLSVersion.TLSv1_3
+    return context
+
+
+class AsyncBrowser(object):
+    """Keep-alive connection pool shared by every Quotex http resource.
+
+    Replaces one blocking :class:`requests.Session` per resource with a single
+    :class:`httpx.AsyncClient`, so http calls no longer stall the event loop
+    and concurrent requests reuse the same TLS connections.
+    """
+
+    def __init__(
+            self,
+            timeout=15.0,
+            max_connections=20,
+            retries=3,
+            backoff_factor=1.0,
+            proxies=None,
+            ssl_context=None,
+            debug=False
+    ):
+        """
+        :param float timeout: Default per-request timeout in seconds.
+        :param int max_connections: Size of the connection pool.
+        :param int retries: Retries on transport errors and `RETRY_STATUS` responses.
+        :param float backoff_factor: Base of the exponential backoff between retries.
+        :param proxies: A proxy url, or a requests-style ``{"https": url}`` mapping.
+        :param ssl_context: Optional :class:`ssl.SSLContext` to use.
+        """
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.debug = debug
+        self.default_headers = None
+        import httpx  # Deferred: importing httpx costs more than the rest of the package.
+        if isinstance(proxies, dict):
+            proxies = proxies.get("https") or proxies.get("http")
+        self.client = httpx.AsyncClient(
+            headers=self.get_headers(),
+            verify=ssl_context or create_ssl_context(),
+            timeout=httpx.Timeout(timeout),
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections
+            ),
+            proxy=proxies,
+            follow_redirects=True
+        )
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
+
+    @property
+    def is_closed(self):
+        return self.client.is_closed
+
+    def get_headers(self):
+        self.default_headers = {"User-Agent": USER_AGENT}
+        return dict(self.default_headers)
+
+    def get_cookies(self):
+        return '; '.join(f'{cookie.name}={cookie.value}' for cookie in self.client.cookies.jar)
+
+    async def send_request(self, method, url, headers=None, timeout=None, **kwargs):
+        """Send a request through the shared pool.
+
+        :param str method: The http request method.
+        :param str url: The request url.
+        :param dict headers: (optional) Headers merged over the client defaults.
+        :param float timeout: (optional) Timeout for this request only.
+        :returns: The instance of :class:`httpx.Response`.
+        """
+        import httpx
+        if timeout is not None:
+            kwargs["timeout"] = timeout
+        attempt = 0
+        while True:
+            try:
+                response = await self.client.request(method, url, headers=headers, **kwargs)
+            except httpx.TransportError:
+                if attempt >= self.retries:
+                    raise
+            else:
+                if response.status_code not in RETRY_STATUS or attempt >= self.retries:
+                    break
+            await asyncio.sleep(self.backoff_factor * 2 ** attempt)
+            attempt += 1
+
+        if self.debug:
+            logger.debug(f"→ {method} {url}")
+            logger.debug(f"Status: {response.status_code}")
+            logger.debug(f"Cookies: {self.get_cookies()}")
+        return response
+
+    async def aclose(self):
+        await self.client.aclose()
@@ -6,11 +6,11 @@ from ..http.resource import Resource
 class GetHistory(Resource):
     """Class for Quotex history resource."""
 
-    def _get(self, data=None, headers=None):
+    async def _get(self, data=None, headers=None):
         """Send get request for Quotex API history http resource.
-        :returns: The instance of :class:`navigator.Session`.
+        :returns: The instance of :class:`httpx.Response`.
         """
-        return self.send_http_request(
+        return await self.send_http_request(
             method="GET",
             data=data,
             headers=headers
@@ -24,7 +24,7 @@ class GetHistory(Resource):
             "content-type": "application/json",
             "accept": "application/json",
         }
-        response = self._get(headers=headers)
+        response = await self._get(headers=headers)
         if response:
             return response.json()
         return {}
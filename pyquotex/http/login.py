@@ -1,12 +1,61 @@
 import re
 import json
 import sys
+import time
+import html
 import asyncio
 from pathlib import Path
-from pyquotex.http.navigator import Browser
 
+# Targeted extraction from the login pages, a full soup tree of `/trade`
+# costs more than the request itself.
+TOKEN_INPUT = re.compile(r"""<input\b(?=[^>]*\bname=["']_token["'])[^>]*\bvalue=["']([^"']*)["']""", re.I)
+KEEP_CODE_INPUT = re.compile(r"""<input\b[^>]*\bname=["']keep_code["']""", re.I)
+AUTH_BODY_HINT = re.compile(
+    r"""<main\b[^>]*\bclass=["'][^"']*\bauth__body\b[^>]*>.*?<p\b[^>]*>(.*?)</p>""", re.I | re.S
+)
+ERROR_HINT = re.compile(
+    r"""<div\b[^>]*\bclass=["'][^"']*\b(?:hint--danger|input-control-cabinet__hint)\b[^>]*>(.*?)</div>""",
+    re.I | re.S
+)
+SETTINGS_ASSIGNMENT = re.compile(r"window\.settings\s*=\s*")
+TAG = re.compile(r"<[^>]+>")
 
-class Login(Browser):
+
+def text_of(fragment):
+    """Visible text of an html fragment."""
+    return html.unescape(TAG.sub("", fragment)).strip()
+
+
+def extract_settings(page):
+    """The ``window.settings`` object of the trade page.
+
+    Every assignment is decoded with a JSON decoder starting at its opening
+    brace, so nested objects and ``};`` inside strings need no guessing; the
+    one carrying a ``token`` wins.
+
+    :returns: The settings dict, or None.
+    """
+    decoder = json.JSONDecoder()
+    found = None
+    for match in SETTINGS_ASSIGNMENT.finditer(page):
+        try:
+            data, _ = decoder.raw_decode(page, match.end())
+        except ValueError:
+            continue
+        if isinstance(data, dict):
+            if data.get("token"):
+                return data
+            found = found or data
+    return found
+
+
+def cookie_expiry(jar):
+    """Earliest expiry among the session cookies of `jar`, None if they all last for the session."""
+    expiries = [cookie.expires for cookie in jar if cookie.expires]
+    return min(expiries) if expiries else None
+
+
+class Login(object):
     """Class for Quotex login resource."""
 
     url = ""
@@ -15,14 +64,40 @@ class Login(Browser):
     base_url = 'market-qx.trade'
     https_base_url = f'https://{base_url}'
 
-    def __init__(self, api, *args, **kwargs):
-        super().__init__(*args, **kwargs)
+    def __init__(self, api):
         self.api = api
+        self.browser = api.http
         self.html = None
-        self.headers = self.get_headers()
+        self.response = None
+        self.headers = self.browser.get_headers()
         self.full_url = f"{self.https_base_url}/{api.lang}"
 
-    def get_token(self):
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        # The connection pool is shared with the other resources, keep it open.
+        pass
+
+    async def send_request(self, method, url, **kwargs):
+        self.response = await self.browser.send_request(
+            method,
+            url,
+            headers=self.headers,
+            **kwargs
+        )
+        return self.response
+
+    def get_cookies(self):
+        return self.browser.get_cookies()
+
+    def get_soup(self):
+        if self.response is None:
+            raise RuntimeError("No response stored. Use send_request() first.")
+        from bs4 import BeautifulSoup
+        return BeautifulSoup(self.response.content, "html.parser")
+
+    async def get_token(self):
         self.headers["Connection"] = "keep-alive"
         self.headers["Accept-Encoding"] = "gzip, deflate, br"
         self.headers["Accept-Language"] = "pt-BR,pt;q=0.8,en-US;q=0.5,en;q=0.3"
@@ -39,16 +114,12 @@ class Login(Browser):
         self.headers["Sec-Fetch-Dest"] = "document"
         self.headers["Sec-Fetch-Mode"] = "navigate"
         self.headers["Dnt"] = "1"
-        self.send_request(
+        await self.send_request(
             "GET",
             f"{self.full_url}/sign-in/modal/"
         )
-        html = self.get_soup()
-        match = html.find(
-            "input", {"name": "_token"}
-        )
-        token = None if not match else match.get("value")
-        return token
+        match = TOKEN_INPUT.search(self.response.text)
+        return html.unescape(match.group(1)) if match else None
 
     async def awaiting_pin(self, data, input_message):
         from pathlib import Path
@@ -90,130 +161,116 @@ class Login(Browser):
 
         data["code"] = code
         await asyncio.sleep(1)
-        self.send_request(
+        await self.send_request(
             method="POST",
             url=f"{self.full_url}/sign-in/modal",
             data=data
         )
 
-    def get_profile(self):
-        self.response = self.send_request(
+    async def get_profile(self):
+        await self.send_request(
             method="GET",
             url=f"{self.full_url}/trade"
         )
-        if self.response:
-            # More robust search for window.settings
-            soup = self.get_soup()
-            scripts = soup.find_all("script")
-            settings_script = None
-            for s in scripts:
-                txt = s.get_text()
-                if txt and "window.settings =" in txt:
-                    if '"token"' in txt or "'token'" in txt:
-                        settings_script = txt
-                        break
-                    elif not settings_script:
-                        settings_script = txt
-            
-            if not settings_script:
-                return None, None
-
-            # Extract JSON from script
-            match = re.search(r"window\.settings\s*=\s*(\{.*?\});", settings_script, re.DOTALL)
-            if not match:
-                # Try without trailing semicolon if it's missing or different
-                match = re.search(r"window\.settings\s*=\s*(\{.*\})", settings_script, re.DOTALL)
-            
-            if match:
-                match_str = match.group(1)
-                try:
-                    data = json.loads(match_str)
-                    self.cookies = self.get_cookies()
-                    self.ssid = data.get("token")
-                    self.api.session_data["cookies"] = self.cookies
-                    self.api.session_data["token"] = self.ssid
-                    self.api.session_data["user_agent"] = self.headers["User-Agent"]
-                    output_file = Path(f"{self.api.resource_path}/session.json")
-                    output_file.parent.mkdir(exist_ok=True, parents=True)
-                    output_file.write_text(
-                        json.dumps({
-                            "cookies": self.cookies,
-                            "token": self.ssid,
-                            "user_agent": self.headers["User-Agent"]
-                        }, indent=4)
-                    )
-                    return self.response, data
-                except json.JSONDecodeError as e:
-                    return None, None
-            else:
+        if self.response.is_success:
+            data = extract_settings(self.response.text)
+            if data is None:
                 return None, None
+            self.cookies = self.get_cookies()
+            self.ssid = data.get("token")
+            expires_at = cookie_expiry(self.browser.client.cookies.jar)
+            self.api.session_data["cookies"] = self.cookies
+            self.api.session_data["token"] = self.ssid
+            self.api.session_data["user_agent"] = self.headers["User-Agent"]
+            self.api.session_data["expires_at"] = expires_at
+            self.api.session_data["issued_at"] = time.time()
+            output_file = Path(f"{self.api.resource_path}/session.json")
+            output_file.parent.mkdir(exist_ok=True, parents=True)
+            output_file.write_text(
+                json.dumps({
+                    "cookies": self.cookies,
+                    "token": self.ssid,
+                    "user_agent": self.headers["User-Agent"],
+                    "expires_at": expires_at,
+                    "issued_at": self.api.session_data["issued_at"]
+                }, indent=4)
+            )
+            return self.response, data
 
         return None, None
 
-    def _get(self):
-        return self.send_request(
+    async def _get(self):
+        return await self.send_request(
             method="GET",
-            url=f"f{self.full_url}/trade"
+            url=f"{self.full_url}/trade"
         )
 
-    async def _post(self, data):
+    async def _post(self, data, interactive=True):
         """Send get request for Quotex API login http resource.
-        :returns: The instance of :class:`requests.Response`.
+        :param bool interactive: Wait for the PIN when the server asks for one,
+            otherwise fail right away.
+        :returns: The login status and message.
         """
-        self.response = self.send_request(
+        await self.send_request(
             method="POST",
             url=f"{self.full_url}/sign-in/",
             data=data
         )
 
-        required_keep_code = self.get_soup().find(
-            "input", {"name": "keep_code"}
-        )
-        if required_keep_code:
-            auth_body = self.get_soup().find(
-                "main", {"class": "auth__body"}
-            )
+        page = self.response.text
+        if KEEP_CODE_INPUT.search(page):
+            hint = AUTH_BODY_HINT.search(page)
             input_message = (
-                f'{auth_body.find("p").text}: ' if auth_body.find("p")
+                f'{text_of(hint.group(1))}: ' if hint
                 else "Insira o código PIN que acabamos "
                      "de enviar para o seu e-mail: "
             )
+            if not interactive:
+                return False, "Login failed. A PIN is required."
             await self.awaiting_pin(data, input_message)
         await asyncio.sleep(1)
         success = self.success_login()
         return success
 
     def success_login(self):
-        if self.response.url.endswith("/trade") or "/trade/" in self.response.url:
+        url = str(self.response.url)
+        if url.endswith("/trade") or "/trade/" in url:
             return True, "Login successful."
-        html = self.get_soup()
-        match = html.find(
-            "div", {"class": "hint--danger"}
-        ) or html.find(
-            "div", {"class": "input-control-cabinet__hint"}
-        )
-        message_in_match = match.text.strip() if match else ""
+        match = ERROR_HINT.search(self.response.text)
+        message_in_match = text_of(match.group(1)) if match else ""
         return False, f"Login failed. {message_in_match}"
 
-    async def __call__(self, username, password, user_data_dir=None):
-        """Method to get Quotex API login http request.
+    async def sign_in(self, username, password, interactive=True):
+        """Run the login flow and store the new session.
+
         :param str username: The username of a Quotex server.
         :param str password: The password of a Quotex server.
-        :param str user_data_dir: The optional value for path userdata.
-        :returns: The instance of :class:`requests.Response`.
+        :param bool interactive: Wait for a PIN from ``pin.txt`` or the console
+            when the server asks for one; a background refresh must not.
+        :returns: The login status and message, without exiting on failure.
         """
         data = {
-            "_token": self.get_token(),
+            "_token": await self.get_token(),
             "email": username,
             "password": password,
             "remember": 1,
 
         }
-        status, msg = await self._post(data)
+        status, msg = await self._post(data, interactive)
+        if status:
+            await self.get_profile()
+        return status, msg
+
+    async def __call__(self, username, password, user_data_dir=None):
+        """Method to get Quotex API login http request.
+        :param str username: The username of a Quotex server.
+        :param str password: The password of a Quotex server.
+        :param str user_data_dir: The optional value for path userdata.
+        :returns: The login status and message.
+        """
+        status, msg = await self.sign_in(username, password)
         if not status:
             print(msg)
             exit(0)
 
-        self.get_profile()
-
         return status, msg
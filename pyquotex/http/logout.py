@@ -6,11 +6,11 @@ from ..http.resource import Resource
 class Logout(Resource):
     """Class for Quotex login resource."""
 
-    def _get(self, data=None, headers=None):
+    async def _get(self, data=None, headers=None):
         """Send get request for Quotex API login http resource.
-        :returns: The instance of :class:`navigator.Session`.
+        :returns: The instance of :class:`httpx.Response`.
         """
-        return self.send_http_request(
+        return await self.send_http_request(
             method="GET",
             data=data,
             headers=headers
@@ -21,4 +21,4 @@ class Logout(Resource):
         headers = {
             "referer": f"{self.api.https_url}/{self.api.lang}/trade"
         }
-        return self._get(headers=headers)
+        return await self._get(headers=headers)
@@ -3,7 +3,6 @@ import logging
 from requests import Session
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
-from bs4 import BeautifulSoup
 
 retry_strategy = Retry(
     total=3,
@@ -140,6 +139,7 @@ class Browser(Session):
     def get_soup(self):
         if not self.response:
             raise RuntimeError("No response stored. Use send_request() first.")
+        from bs4 import BeautifulSoup
         return BeautifulSoup(self.response.content, "html.parser")
 
     def get_json(self):
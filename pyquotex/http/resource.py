@@ -13,18 +13,20 @@ class Resource(object):
         """
         self.api = api
 
-    def send_http_request(self, method, data=None, params=None, headers=None):
+    async def send_http_request(self, method, data=None, params=None, headers=None, timeout=None):
         """Send http request to Quotex API.
         :param str method: The http request method.
         :param dict data: (optional) The http request data.
         :param dict params: (optional) The http request params.
         :param dict headers: (optional) The http request headers.
-        :returns: The instance of :class:`requests.Response`.
+        :param float timeout: (optional) The timeout for this request.
+        :returns: The instance of :class:`httpx.Response`.
         """
-        return self.api.send_http_request_v1(
+        return await self.api.send_http_request_v1(
             self,
             method,
             data=data,
             params=params,
-            headers=headers
+            headers=headers,
+            timeout=timeout
         )
@@ -0,0 +1,166 @@
+"""Module for keeping the Quotex login session valid between connections."""
+import time
+import asyncio
+import logging
+from .. import global_value
+
+logger = logging.getLogger(__name__)
+
+# Answers of the digest endpoint to a session it does not accept.
+REJECTED_STATUS = (401, 403, 419)
+
+
+class SessionManager(object):
+    """Validate the stored session cheaply and renew it before it lapses.
+
+    A restarted process authorizes the websocket straight away with the
+    token of ``session.json``; the full html login only runs when the server
+    rejects it. While connected, a background task checks the session with
+    the small ``cabinets/digest`` request and signs in again ahead of the
+    cookie expiry, so the next reconnect still costs a single handshake.
+    Only an explicit rejection triggers a new login; network errors are
+    retried later, and a login that asks for a PIN fails instead of
+    prompting from the background.
+    """
+
+    def __init__(self, api, check_interval=900, refresh_margin=3600, max_age=None, retry_interval=60):
+        """
+        :param api: The instance of :class:`QuotexAPI <pyquotex.api.QuotexAPI>`.
+        :param float check_interval: Seconds between background validations.
+        :param float retry_interval: Seconds before validating again when the
+            last check could not reach the server.
+        :param float refresh_margin: Sign in again this many seconds before
+            the session cookies expire.
+        :param float max_age: (optional) Sign in again once the session is this
+            old, for sessions whose cookies carry no expiry.
+        """
+        self.api = api
+        self.check_interval = check_interval
+        self.refresh_margin = refresh_margin
+        self.max_age = max_age
+        self.retry_interval = retry_interval
+        self.last_validated = None
+        self._task = None
+        self._lock = None
+
+    @property
+    def token(self):
+        return self.api.session_data.get("token")
+
+    def expires_in(self, now=None):
+        """Seconds until the session should be renewed, None when unknown."""
+        now = now or time.time()
+        deadlines = []
+        expires_at = self.api.session_data.get("expires_at")
+        if expires_at:
+            deadlines.append(expires_at - self.refresh_margin)
+        issued_at = self.api.session_data.get("issued_at")
+        if self.max_age and issued_at:
+            deadlines.append(issued_at + self.max_age)
+        return min(deadlines) - now if deadlines else None
+
+    async def validate(self, timeout=10):
+        """Check the stored cookies with the digest endpoint.
+
+        :returns: True if the session is accepted, False if the server
+            rejected it, None if that could not be told, e.g. on a network
+            error or a server error.
+        """
+        if not self.token or not self.api.session_data.get("cookies"):
+            return False
+        import httpx
+        try:
+            response = await self.api.http.send_request(
+                "GET",
+                f"{self.api.https_url}/api/v1/cabinets/digest",
+                headers=dict(self.api.settings.get_headers(), **{"content-type": "application/json"}),
+                timeout=timeout
+            )
+        except (httpx.HTTPError, OSError, asyncio.TimeoutError) as e:
+            logger.debug(f"Session validation failed: {e}")
+            return None
+        # Rejected sessions are answered with an error status or sent to the sign-in page.
+        redirect = str(response.url) + response.headers.get("location", "")
+        if response.status_code in REJECTED_STATUS or "sign-in" in redirect:
+            return False
+        if not response.is_success:
+            logger.debug(f"Session validation answered {response.status_code}.")
+            return None
+        try:
+            settings = response.json()
+        except ValueError:
+            return None
+        if isinstance(settings, dict) and isinstance(settings.get("data"), dict):
+            self.last_validated = time.time()
+            return True
+        return None
+
+    async def refresh(self, interactive=False):
+        """Sign in again and store the new session.
+
+        Concurrent callers share one login.
+
+        :param bool interactive: Wait for a PIN from ``pin.txt`` or the
+            console if the login asks for one, instead of failing.
+        :returns: The login status and message.
+        """
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        token = self.token
+        async with self._lock:
+            if self.token != token:
+                return True, "Session refreshed by a concurrent call."
+            async with self.api.login as login:
+                status, msg = await login.sign_in(self.api.username, self.api.password, interactive=interactive)
+            if status:
+                global_value.SSID = self.token
+                self.last_validated = time.time()
+                logger.info("Session refreshed.")
+            else:
+                logger.warning(f"Session refresh failed: {msg}")
+            return status, msg
+
+    async def ensure(self, interactive=False):
+        """Renew the session when it is due or rejected.
+
+        :param bool interactive: See :meth:`refresh`.
+        :returns: True if a usable session is stored, False if it could not
+            be renewed, None if the server could not be reached to tell.
+        """
+        due = self.expires_in()
+        if due is None or due > 0:
+            valid = await self.validate()
+            if valid is not False:
+                return valid
+        status, _ = await self.refresh(interactive)
+        return status
+
+    async def _run(self):
+        retry = False
+        while True:
+            due = self.expires_in()
+            delay = self.check_interval if due is None else max(min(self.check_interval, due), 1)
+            if retry:
+                delay = min(delay, self.retry_interval)
+            await asyncio.sleep(delay)
+            try:
+                status = await self.ensure()
+            except Exception as e:
+                logger.error(f"Session check failed: {e}")
+                status = None
+            if status is False:
+                # Every attempt may mail a new PIN; the next connect signs in interactively.
+                logger.warning("Session could not be renewed in the background, stopping the refresher.")
+                return
+            retry = status is None
+
+    def start(self):
+        """Keep the session fresh from a background task of the running loop."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        return self._task
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
@@ -1,36 +1,39 @@
-from ..http.navigator import Browser
+"""Module for Quotex http settings resource."""
 
+from ..http.resource import Resource
 
-class Settings(Browser):
 
-    def __init__(self, api):
-        super().__init__()
-        self.set_headers()
-        self.api = api
-        self.headers = self.get_headers()
+class Settings(Resource):
+    """Class for Quotex account settings resource."""
 
-    def get_settings(self):
-        self.headers["content-type"] = "application/json"
-        self.headers["referer"] = f"{self.api.https_url}/{self.api.lang}/trade"
-        self.headers["cookie"] = self.api.session_data["cookies"]
-        self.headers["user-agent"] = self.api.session_data["user_agent"]
-        response = self.send_request(
+    def get_headers(self):
+        return {
+            "referer": f"{self.api.https_url}/{self.api.lang}/trade",
+            "cookie": self.api.session_data["cookies"],
+            "user-agent": self.api.session_data["user_agent"],
+        }
+
+    async def get_settings(self, timeout=None):
+        headers = self.get_headers()
+        headers["content-type"] = "application/json"
+        response = await self.api.http.send_request(
             "GET",
-            f"{self.api.https_url}/api/v1/cabinets/digest"
+            f"{self.api.https_url}/api/v1/cabinets/digest",
+            headers=headers,
+            timeout=timeout
         )
         return response.json()
 
-    def set_time_offset(self, time_offset):
+    async def set_time_offset(self, time_offset, timeout=None):
         payload = {
             "time_offset": time_offset
         }
-        self.headers["referer"] = f"{self.api.https_url}/{self.api.lang}/trade"
-        self.headers["cookie"] = self.api.session_data["cookies"]
-        self.headers["user-agent"] = self.api.session_data["user_agent"]
-        response = self.send_request(
+        response = await self.api.http.send_request(
             method="POST",
             url=f"{self.api.https_url}/api/v1/user/profile/time_offset",
-            json=payload
+            headers=self.get_headers(),
+            json=payload,
+            timeout=timeout
         )
 
-        return response.json()
\ No newline at end of file
+        return response.json()
@@ -0,0 +1,239 @@
+"""Paper trading against the live tick stream, settled locally."""
+import time
+import heapq
+import uuid
+import asyncio
+import logging
+import threading
+
+from . import expiration
+from .ws.objects.dealtracker import DealTracker
+
+logger = logging.getLogger(__name__)
+
+
+class PaperTrader(object):
+    """Simulated account with the order interface of :class:`Quotex <pyquotex.stable_api.Quotex>`.
+
+    Orders never reach the broker: they open at the last tick of the asset,
+    sit in a heap ordered by expiry and are settled by the tick stream of
+    the connected client, with the payout the instrument shows at entry.
+    Any number of traders can share one client, each with its own balance,
+    so several strategies can run side by side on the same feed.
+
+    Example:
+        paper = PaperTrader(client, balance=1000)
+        paper.start()
+        status, order = await paper.buy(10, "EURUSD_otc", "call", 60)
+        win = await paper.check_win(order["id"])
+    """
+
+    def __init__(self, client, balance=10000.0, payout=None, grace=2.0, max_positions=100000):
+        """
+        Args:
+            client: The connected :class:`Quotex <pyquotex.stable_api.Quotex>` feeding ticks.
+            balance (float): Starting balance of the simulated account.
+            payout (float): Payout in percent for every asset, instead of the
+                instrument's current one.
+            grace (float): Seconds after expiry a position waits for a tick
+                before settling at the last known price.
+            max_positions (int): Open and closed positions kept for lookups.
+        """
+        self.client = client
+        self.initial_balance = balance
+        self.balance = balance
+        self.payout = payout
+        self.grace = grace
+        self.deals = DealTracker(max_open=max_positions, max_closed=max_positions)
+        self.last_prices = {}
+        self.owner = f"paper:{id(self)}"
+        self._assets = set()
+        self._heap = []
+        self._seq = 0
+        self._lock = threading.Lock()
+        self._task = None
+        client.add_tick_listener(self.on_tick)
+
+    def now(self):
+        api = getattr(self.client, "api", None)
+        return api.timesync.now_server() if api is not None else time.time()
+
+    async def payout_for(self, asset, duration):
+        """Payout fraction of `asset`, 5 minute rate from 300 s on, 1 minute rate below."""
+        if self.payout is not None:
+            return self.payout / 100
+        try:
+            payout = await self.client.get_payout_by_asset(asset, "5" if duration >= 300 else "1")
+        except Exception:
+            payout = None
+        return (payout or 0) / 100
+
+    async def _wait_price(self, asset, timeout):
+        deadline = time.monotonic() + timeout
+        while asset not in self.last_prices:
+            if time.monotonic() > deadline:
+                return None
+            await asyncio.sleep(0.05)
+        return self.last_prices[asset]
+
+    async def buy(self, amount: float, asset: str, direction: str, duration: int, time_mode: str = "TIME"):
+        """Open a simulated binary option.
+
+        Expiry follows the broker: OTC assets in timer mode expire after
+        `duration`, everything else at the next aligned expiration time.
+
+        Args:
+            amount (float): Stake, taken from the balance now.
+            asset (str): Asset to trade.
+            direction (str): ``call`` or ``put``.
+            duration (int): Duration in seconds.
+            time_mode (str): ``TIME`` or ``TIMER``, as for :meth:`Quotex.buy`.
+
+        Returns:
+            tuple: ``(True, order)`` with an ack shaped like the broker's, or
+            ``(False, reason)``.
+        """
+        if direction not in ("call", "put"):
+            return False, "invalid_direction"
+        if asset not in self._assets:
+            self._assets.add(asset)
+            self.client.start_candles_stream(asset, 60, owner=self.owner)
+        last = await self._wait_price(asset, timeout=10)
+        if last is None:
+            return False, "no_price"
+        now = self.now()
+        if asset.endswith("_otc") and time_mode.upper() != "TIME":
+            close_at = now + duration
+        else:
+            close_at = expiration.get_expiration_time_quotex(int(now), max(duration, 60))
+        payout = await self.payout_for(asset, close_at - now)
+        order = {
+            "id": str(uuid.uuid4()),
+            "asset": asset,
+            "amount": amount,
+            "command": 0 if direction == "call" else 1,
+            "openPrice": last[1],
+            "openTimestamp": now,
+            "closeTimestamp": close_at,
+            "percentProfit": round(payout * 100, 2),
+            "isDemo": 1,
+        }
+        with self._lock:
+            if amount <= 0 or amount > self.balance:
+                return False, "not_money"
+            self.balance -= amount
+            self._seq += 1
+            heapq.heappush(self._heap, (close_at, self._seq, order))
+        self.deals.open(order)
+        return True, order
+
+    def on_tick(self, asset, timestamp, price):
+        """Tick listener, runs on the websocket thread."""
+        # A position expiring strictly before this tick closes at the previous price.
+        self.settle(timestamp, before=True)
+        self.last_prices[asset] = (timestamp, price)
+        self.settle(timestamp)
+
+    def settle(self, now, before=False):
+        """Settle every position whose expiry has passed at `now`.
+
+        Returns:
+            int: The number of positions settled.
+        """
+        settled = 0
+        while True:
+            with self._lock:
+                if not self._heap:
+                    return settled
+                close_at, _, order = self._heap[0]
+                if close_at > now or (before and close_at == now):
+                    return settled
+                last = self.last_prices.get(order["asset"])
+                if last is None:
+                    if now < close_at + self.grace:
+                        return settled
+                    close_price = order["openPrice"]
+                else:
+                    close_price = last[1]
+                heapq.heappop(self._heap)
+                deal = self._close(order, close_price, now)
+            self.deals.close(deal)
+            settled += 1
+
+    def _close(self, order, close_price, now):
+        move = close_price - order["openPrice"]
+        if order["command"] == 1:
+            move = -move
+        if move > 0:
+            profit = round(order["amount"] * order["percentProfit"] / 100, 2)
+            self.balance += order["amount"] + profit
+        elif move == 0:
+            profit = 0.0
+            self.balance += order["amount"]
+        else:
+            profit = -order["amount"]
+        return dict(order, closePrice=close_price, profit=profit, closedAt=now)
+
+    async def _expire_loop(self, interval):
+        while True:
+            # Assets that stopped ticking still settle, at their last price, after `grace`.
+            now = self.now() - self.grace
+            if self._heap and self._heap[0][0] <= now:
+                self.settle(now)
+            await asyncio.sleep(interval)
+
+    def start(self, interval=0.25):
+        """Settle positions of silent assets from a background task."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._expire_loop(interval))
+        return self._task
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        self.client.remove_tick_listener(self.on_tick)
+        for asset in self._assets:
+            self.client.stop_candles_stream(asset, owner=self.owner)
+        self._assets.clear()
+
+    async def check_win(self, id_number: str, timeout: float = None):
+        """Wait for the position to settle.
+
+        Returns:
+            bool: True if it closed with a profit.
+        """
+        deal = await asyncio.wait_for(self.deals.wait(id_number), timeout)
+        return deal["win"]
+
+    async def get_result(self, operation_id: str):
+        deal = self.deals.closed_deals.get(operation_id)
+        if deal is None:
+            return None, "OperationID Not Found."
+        return ("win" if deal["profit"] > 0 else "loss"), deal
+
+    async def get_balance(self):
+        return float(f"{self.balance:.2f}")
+
+    def get_open_positions(self):
+        return list(self.deals.open_positions.values())
+
+    def deal_results(self):
+        return self.deals.stream()
+
+    def open_count(self):
+        return len(self._heap)
+
+    def stats(self):
+        closed = list(self.deals.closed_deals.values())
+        wins = sum(1 for d in closed if d["profit"] > 0)
+        losses = sum(1 for d in closed if d["profit"] < 0)
+        return {
+            "balance": round(self.balance, 2),
+            "pnl": round(self.deals.realized_pnl, 2),
+            "open": len(self._heap),
+            "closed": len(closed),
+            "wins": wins,
+            "losses": losses,
+            "win_rate": wins / (wins + losses) if wins + losses else None,
+        }
@@ -1,11 +1,18 @@
 import time
+import json
+import random
 import logging
 import asyncio
 from datetime import datetime
 from . import expiration
 from . import global_value
 from .api import QuotexAPI
+from .ws.subscriptions import SubscriptionManager, DEFAULT_OWNER
+from .ws.state import AUTHORIZED, READY
+from .ws.objects.catalog import InstrumentCatalog
+from .http.async_navigator import AsyncBrowser
 from .utils.services import truncate
+from .utils.trade_history import TradeHistory
 from .utils.processor import (
     calculate_candles,
     process_candles_v2,
@@ -19,10 +26,13 @@ from .config import (
     resource_path,
     credentials
 )
-from .utils.indicators import TechnicalIndicators
 
 logger = logging.getLogger(__name__)
 
+# Stream owners, see :class:`SubscriptionManager <pyquotex.ws.subscriptions.SubscriptionManager>`.
+ARMED_OWNER = "armed"
+ONE_STREAM_OWNER = "candles_one_stream"
+
 
 class Quotex:
 
@@ -35,7 +45,8 @@ class Quotex:
             root_path=".",
             user_data_dir="browser",
             asset_default="EURUSD",
-            period_default=60
+            period_default=60,
+            journal=None
     ):
         self.size = [
             5,
@@ -67,12 +78,24 @@ class Quotex:
         self.suspend = 0.2
         self.codes_asset = {}
         self.api = None
+        self.http = None
         self.duration = None
         self.websocket_client = None
         self.websocket_thread = None
         self.debug_ws_enable = False
+        self.armed_assets = {}
+        self.last_buy_timings = {}
+        self.trade_histories = {}
+        self.subscriptions = SubscriptionManager()
+        self.journal = journal
+        self.tick_listeners = []
         self.resource_path = resource_path(root_path)
-        session = load_session(user_agent)
+        # Instruments of the previous run, so lookups work before the live list arrives.
+        self.catalog = InstrumentCatalog(self.resource_path / "instruments.snapshot.gz")
+        if not self.catalog.load():
+            self.catalog.load(self.resource_path / "all_instruments.json")
+        # Next to the login's own session.json, so each root_path keeps its own session.
+        session = load_session(user_agent, self.resource_path)
         self.session_data = session
         if not email or not password:
             self.email, self.password = credentials()
@@ -84,13 +107,21 @@ class Quotex:
         """
         return self.websocket_client.wss
 
-    @staticmethod
-    async def check_connect():
-        await asyncio.sleep(2)
-        if global_value.check_accepted_connection == 1:
-            return True
+    async def check_connect(self, timeout=0):
+        """Whether the websocket is connected and authorized.
+
+        Args:
+            timeout (float): Seconds to wait for the authorization, 0 to
+                answer right away.
 
-        return False
+        Returns:
+            bool: True once the server accepted the session.
+        """
+        if self.api is None:
+            return False
+        if timeout:
+            return await self.api.wait_ready(timeout)
+        return self.api.state.reached(AUTHORIZED)
 
     def set_session(self, user_agent: str, cookies: str = None, ssid: str = None):
         session = {
@@ -98,38 +129,69 @@ class Quotex:
             "token": ssid,
             "user_agent": user_agent
         }
-        self.session_data = update_session(session)
+        self.session_data = update_session(session, self.resource_path)
 
     async def re_subscribe_stream(self):
-        try:
-            for ac in self.subscribe_candle:
-                sp = ac.split(",")
-                await self.start_candles_one_stream(sp[0], sp[1])
-        except:
-            pass
-        try:
-            for ac in self.subscribe_candle_all_size:
-                await self.start_candles_all_size_stream(ac)
-        except:
-            pass
+        """Send the whole live subscription set again.
+
+        Happens on its own after every reconnect, see :class:`SubscriptionManager
+        <pyquotex.ws.subscriptions.SubscriptionManager>`.
+        """
+        self.subscriptions.replay()
         try:
             for ac in self.subscribe_mood:
                 await self.start_mood_stream(ac)
         except:
             pass
 
-    async def get_instruments(self):
-        start_wait = time.time()
-        while self.check_connect and self.api.instruments is None:
-            await asyncio.sleep(0.2)
-            if time.time() - start_wait > 15: # 15s timeout
+    async def get_instruments(self, timeout=15, live=False):
+        """Get the instrument list.
+
+        Until the live ``instruments/list`` arrives the catalog snapshot of
+        the previous run is returned right away; the live list then replaces
+        it, see :attr:`catalog`.
+
+        Args:
+            timeout (float): Seconds to wait for the live list when there is
+                no snapshot, or with `live`.
+            live (bool): Always wait for the live list.
+
+        Returns:
+            list: The instrument rows.
+        """
+        if self.api is not None and self.api.instruments is not None:
+            return self.api.instruments
+        if not live and len(self.catalog):
+            return self.catalog.rows()
+        if self.api is not None:
+            # Ends as soon as the list arrives, or when the connection drops.
+            await self.api.state.wait(READY, timeout)
+            if self.api.instruments is None:
                 print("Timeout waiting for instruments/list")
-                break
-        return self.api.instruments or []
+            else:
+                return self.api.instruments
+        return self.catalog.rows()
+
+    async def get_live_catalog(self, timeout=15):
+        """Get the catalog once it holds the live list.
+
+        The snapshot is fine for symbols and names, but its open flags and
+        payouts may be from a previous run or the bundled list.
+
+        Args:
+            timeout (float): Seconds to wait for the live list.
+
+        Returns:
+            InstrumentCatalog: The catalog, still the snapshot if the live
+            list did not arrive in time.
+        """
+        if not self.catalog.is_live:
+            await self.get_instruments(timeout, live=True)
+        return self.catalog
 
     def get_all_asset_name(self):
-        if self.api.instruments:
-            return [[i[1], i[2].replace("\n", "")] for i in self.api.instruments]
+        if len(self.catalog):
+            return [[i[1], i[2].replace("\n", "")] for i in self.catalog.rows()]
 
     async def get_available_asset(self, asset_name: str, force_open: bool = False):
         _, asset_open = await self.check_asset_open(asset_name)
@@ -142,11 +204,12 @@ class Quotex:
         return asset_name, asset_open
 
     async def check_asset_open(self, asset_name: str):
-        instruments = await self.get_instruments()
-        for i in instruments:
-            if asset_name == i[1]:
+        catalog = await self.get_live_catalog()
+        i = catalog.get(asset_name)
+        if i is not None:
+            if self.api is not None:
                 self.api.current_asset = asset_name
-                return i, (i[0], i[2].replace("\n", ""), i[14])
+            return i, (i[0], i[2].replace("\n", ""), i[14])
 
         return [None, [None, None, None]]
 
@@ -164,7 +227,7 @@ class Quotex:
         index = expiration.get_timestamp()
         self.api.candles.candles_data = None
         self.api.current_asset = asset
-        self.start_candles_stream(asset, period)
+        self.request_chart(asset, period)
         self.api.get_candles(asset, index, end_from_time, offset, period)
         start_history_wait = time.time()
         while True:
@@ -222,7 +285,7 @@ class Quotex:
         index = expiration.get_timestamp()
         self.api.current_asset = asset
         self.api.historical_candles = None
-        self.start_candles_stream(asset)
+        self.request_chart(asset)
         self.api.get_history_line(self.codes_asset[asset], index, end_from_time, offset)
         while True:
             while self.check_connect and self.api.historical_candles is None:
@@ -233,7 +296,7 @@ class Quotex:
 
     async def get_candle_v2(self, asset, period):
         self.api.candle_v2_data[asset] = None
-        self.start_candles_stream(asset, period)
+        self.request_chart(asset, period)
         while self.api.candle_v2_data[asset] is None:
             await asyncio.sleep(0.2)
         candles = self.prepare_candles(asset, period)
@@ -256,16 +319,62 @@ class Quotex:
 
         return new_candles
 
-    async def connect(self):
+    async def connect(self, attempts=5, backoff=1.0, max_backoff=30.0, timeout=15):
+        """Connect and authorize the websocket.
+
+        Returns as soon as the server accepts the session. A failed attempt
+        is retried after an exponential backoff with jitter, so a fleet of
+        clients dropped together does not reconnect in lockstep.
+
+        Args:
+            attempts (int): Connection attempts before giving up.
+            backoff (float): Delay in seconds before the first retry.
+            max_backoff (float): Cap of the delay between retries.
+            timeout (float): Seconds each of the handshake and the
+                authorization may take.
+
+        Returns:
+            tuple: ``(True, message)`` once authorized, ``(False, reason)``
+            after the last failed attempt. ``self.api.state.timings`` holds
+            the time taken to reach each state.
+        """
+        check, reason = False, "No connection attempt."
+        for attempt in range(attempts):
+            if attempt:
+                delay = min(max_backoff, backoff * 2 ** (attempt - 1)) * random.uniform(0.5, 1.5)
+                logger.debug(f"Reconnecting on websocket in {delay:.1f}s: {reason}")
+                await self.api.close()
+                await asyncio.sleep(delay)
+            check, reason = await self._connect_once(timeout)
+            if check and await self.check_connect(timeout=timeout):
+                logger.debug(f"Connection timings: {self.api.state.timings}")
+                return check, reason
+            if check:
+                check, reason = False, f"Websocket not authorized ({self.api.state.state})."
+        return check, reason
+
+    async def _connect_once(self, timeout):
+        if self.http is None or self.http.is_closed:
+            self.http = AsyncBrowser()
+        if self.api is not None:
+            self.api.session_manager.stop()
         self.api = QuotexAPI(
             "market-qx.trade",
             self.email,
             self.password,
             self.lang,
             resource_path=self.resource_path,
-            user_data_dir=self.user_data_dir
+            user_data_dir=self.user_data_dir,
+            http=self.http,
+            subscriptions=self.subscriptions,
+            journal=self.journal,
+            tick_listeners=self.tick_listeners,
+            catalog=self.catalog
         )
-        await self.close()
+        await self.api.close()
+        # A new socket has no stored chart settings, the assets need arming again.
+        for asset in list(self.armed_assets):
+            self.disarm_order(asset)
         self.api.trace_ws = self.debug_ws_enable
         self.api.session_data = self.session_data
         self.api.current_asset = self.asset_default
@@ -275,13 +384,7 @@ class Quotex:
         if not self.session_data.get("token"):
             await self.api.authenticate()
 
-        check, reason = await self.api.connect(self.account_is_demo)
-
-        if not await self.check_connect():
-            logger.debug("Reconnecting on websocket")
-            return await self.connect()
-
-        return check, reason
+        return await self.api.connect(self.account_is_demo, timeout)
 
     async def reconnect(self):
         await self.api.authenticate()
@@ -301,8 +404,8 @@ class Quotex:
         self.account_is_demo = 0 if balance_mode.upper() == "REAL" else 1
         self.api.change_account(self.account_is_demo)
 
-    def change_time_offset(self, time_offset):
-        return self.api.change_time_offset(time_offset)
+    async def change_time_offset(self, time_offset):
+        return await self.api.change_time_offset(time_offset)
 
     async def edit_practice_balance(self, amount=None):
         self.api.training_balance_edit_request = None
@@ -363,6 +466,7 @@ class Quotex:
         lows = [float(candle["low"]) for candle in candles]
         timestamps = [candle["time"] for candle in candles]
 
+        from .utils.indicators import TechnicalIndicators
         indicators = TechnicalIndicators()
         indicator = indicator.upper()
 
@@ -495,7 +599,8 @@ class Quotex:
 
         try:
             # Iniciar stream de velas
-            self.start_candles_stream(asset, timeframe)
+            owner = f"indicator:{indicator}:{id(callback)}"
+            self.start_candles_stream(asset, timeframe, owner)
 
             while True:
                 try:
@@ -539,6 +644,7 @@ class Quotex:
                                 highs = [float(candle["high"]) for candle in historical_candles] + highs
                                 lows = [float(candle["low"]) for candle in historical_candles] + lows
 
+                        from .utils.indicators import TechnicalIndicators
                         indicators = TechnicalIndicators()
                         indicator = indicator.upper()
 
@@ -621,27 +727,72 @@ class Quotex:
         finally:
             # Limpiar suscripciones al salir
             try:
-                self.stop_candles_stream(asset)
+                self.stop_candles_stream(asset, owner)
             except:
                 pass
 
-    async def get_profile(self):
-        return await self.api.get_profile()
+    async def get_profile(self, force: bool = False):
+        return await self.api.get_profile(force)
 
     async def get_server_time(self):
-        user_settings = await self.get_profile()
-        offset_zone = user_settings.offset
-        self.api.timesync.server_timestamp = expiration.get_server_timer(offset_zone)
+        """Server timestamp from the local clock model in `TimeSync`.
+
+        The model is fed by tick frames and order acks, so no HTTP round trip
+        is needed before an order.
+        """
+        self.api.timesync.server_timestamp = self.api.timesync.now_server()
         return self.api.timesync.server_timestamp
 
+    async def arm_order(self, asset: str, duration: int, time_mode: str = "TIME"):
+        """Pre-arm the order path for an asset so `buy` only sends `orders/open`.
+
+        Subscribes the asset and stores the chart settings once, loads the profile
+        offset and keeps it refreshed in the background.
+
+        Args:
+            asset (str): Asset to arm.
+            duration (int): Duration the orders will use.
+            time_mode (str): Time mode the orders will use.
+        """
+        if self.armed_assets.get(asset) != duration:
+            self.stop_candles_stream(asset, ARMED_OWNER)
+            self.start_candles_stream(asset, duration, ARMED_OWNER)
+            self.api.settings_apply(
+                asset,
+                duration,
+                is_fast_option=time_mode.upper() == "TIME"
+            )
+            self.armed_assets[asset] = duration
+        await self.get_profile()
+        self.api.profile_cache.start_refresher()
+
+    def disarm_order(self, asset: str):
+        if self.armed_assets.pop(asset, None) is not None:
+            self.stop_candles_stream(asset, ARMED_OWNER)
+
+    def get_trade_history(self):
+        """Get the local trade history table of the current account type.
+
+        Returns:
+            TradeHistory: Ticket-indexed history, synced incrementally.
+        """
+        account_type = "demo" if self.account_is_demo else "live"
+        history = self.trade_histories.get(account_type)
+        if history is None:
+            history = TradeHistory(self.api, account_type)
+            self.trade_histories[account_type] = history
+        history.api = self.api
+        return history
+
     async def get_history(self):
         """Get the trader's history based on account type.
 
         Returns:
-            The trading history from the API.
+            The known trades, newest first, after fetching the newer pages.
         """
-        account_type = "demo" if self.account_is_demo else "live"
-        return await self.api.get_trader_history(account_type, page_number=1)
+        history = self.get_trade_history()
+        await history.sync()
+        return history.latest()
 
     async def buy(self, amount: float, asset: str, direction: str, duration: int, time_mode: str = "TIME"):
         """
@@ -658,33 +809,131 @@ class Quotex:
             The buy result.
 
         """
+        submitted_at = time.perf_counter()
         self.api.buy_id = None
-        request_id = expiration.get_timestamp()
+        request_id = self.api.next_request_id()
         is_fast_option = time_mode.upper() == "TIME"
-        self.start_candles_stream(asset, duration)
+        armed = self.armed_assets.get(asset) == duration
+        # Held only until the ack, so the order does not pin the asset's stream.
+        owner = f"order:{request_id}"
+        if not armed:
+            self.start_candles_stream(asset, duration, owner)
+        try:
+            await self.get_server_time()
+            waiter = self.api.create_order_waiter(request_id, asset, amount, direction)
+            self.api.buy(amount, asset, direction, duration, request_id, is_fast_option, armed)
+            message = await asyncio.wait_for(waiter["future"], timeout=duration)
+        except asyncio.TimeoutError:
+            self.api.discard_order_waiter(request_id)
+            return False, self.api.buy_successful
+        finally:
+            if not armed:
+                self.stop_candles_stream(asset, owner)
+
+        if message is None:
+            return False, global_value.websocket_error_reason
+
+        resolved_at = time.perf_counter()
+        ack_at = waiter["ack_at"] or resolved_at
+        self.last_buy_timings = {
+            "armed": armed,
+            "prepare_ms": (waiter["sent_at"] - submitted_at) * 1000,
+            "ack_ms": (ack_at - waiter["sent_at"]) * 1000,
+            "wakeup_ms": (resolved_at - ack_at) * 1000,
+            "total_ms": (resolved_at - submitted_at) * 1000,
+        }
+        return True, message
+
+    async def buy_many(self, orders, timeout: float = None):
+        """Place several orders in one burst and match each ack by `requestId`.
+
+        All `orders/open` frames are sent back to back before waiting, so the
+        batch costs a single round trip instead of one per order.
+
+        Args:
+            orders (list): Dicts with `amount`, `asset`, `direction`, `duration`
+                and optional `time_mode`, or ``(amount, asset, direction, duration)`` tuples.
+            timeout (float): Seconds to wait for the acks, defaults to the
+                shortest duration of the batch.
+
+        Returns:
+            list: One dict per order, in order, with `asset`, `request_id`,
+            `success`, `result` (the ack or the error reason) and `ack_ms`.
+        """
+        orders = [
+            order if isinstance(order, dict) else dict(zip(("amount", "asset", "direction", "duration"), order))
+            for order in orders
+        ]
+        if not orders:
+            return []
+        owner = f"orders:{self.api.next_request_id()}"
+        streamed = set()
+        for order in orders:
+            if self.armed_assets.get(order["asset"]) != order["duration"]:
+                self.start_candles_stream(order["asset"], order["duration"], owner)
+                streamed.add(order["asset"])
+        try:
+            return await self._buy_many(orders, timeout)
+        finally:
+            for asset in streamed:
+                self.stop_candles_stream(asset, owner)
+
+    async def _buy_many(self, orders, timeout):
         await self.get_server_time()
-        self.api.buy(amount, asset, direction, duration, request_id, is_fast_option)
 
-        count = 0.1
-        while self.api.buy_id is None:
-            count += 0.1
-            if count > duration:
-                status_buy = False
-                break
-            await asyncio.sleep(0.2)
-            if global_value.check_websocket_if_error:
-                return False, global_value.websocket_error_reason
-        else:
-            status_buy = True
+        pending = []
+        for order in orders:
+            request_id = self.api.next_request_id()
+            waiter = self.api.create_order_waiter(
+                request_id,
+                order["asset"],
+                order["amount"],
+                order["direction"]
+            )
+            self.api.buy(
+                order["amount"],
+                order["asset"],
+                order["direction"],
+                order["duration"],
+                request_id,
+                order.get("time_mode", "TIME").upper() == "TIME",
+                self.armed_assets.get(order["asset"]) == order["duration"]
+            )
+            pending.append((order, request_id, waiter))
+
+        if timeout is None:
+            timeout = min(order["duration"] for order in orders)
+        await asyncio.wait(
+            [waiter["future"] for _, _, waiter in pending],
+            timeout=timeout
+        )
 
-        return status_buy, self.api.buy_successful
+        results = []
+        for order, request_id, waiter in pending:
+            future = waiter["future"]
+            if not future.done():
+                self.api.discard_order_waiter(request_id)
+                future.cancel()
+                success, result = False, "timeout"
+            elif future.result() is None:
+                success, result = False, global_value.websocket_error_reason
+            else:
+                success, result = True, future.result()
+            results.append({
+                "asset": order["asset"],
+                "request_id": request_id,
+                "success": success,
+                "result": result,
+                "ack_ms": (waiter["ack_at"] - waiter["sent_at"]) * 1000 if waiter["ack_at"] else None,
+            })
+        return results
 
     async def open_pending(self, amount: float, asset: str, direction: str, duration: int, open_time: str = None):
         self.api.pending_id = None
         user_settings = await self.get_profile()
         offset_zone = user_settings.offset
         open_time = expiration.get_next_timeframe(
-            int(time.time()),
+            int(self.api.timesync.now_server()),
             offset_zone,
             duration,
             open_time
@@ -713,10 +962,11 @@ class Quotex:
             await asyncio.sleep(0.2)
         return self.api.sold_options_respond
 
-    def get_payment(self):
+    async def get_payment(self):
         """Payment Quotex server"""
         assets_data = {}
-        for i in self.api.instruments:
+        catalog = await self.get_live_catalog()
+        for i in catalog.rows():
             assets_data[i[2].replace("\n", "")] = {
                 "turbo_payment": i[18],
                 "payment": i[5],
@@ -730,22 +980,22 @@ class Quotex:
         return assets_data
 
     # Function suggested by https://t.me/Suppor_Mk in the message on telegram https://t.me/c/2215782682/1/2990
-    def get_payout_by_asset(self, asset_name: str, timeframe: str = "1"):
+    async def get_payout_by_asset(self, asset_name: str, timeframe: str = "1"):
         """Payout Quotex server"""
         assets_data = {}
-        for i in self.api.instruments:
-            if asset_name == i[1]:
-                assets_data[i[1].replace("\n", "")] = {
-                    "turbo_payment": i[18],
-                    "payment": i[5],
-                    "profit": {
-                        "24H": i[-10],
-                        "1M": i[-9],
-                        "5M": i[-8]
-                    },
-                    "open": i[14]
-                }
-                break
+        catalog = await self.get_live_catalog()
+        i = catalog.get(asset_name)
+        if i is not None:
+            assets_data[i[1].replace("\n", "")] = {
+                "turbo_payment": i[18],
+                "payment": i[5],
+                "profit": {
+                    "24H": i[-10],
+                    "1M": i[-9],
+                    "5M": i[-8]
+                },
+                "open": i[14]
+            }
 
         data = assets_data.get(asset_name)
         if timeframe == "all":
@@ -753,40 +1003,91 @@ class Quotex:
 
         return data.get("profit").get(f"{timeframe}M")
 
-    async def start_remaing_time(self):
-        now_stamp = datetime.fromtimestamp(expiration.get_timestamp())
-        expiration_stamp = datetime.fromtimestamp(self.api.timesync.server_timestamp)
+    async def start_remaing_time(self, close_timestamp=None):
+        now_stamp = datetime.fromtimestamp(self.api.timesync.now_server())
+        expiration_stamp = datetime.fromtimestamp(close_timestamp or self.api.timesync.server_timestamp)
         remaing_time = int((expiration_stamp - now_stamp).total_seconds())
         while remaing_time >= 0:
             remaing_time -= 1
             print(f"\rRemaining {remaing_time if remaing_time > 0 else 0} seconds...", end="")
             await asyncio.sleep(1)
 
-    async def check_win(self, id_number: int):
-        """Check win based id"""
+    async def check_win(self, id_number: int, timeout: float = None):
+        """Check win based id.
+
+        Waits on the deal future resolved by the websocket thread when the
+        deals frame arrives, instead of polling.
+
+        Args:
+            id_number: The id of the order ack.
+            timeout (float): Seconds to wait, ``None`` waits until the deal closes.
+        Returns:
+            bool: True if the deal closed with a profit.
+        """
+        position = self.api.deals.get_position(id_number)
         task = asyncio.create_task(
-            self.start_remaing_time()
+            self.start_remaing_time(position and position["close_timestamp"])
         )
-        while True:
-            data_dict = self.api.listinfodata.get(id_number)
-            if data_dict and data_dict.get("game_state") == 1:
-                break
-            await asyncio.sleep(0.2)
-        task.cancel()
-        self.api.listinfodata.delete(id_number)
-        return data_dict["win"]
+        try:
+            deal = await asyncio.wait_for(self.api.deals.wait(id_number), timeout)
+        finally:
+            task.cancel()
+            self.api.deals.forget(id_number)
+            self.api.listinfodata.delete(id_number)
+        return deal["win"]
 
-    def start_candles_stream(self, asset: str = "EURUSD", period: int = 0):
+    def get_open_positions(self):
+        """Get the open positions with their expected close times."""
+        return list(self.api.deals.open_positions.values())
+
+    def deal_results(self):
+        """Async iterator yielding every deal as soon as it closes.
+
+        Example:
+            async for deal in client.deal_results():
+                print(deal["id"], deal["win"], deal["profit"])
+        """
+        return self.api.deals.stream()
+
+    def add_tick_listener(self, listener):
+        """Call `listener(asset, timestamp, price)` for every tick.
+
+        The listener runs on the websocket thread and must be quick; it
+        survives reconnections.
+        """
+        if listener not in self.tick_listeners:
+            self.tick_listeners.append(listener)
+
+    def remove_tick_listener(self, listener):
+        if listener in self.tick_listeners:
+            self.tick_listeners.remove(listener)
+
+    def start_candles_stream(self, asset: str = "EURUSD", period: int = 0, owner: str = DEFAULT_OWNER):
         """Start streaming candle data for a specified asset.
 
         Args:
             asset (str): The asset to stream data for.
             period (int, optional): The period for the candles. Defaults to 0.
+            owner (str, optional): Name of the consumer holding the stream, so
+                another consumer stopping it does not cut this one off.
         """
         self.api.current_asset = asset
-        self.api.subscribe_realtime_candle(asset, period)
-        self.api.chart_notification(asset)
-        self.api.follow_candle(asset)
+        self.subscriptions.acquire(asset, period, owner)
+        # Other owners may be reading the buffers of another period already.
+        self.api.realtime_price.setdefault(asset, [])
+        self.api.realtime_candles.setdefault(asset, {})
+
+    def request_chart(self, asset: str, period: int = 0):
+        """Ask once for the chart of `asset`, for a history request, without holding a stream.
+
+        Args:
+            asset (str): The asset of the request.
+            period (int, optional): The period of the request.
+        """
+        self.api.current_asset = asset
+        self.api.send_websocket_request(
+            f'42["instruments/update", {json.dumps({"asset": asset, "period": period})}]'
+        )
 
     async def store_settings_apply(
             self,
@@ -842,9 +1143,9 @@ class Quotex:
 
         return investments_settings
 
-    def stop_candles_stream(self, asset):
-        self.api.unsubscribe_realtime_candle(asset)
-        self.api.unfollow_candle(asset)
+    def stop_candles_stream(self, asset, owner: str = DEFAULT_OWNER, period: int = None):
+        """Release `owner`'s streams of `asset`; it is unsubscribed once nobody needs it."""
+        self.subscriptions.release(asset, period, owner)
 
     def start_signals_data(self):
         self.api.signals_subscribe()
@@ -858,7 +1159,7 @@ class Quotex:
         candles_dict = list(aggregate.values())[0]
         candles_dict['opening'] = candles_dict.pop('timestamp')
         candles_dict['closing'] = candles_dict['opening'] + period
-        candles_dict['remaining'] = candles_dict['closing'] - int(time.time())
+        candles_dict['remaining'] = candles_dict['closing'] - int(self.api.timesync.now_server())
         return candles_dict
 
 
@@ -918,58 +1219,37 @@ class Quotex:
             str: win if the trade is a win, loss otherwise.
             float: The profit from operations; returns 0 if no profit is recorded.
         """
-        data_history = await self.get_history()
-        for item in data_history:
-            if item.get("ticket") == operation_id:
-                profit = float(item.get("profitAmount", 0))
-                status = "win" if profit > 0 else "loss"
-                return status, item
-
-        return None, "OperationID Not Found."
-
-    async def start_candles_one_stream(self, asset, size):
+        item = await self.get_trade_history().get(operation_id)
+        if item is None:
+            return None, "OperationID Not Found."
+        profit = float(item.get("profitAmount", 0))
+        status = "win" if profit > 0 else "loss"
+        return status, item
+
+    async def start_candles_one_stream(self, asset, size, owner: str = ONE_STREAM_OWNER):
         if not (str(asset + "," + str(size)) in self.subscribe_candle):
             self.subscribe_candle.append((asset + "," + str(size)))
+        self.start_candles_stream(asset, int(size), owner)
         start = time.time()
-        self.api.candle_generated_check[str(asset)][int(size)] = {}
-        while True:
+        while not self.api.realtime_price.get(asset):
             if time.time() - start > 20:
                 logger.error(
                     '**error** start_candles_one_stream late for 20 sec')
+                self.stop_candles_one_stream(asset, size, owner)
                 return False
-            try:
-                if self.api.candle_generated_check[str(asset)][int(size)]:
-                    return True
-            except:
-                pass
-            try:
-                self.api.follow_candle(self.codes_asset[asset])
-            except:
-                logger.error('**error** start_candles_stream reconnect')
-                await self.connect()
             await asyncio.sleep(0.2)
+        return True
+
+    def stop_candles_one_stream(self, asset, size, owner: str = ONE_STREAM_OWNER):
+        key = asset + "," + str(size)
+        if key in self.subscribe_candle:
+            self.subscribe_candle.remove(key)
+        self.stop_candles_stream(asset, owner, int(size))
 
     async def start_candles_all_size_stream(self, asset):
-        self.api.candle_generated_all_size_check[str(asset)] = {}
         if not (str(asset) in self.subscribe_candle_all_size):
             self.subscribe_candle_all_size.append(str(asset))
-        start = time.time()
-        while True:
-            if time.time() - start > 20:
-                logger.error(f'**error** fail {asset} start_candles_all_size_stream late for 10 sec')
-                return False
-            try:
-                if self.api.candle_generated_all_size_check[str(asset)]:
-                    return True
-            except:
-                pass
-            try:
-                self.api.subscribe_all_size(self.codes_asset[asset])
-            except:
-                logger.error(
-                    '**error** start_candles_all_size_stream reconnect')
-                await self.connect()
-            await asyncio.sleep(0.2)
+        return await self.start_candles_one_stream(asset, 0)
 
     async def start_mood_stream(self, asset, instrument="turbo-option"):
         if asset not in self.subscribe_mood:
@@ -984,4 +1264,12 @@ class Quotex:
                 await asyncio.sleep(0.2)
 
     async def close(self):
+        self.catalog.flush()
+        self.api.profile_cache.stop_refresher()
+        if self.journal is not None:
+            await asyncio.to_thread(self.journal.close)
+        for history in self.trade_histories.values():
+            history.close()
+        if self.http:
+            await self.http.aclose()
         return await self.api.close()
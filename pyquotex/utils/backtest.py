@@ -0,0 +1,273 @@
+"""Vectorized backtests of fixed-expiry binary options over stored candles.
+
+Candles are held as numpy arrays, signals are arrays of ``1`` (call),
+``-1`` (put) and ``0`` (no trade) aligned with the candles. A signal on bar
+``i`` enters at its close and is settled against the close of the bar
+opening `expiry` seconds later, the way a 1 minute order placed at the end
+of a bar expires at the end of the next one.
+
+    series = load_archive("EURUSD_otc")
+    rsi = align(TechnicalIndicators.calculate_rsi(series.close.tolist()), len(series.time))
+    report = Backtest(series, payout=load_payouts()["EURUSD_otc"]).run(threshold(rsi, 30, 70), expiry=60)
+"""
+import json
+from pathlib import Path
+from collections import namedtuple
+
+import numpy as np
+
+CALL = 1
+PUT = -1
+WIN = 1
+LOSS = -1
+TIE = 0
+
+Candles = namedtuple("Candles", ("time", "open", "high", "low", "close"))
+
+
+def to_candles(candles):
+    """Arrays from a list of ``{"time", "open", "high", "low", "close"}`` dicts.
+
+    Bars are sorted by time and duplicated times keep their last version.
+    """
+    if not candles:
+        empty = np.empty(0)
+        return Candles(np.empty(0, dtype=np.int64), empty, empty, empty, empty)
+    times = np.fromiter((c["time"] for c in candles), dtype=np.int64, count=len(candles))
+    values = np.array([(c["open"], c["high"], c["low"], c["close"]) for c in candles], dtype=np.float64)
+    # Stable sort, then the last of every run of equal times wins.
+    order = np.argsort(times, kind="stable")
+    times, values = times[order], values[order]
+    keep = np.append(times[1:] != times[:-1], True)
+    times, values = times[keep], values[keep]
+    return Candles(times, values[:, 0], values[:, 1], values[:, 2], values[:, 3])
+
+
+def load_archive(asset, data_dir="data"):
+    """Merge every stored file of `asset`: monthly archive, daily files and the recent window.
+
+    Later sources win for a bar stored twice, so recent data overrides the archive.
+    """
+    data_dir = Path(data_dir)
+    paths = [data_dir / "monthly" / f"{asset}_full_history.json"]
+    paths += sorted((data_dir / "24h").glob(f"{asset}_*.json"))
+    paths.append(data_dir / "recent" / f"{asset}.json")
+    candles = []
+    for path in paths:
+        if path.exists():
+            with open(path) as f:
+                candles.extend(c for c in json.load(f) if isinstance(c, dict) and "time" in c)
+    return to_candles(candles)
+
+
+def load_payouts(path="all_instruments.json"):
+    """Payout fractions per asset and expiry in seconds, from an instruments dump.
+
+    The 1 and 5 minute profits are read like :meth:`Quotex.get_payout_by_asset
+    <pyquotex.stable_api.Quotex.get_payout_by_asset>`, other expiries use the
+    general payment.
+
+    :returns: ``{symbol: {60: 0.85, 300: 0.8, None: 0.85}}``.
+    """
+    with open(path) as f:
+        instruments = json.load(f)
+    payouts = {}
+    for i in instruments:
+        payouts[i[1]] = {60: i[-9] / 100, 300: i[-8] / 100, None: i[5] / 100}
+    return payouts
+
+
+def payout_for(payout, expiry):
+    """A fraction from a number or a ``{expiry: fraction}`` mapping."""
+    if isinstance(payout, dict):
+        return payout.get(expiry, payout.get(None))
+    return payout
+
+
+def align(values, length):
+    """Right-align an indicator output with `length` candles, padding the warm-up with NaN.
+
+    `TechnicalIndicators` methods return series shorter than their input,
+    their last value belongs to the last candle.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    out = np.full(length, np.nan)
+    if len(values):
+        out[length - len(values):] = values[-length:]
+    return out
+
+
+def sma(values, period):
+    """Simple moving average aligned with `values`, NaN during the warm-up."""
+    values = np.asarray(values, dtype=np.float64)
+    out = np.full(len(values), np.nan)
+    if len(values) >= period:
+        sums = np.cumsum(np.concatenate(([0.0], values)))
+        out[period - 1:] = (sums[period:] - sums[:-period]) / period
+    return out
+
+
+def threshold(values, lower, upper):
+    """Call below `lower`, put above `upper`, e.g. RSI mean reversion."""
+    values = np.asarray(values)
+    return np.where(values < lower, CALL, np.where(values > upper, PUT, 0)).astype(np.int8)
+
+
+def crossover(fast, slow):
+    """Call where `fast` crosses above `slow`, put where it crosses below."""
+    fast, slow = np.asarray(fast), np.asarray(slow)
+    above = fast > slow
+    below = fast < slow
+    signal = np.zeros(len(fast), dtype=np.int8)
+    signal[1:][above[1:] & below[:-1]] = CALL
+    signal[1:][below[1:] & above[:-1]] = PUT
+    return signal
+
+
+def outcomes(candles, signal, expiry=60):
+    """Settle every signal against the close `expiry` seconds after its bar.
+
+    :returns: ``(entries, exits, results)``: bar indexes of the trades, of
+        their expiry bars and ``WIN``/``LOSS``/``TIE``. Signals whose expiry
+        bar is missing (gap or end of data) are dropped.
+    """
+    signal = np.asarray(signal)
+    entries = np.flatnonzero(signal)
+    if not len(entries):
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty, np.empty(0, dtype=np.int8)
+    targets = candles.time[entries] + expiry
+    exits = np.searchsorted(candles.time, targets)
+    valid = exits < len(candles.time)
+    valid[valid] = candles.time[exits[valid]] == targets[valid]
+    entries, exits = entries[valid], exits[valid]
+    move = np.sign(candles.close[exits] - candles.close[entries]) * signal[entries]
+    return entries, exits, move.astype(np.int8)
+
+
+def sequential(entries, exits):
+    """Keep only trades entered after the previous kept one expired, as a single account would."""
+    if not len(entries):
+        return np.zeros(0, dtype=bool)
+    keep = np.zeros(len(entries), dtype=bool)
+    nxt = np.searchsorted(entries, exits)  # First trade a position allows next.
+    i = 0
+    while i < len(entries):
+        keep[i] = True
+        i = nxt[i]
+    return keep
+
+
+def martingale_stakes(results, stake=1.0, steps=0, multiplier=2.0):
+    """Stake of every trade when each loss multiplies the next stake.
+
+    The sequence restarts after a win, a tie, or `steps` consecutive
+    multiplications, like ``martingale_apply`` in ``examples/trade_bot.py``.
+    """
+    stakes = np.full(len(results), float(stake))
+    if not steps or not len(results):
+        return stakes
+    index = np.arange(len(results))
+    # Losses in a row right before each trade.
+    reset = np.where(results != LOSS, index, -1)
+    last_reset = np.maximum.accumulate(np.concatenate(([-1], reset[:-1])))
+    streak = index - last_reset - 1
+    return stakes * multiplier ** (streak % (steps + 1))
+
+
+def max_drawdown(equity):
+    if not len(equity):
+        return 0.0
+    curve = np.concatenate(([0.0], equity))
+    return float(np.max(np.maximum.accumulate(curve) - curve))
+
+
+def longest_run(mask):
+    """Longest run of True in `mask`."""
+    if not mask.any():
+        return 0
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], mask.astype(np.int8), [0]))))
+    return int(np.max(edges[1::2] - edges[::2]))
+
+
+class Backtest(object):
+    """Evaluate signals on one asset's candles."""
+
+    def __init__(self, candles, payout=0.8, asset=None):
+        """
+        :param candles: :class:`Candles` or a list of candle dicts.
+        :param payout: Profit fraction of a winning stake, or ``{expiry: fraction}``
+            as returned per asset by :func:`load_payouts`.
+        :param str asset: (optional) Name carried into the report.
+        """
+        self.candles = candles if isinstance(candles, Candles) else to_candles(candles)
+        self.payout = payout
+        self.asset = asset
+
+    def signal(self, strategy):
+        """Turn `strategy` into a signal array.
+
+        :param strategy: An array aligned with the candles, or a callable
+            receiving the :class:`Candles` and returning one.
+        """
+        signal = strategy(self.candles) if callable(strategy) else strategy
+        signal = np.nan_to_num(np.asarray(signal, dtype=np.float64))
+        if len(signal) != len(self.candles.time):
+            raise ValueError(f"Signal has {len(signal)} values for {len(self.candles.time)} candles.")
+        return np.sign(signal).astype(np.int8)
+
+    def run(self, strategy, expiry=60, stake=1.0, martingale=0, multiplier=2.0, overlapping=False):
+        """Backtest `strategy` with a fixed expiry.
+
+        :param strategy: See :meth:`signal`.
+        :param int expiry: Seconds, e.g. 60, 300 or 900.
+        :param float stake: Amount of a first trade.
+        :param int martingale: Multiplications allowed after consecutive losses, 0 for flat stakes.
+        :param float multiplier: Stake factor applied after each loss.
+        :param bool overlapping: Take every signal, even while a trade is open.
+            Martingale needs sequential trades and ignores it.
+        :returns: The report, including the `equity` curve per trade.
+        """
+        payout = payout_for(self.payout, expiry)
+        entries, exits, results = outcomes(self.candles, self.signal(strategy), expiry)
+        if martingale or not overlapping:
+            keep = sequential(entries, exits)
+            entries, exits, results = entries[keep], exits[keep], results[keep]
+        stakes = martingale_stakes(results, stake, martingale, multiplier)
+        pnl = np.where(results == WIN, stakes * payout, np.where(results == LOSS, -stakes, 0.0))
+        equity = np.cumsum(pnl)
+        wins = int(np.count_nonzero(results == WIN))
+        losses = int(np.count_nonzero(results == LOSS))
+        decided = wins + losses
+        return {
+            "asset": self.asset,
+            "expiry": expiry,
+            "payout": payout,
+            "candles": len(self.candles.time),
+            "trades": len(results),
+            "wins": wins,
+            "losses": losses,
+            "ties": len(results) - decided,
+            "win_rate": wins / decided if decided else None,
+            "breakeven_win_rate": 1 / (1 + payout),
+            "ev_per_trade": float(pnl.mean()) if len(pnl) else 0.0,
+            "ev_per_unit": float(pnl.sum() / stakes.sum()) if len(pnl) else 0.0,
+            "total_pnl": float(equity[-1]) if len(equity) else 0.0,
+            "max_drawdown": max_drawdown(equity),
+            "max_stake": float(stakes.max()) if len(stakes) else 0.0,
+            "longest_losing_streak": longest_run(results == LOSS),
+            "entry_times": self.candles.time[entries],
+            "results": results,
+            "equity": equity,
+        }
+
+    def compare(self, strategies, expiries=(60, 300, 900), **kwargs):
+        """Run every named strategy at every expiry.
+
+        :returns: ``{(name, expiry): report}``.
+        """
+        return {
+            (name, expiry): self.run(strategy, expiry, **kwargs)
+            for name, strategy in strategies.items()
+            for expiry in expiries
+        }
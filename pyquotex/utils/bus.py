@@ -0,0 +1,633 @@
+"""Publish/subscribe between the ingest process and its readers.
+
+One process talks to the broker (see ``shard_supervisor.py``) and publishes
+typed events; API servers and recorders subscribe and keep their own view
+in memory, e.g. :class:`MarketView`, instead of polling JSON files in
+``data/`` or logging into the broker themselves. The backends share one
+interface and are picked by URL:
+
+* ``local://`` - :class:`LocalBus`, queues inside one process.
+* ``unix:///tmp/pyquotex.sock`` - :class:`UnixBus`, JSON lines over a Unix
+  domain socket served by the publishing process.
+* ``redis://[:password@]host:6379`` - :class:`RedisBus`, Redis
+  ``PUBLISH``/``SUBSCRIBE`` spoken over RESP directly, no client library.
+
+    bus = await open_bus("unix:///tmp/pyquotex.sock", serve=True)
+    bus.publish(TICK, tick("EURUSD_otc", 1700000000.5, 1.0832))
+
+    bus = await open_bus("unix:///tmp/pyquotex.sock")
+    async for topic, event in bus.subscribe(TICK, CANDLE_CLOSE):
+        ...
+"""
+import os
+import json
+import time
+import socket
+import asyncio
+import logging
+from collections import deque
+from urllib.parse import urlparse
+
+from .metrics import REGISTRY
+from .candle_store import CandleStore
+
+logger = logging.getLogger(__name__)
+
+TICK = "tick"
+CANDLE_CLOSE = "candle.close"
+MARKET_STATUS = "market.status"
+TOPICS = (TICK, CANDLE_CLOSE, MARKET_STATUS)
+
+# Longest line a Unix bus peer accepts.
+LINE_LIMIT = 2 ** 20
+
+PUBLISHED = REGISTRY.counter("pyquotex_bus_published_total", "Events published on the bus.", ("topic",))
+DROPPED = REGISTRY.counter(
+    "pyquotex_bus_dropped_total", "Events dropped because a subscriber or peer fell behind.", ("topic",)
+)
+SUBSCRIBERS = REGISTRY.gauge("pyquotex_bus_subscribers", "Subscriptions open in this process.")
+
+
+def tick(asset, timestamp, price, shard=None):
+    """A tick event."""
+    event = {"asset": asset, "time": timestamp, "price": price}
+    if shard is not None:
+        event["shard"] = shard
+    return event
+
+
+def candle_close(asset, period, candle):
+    """A closed bar, `candle` being a ``{"time", "open", "high", "low", "close"}`` dict."""
+    return dict(candle, asset=asset, period=period)
+
+
+def market_status(asset, name, is_open, changed_at=None):
+    """An asset's open/closed state."""
+    return {"asset": asset, "name": name, "open": bool(is_open), "changed_at": changed_at or time.time()}
+
+
+def encode(topic, data, op=None):
+    message = {"topic": topic, "data": data}
+    if op:
+        message["op"] = op
+    return json.dumps(message, separators=(",", ":")).encode() + b"\n"
+
+
+class Subscription(object):
+    """Events of some topics, as an async iterator of ``(topic, event)``."""
+
+    def __init__(self, bus, topics, maxsize):
+        self.bus = bus
+        self.topics = frozenset(topics)
+        self.queue = asyncio.Queue(maxsize)
+        self.dropped = 0
+
+    def wants(self, topic):
+        return not self.topics or topic in self.topics
+
+    def put(self, topic, data):
+        try:
+            self.queue.put_nowait((topic, data))
+        except asyncio.QueueFull:
+            self.dropped += 1
+            DROPPED.labels(topic).inc()
+
+    async def get(self):
+        return await self.queue.get()
+
+    def get_nowait(self):
+        """The next event, raises :class:`asyncio.QueueEmpty` if none is waiting."""
+        return self.queue.get_nowait()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        return await self.queue.get()
+
+    def close(self):
+        self.bus.unsubscribe(self)
+
+
+class Bus(object):
+    """Local fan-out shared by the backends; :meth:`publish` never blocks."""
+
+    def __init__(self):
+        self._subscriptions = []
+
+    def subscribe(self, *topics, maxsize=10000):
+        """Get the events of `topics` from now on, of every topic when none is given.
+
+        :param int maxsize: Events buffered before new ones are dropped.
+        """
+        subscription = Subscription(self, topics, maxsize)
+        self._subscriptions.append(subscription)
+        SUBSCRIBERS.inc()
+        self._interest_changed()
+        return subscription
+
+    def unsubscribe(self, subscription):
+        if subscription in self._subscriptions:
+            self._subscriptions.remove(subscription)
+            SUBSCRIBERS.dec()
+            self._interest_changed()
+
+    def interest(self):
+        """Topics wanted by the local subscriptions, an empty set meaning all of them."""
+        if any(not s.topics for s in self._subscriptions):
+            return frozenset()
+        return frozenset(topic for s in self._subscriptions for topic in s.topics)
+
+    def _interest_changed(self):
+        pass
+
+    def _deliver(self, topic, data):
+        for subscription in self._subscriptions:
+            if subscription.wants(topic):
+                subscription.put(topic, data)
+
+    def publish(self, topic, data):
+        """Send `data` to every subscriber of `topic`."""
+        raise NotImplementedError
+
+    async def start(self):
+        return self
+
+    async def close(self):
+        pass
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+
+class LocalBus(Bus):
+    """Publishers and subscribers in the same process and event loop."""
+
+    def publish(self, topic, data):
+        PUBLISHED.labels(topic).inc()
+        self._deliver(topic, data)
+
+
+class _Peer(object):
+    """A connection to the :class:`UnixBus` server, written by its own task."""
+
+    def __init__(self, writer, queue_size):
+        self.writer = writer
+        # None until the peer subscribes, so publish-only peers get nothing.
+        self.topics = None
+        self.queue = asyncio.Queue(queue_size)
+        self.task = asyncio.create_task(self._drain())
+        self.handler = None
+
+    def wants(self, topic):
+        return self.topics is not None and (not self.topics or topic in self.topics)
+
+    def send(self, topic, line):
+        try:
+            self.queue.put_nowait(line)
+        except asyncio.QueueFull:
+            DROPPED.labels(topic).inc()
+
+    async def _drain(self):
+        try:
+            while True:
+                lines = [await self.queue.get()]
+                while not self.queue.empty():
+                    lines.append(self.queue.get_nowait())
+                self.writer.write(b"".join(lines))
+                await self.writer.drain()
+        except (OSError, asyncio.CancelledError):
+            pass
+
+    def close(self):
+        self.task.cancel()
+        self.writer.close()
+
+
+class UnixBus(Bus):
+    """JSON lines over a Unix domain socket.
+
+    The publishing process serves the socket and fans every event out to
+    the connected readers; a reader connects, says which topics it wants,
+    and reconnects on its own when the server restarts. Readers may publish
+    too, the server forwards their events to everybody else.
+    """
+
+    def __init__(self, path, serve=False, queue_size=10000, reconnect_delay=1.0):
+        """
+        :param str path: The socket file.
+        :param bool serve: Serve the socket instead of connecting to it.
+        :param int queue_size: Lines buffered per peer, or while disconnected.
+        :param float reconnect_delay: First delay before connecting again.
+        """
+        super().__init__()
+        self.path = path
+        self.serve = serve
+        self.queue_size = queue_size
+        self.reconnect_delay = reconnect_delay
+        self.connected = asyncio.Event()
+        self._peers = set()
+        self._server = None
+        self._task = None
+        self._writer = None
+        self._pending = deque(maxlen=queue_size)
+        self._closed = False
+
+    async def start(self):
+        if self.serve:
+            self._remove_stale_socket()
+            self._server = await asyncio.start_unix_server(self._handle, self.path, limit=LINE_LIMIT)
+            self.connected.set()
+        else:
+            self._task = asyncio.create_task(self._run())
+        return self
+
+    def _remove_stale_socket(self):
+        if not os.path.exists(self.path):
+            return
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(self.path)
+        except OSError:
+            os.unlink(self.path)
+        else:
+            raise OSError(f"{self.path} is already served by another process")
+        finally:
+            probe.close()
+
+    async def _handle(self, reader, writer):
+        peer = _Peer(writer, self.queue_size)
+        peer.handler = asyncio.current_task()
+        self._peers.add(peer)
+        try:
+            async for line in reader:
+                message = json.loads(line)
+                if message.get("op") == "sub":
+                    topics = message.get("topics")
+                    peer.topics = None if topics is None else frozenset(topics)
+                elif "topic" in message:
+                    self._fanout(message["topic"], message["data"], line, peer)
+        except (OSError, ValueError) as e:
+            logger.debug(f"Bus peer dropped: {e}")
+        finally:
+            self._peers.discard(peer)
+            peer.close()
+
+    def _fanout(self, topic, data, line, source=None):
+        self._deliver(topic, data)
+        for peer in self._peers:
+            if peer is not source and peer.wants(topic):
+                peer.send(topic, line)
+
+    def publish(self, topic, data):
+        PUBLISHED.labels(topic).inc()
+        if self.serve:
+            self._fanout(topic, data, encode(topic, data))
+        else:
+            self._write(encode(topic, data, op="pub"), topic)
+
+    def _write(self, line, topic=None):
+        writer = self._writer
+        if writer is None or writer.transport.get_write_buffer_size() > LINE_LIMIT:
+            if writer is None and len(self._pending) < self.queue_size:
+                self._pending.append(line)
+            elif topic:
+                DROPPED.labels(topic).inc()
+            return
+        writer.write(line)
+
+    def _interest_changed(self):
+        if not self.serve and self._writer is not None:
+            self._writer.write(self._subscribe_line())
+
+    def _subscribe_line(self):
+        # No topics at all once the last subscription is closed, not every topic.
+        topics = sorted(self.interest()) if self._subscriptions else None
+        return json.dumps({"op": "sub", "topics": topics}).encode() + b"\n"
+
+    async def _run(self):
+        delay = self.reconnect_delay
+        while not self._closed:
+            try:
+                reader, writer = await asyncio.open_unix_connection(self.path, limit=LINE_LIMIT)
+            except OSError as e:
+                logger.debug(f"Bus {self.path} unreachable: {e}")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 30.0)
+                continue
+            delay = self.reconnect_delay
+            if self._subscriptions:
+                writer.write(self._subscribe_line())
+            while self._pending:
+                writer.write(self._pending.popleft())
+            self._writer = writer
+            self.connected.set()
+            logger.info(f"Bus connected to {self.path}.")
+            try:
+                async for line in reader:
+                    message = json.loads(line)
+                    self._deliver(message["topic"], message["data"])
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning(f"Bus connection lost: {e}")
+            finally:
+                self._writer = None
+                self.connected.clear()
+                writer.close()
+            if not self._closed:
+                await asyncio.sleep(delay)
+
+    async def close(self):
+        self._closed = True
+        if self._task is not None:
+            self._task.cancel()
+        if self._writer is not None:
+            self._writer.close()
+        peers = list(self._peers)
+        for peer in peers:
+            peer.close()
+        if peers:
+            # Let the handlers see the closed connections and return.
+            await asyncio.wait([peer.handler for peer in peers], timeout=1)
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            if os.path.exists(self.path):
+                os.unlink(self.path)
+
+
+def resp_command(*args):
+    """Encode a Redis command."""
+    parts = [b"*%d\r\n" % len(args)]
+    for arg in args:
+        if isinstance(arg, str):
+            arg = arg.encode()
+        parts.append(b"$%d\r\n%s\r\n" % (len(arg), arg))
+    return b"".join(parts)
+
+
+async def read_resp(reader):
+    """Read one RESP2 reply; errors come back as :class:`RedisError` instances."""
+    line = await reader.readline()
+    if not line:
+        raise ConnectionError("connection closed")
+    kind, body = line[:1], line[1:-2]
+    if kind == b"+":
+        return body.decode()
+    if kind == b"-":
+        return RedisError(body.decode())
+    if kind == b":":
+        return int(body)
+    if kind == b"$":
+        size = int(body)
+        if size < 0:
+            return None
+        data = await reader.readexactly(size + 2)
+        return data[:-2]
+    if kind == b"*":
+        size = int(body)
+        if size < 0:
+            return None
+        return [await read_resp(reader) for _ in range(size)]
+    raise ConnectionError(f"unexpected reply {line[:32]!r}")
+
+
+class RedisError(Exception):
+    pass
+
+
+class RedisBus(Bus):
+    """Redis pub/sub, so readers on other hosts can follow the ingest.
+
+    One connection pipelines ``PUBLISH`` commands, another one holds the
+    ``SUBSCRIBE``; both reconnect on their own. Events go out as JSON on
+    channels named `prefix` + topic. Redis does not buffer for slow
+    subscribers either, events published while disconnected are kept up to
+    `queue_size` and sent once back.
+    """
+
+    def __init__(self, host="127.0.0.1", port=6379, password=None, prefix="pyquotex:",
+                 queue_size=10000, reconnect_delay=1.0):
+        """
+        :param str host: The Redis host.
+        :param int port: The Redis port.
+        :param str password: (optional) Sent with ``AUTH``.
+        :param str prefix: Channel name prefix, to share a Redis with other applications.
+        :param int queue_size: Events buffered while the publisher is disconnected.
+        :param float reconnect_delay: First delay before connecting again.
+        """
+        super().__init__()
+        self.host = host
+        self.port = port
+        self.password = password
+        self.prefix = prefix
+        self.reconnect_delay = reconnect_delay
+        self.connected = asyncio.Event()
+        self._outbox = asyncio.Queue(queue_size)
+        self._subscriber = None
+        self._subscribed = set()
+        self._catch_all = False
+        self._tasks = []
+
+    async def start(self):
+        self._tasks = [asyncio.create_task(self._run_publisher()), asyncio.create_task(self._run_subscriber())]
+        return self
+
+    async def _connect(self):
+        reader, writer = await asyncio.open_connection(self.host, self.port, limit=LINE_LIMIT)
+        if self.password:
+            writer.write(resp_command("AUTH", self.password))
+            reply = await read_resp(reader)
+            if isinstance(reply, RedisError):
+                writer.close()
+                raise reply
+        return reader, writer
+
+    async def _reconnecting(self, run, name):
+        delay = self.reconnect_delay
+        while True:
+            try:
+                reader, writer = await self._connect()
+            except (OSError, RedisError) as e:
+                logger.debug(f"Redis {name} connection to {self.host}:{self.port} failed: {e}")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 30.0)
+                continue
+            delay = self.reconnect_delay
+            try:
+                await run(reader, writer)
+            except (OSError, ConnectionError, asyncio.IncompleteReadError) as e:
+                logger.warning(f"Redis {name} connection lost: {e}")
+            finally:
+                writer.close()
+            await asyncio.sleep(delay)
+
+    def publish(self, topic, data):
+        PUBLISHED.labels(topic).inc()
+        payload = json.dumps(data, separators=(",", ":"))
+        try:
+            self._outbox.put_nowait((topic, resp_command("PUBLISH", self.prefix + topic, payload)))
+        except asyncio.QueueFull:
+            DROPPED.labels(topic).inc()
+
+    async def _run_publisher(self):
+        await self._reconnecting(self._publish_loop, "publisher")
+
+    async def _publish_loop(self, reader, writer):
+        replies = asyncio.create_task(self._discard_replies(reader))
+        try:
+            while not replies.done():
+                commands = [(await self._outbox.get())[1]]
+                while not self._outbox.empty():
+                    commands.append(self._outbox.get_nowait()[1])
+                writer.write(b"".join(commands))
+                await writer.drain()
+        finally:
+            replies.cancel()
+
+    async def _discard_replies(self, reader):
+        while True:
+            reply = await read_resp(reader)
+            if isinstance(reply, RedisError):
+                logger.warning(f"Redis refused a publish: {reply}")
+
+    def _interest_changed(self):
+        if self._subscriber is not None:
+            self._subscriber.write(self._subscribe_commands())
+
+    def _subscribe_commands(self):
+        interest = self.interest()
+        if not self._subscriptions:
+            wanted = set()
+        elif not interest:
+            wanted = {("PSUBSCRIBE", self.prefix + "*")}
+        else:
+            wanted = {("SUBSCRIBE", self.prefix + topic) for topic in interest}
+        # Subscribe before unsubscribing, so no event falls in between; the
+        # overlap is deduplicated in _subscribe_loop.
+        commands = sorted(wanted - self._subscribed)
+        commands += [("UN" + cmd if cmd == "SUBSCRIBE" else "PUNSUBSCRIBE", channel)
+                     for cmd, channel in sorted(self._subscribed - wanted)]
+        self._subscribed = wanted
+        return b"".join(resp_command(*c) for c in commands)
+
+    async def _run_subscriber(self):
+        await self._reconnecting(self._subscribe_loop, "subscriber")
+
+    async def _subscribe_loop(self, reader, writer):
+        self._subscribed = set()
+        self._catch_all = False
+        if self._subscriptions:
+            writer.write(self._subscribe_commands())
+        self._subscriber = writer
+        self.connected.set()
+        logger.info(f"Bus connected to redis://{self.host}:{self.port}.")
+        try:
+            while True:
+                reply = await read_resp(reader)
+                if not isinstance(reply, list) or not reply:
+                    continue
+                kind = reply[0]
+                if kind in (b"psubscribe", b"punsubscribe"):
+                    # Redis confirms in order: from here on, until the
+                    # punsubscribe, every event also comes as a pmessage.
+                    self._catch_all = kind == b"psubscribe"
+                    continue
+                if kind == b"message":
+                    if self._catch_all:
+                        continue
+                    channel, payload = reply[1], reply[2]
+                elif kind == b"pmessage":
+                    channel, payload = reply[2], reply[3]
+                else:
+                    continue
+                topic = channel.decode()[len(self.prefix):]
+                try:
+                    self._deliver(topic, json.loads(payload))
+                except ValueError as e:
+                    logger.debug(f"Ignoring a malformed event on {channel!r}: {e}")
+        finally:
+            self._subscriber = None
+            self.connected.clear()
+
+    async def close(self):
+        for task in self._tasks:
+            task.cancel()
+        if self._subscriber is not None:
+            self._subscriber.close()
+
+
+async def open_bus(url, serve=False):
+    """Start the bus backend for `url`.
+
+    :param str url: ``local://``, ``unix:///path/to.sock`` or ``redis://[:password@]host[:port]``.
+    :param bool serve: For ``unix://``, serve the socket; the publishing process does.
+    :returns: The started bus.
+    """
+    parsed = urlparse(url)
+    if parsed.scheme in ("local", "memory"):
+        bus = LocalBus()
+    elif parsed.scheme == "unix":
+        bus = UnixBus(parsed.path, serve=serve)
+    elif parsed.scheme == "redis":
+        bus = RedisBus(parsed.hostname or "127.0.0.1", parsed.port or 6379, password=parsed.password)
+    else:
+        raise ValueError(f"Unsupported bus URL {url!r}")
+    return await bus.start()
+
+
+class MarketView(object):
+    """Latest bars, prices and market status, kept up to date from the bus."""
+
+    def __init__(self, period=60, maxlen=1440):
+        """
+        :param int period: Bar size of :attr:`store`, in seconds.
+        :param int maxlen: Bars kept per asset.
+        """
+        self.store = CandleStore(period, maxlen=maxlen)
+        self.prices = {}
+        self.status = {}
+        self.updated_at = None
+
+    def apply(self, topic, event):
+        asset = event.get("asset")
+        if topic == TICK:
+            self.store.add_tick(asset, event["price"], event["time"])
+            self.prices[asset] = (event["time"], event["price"])
+        elif topic == CANDLE_CLOSE and event.get("period") == self.store.period:
+            # The published bar wins over one built from the ticks seen since joining.
+            if not self.store.merge(asset, [event]):
+                self.store.candles[asset][self.store.bar_time(event["time"])].update(
+                    (k, event[k]) for k in ("open", "high", "low", "close")
+                )
+        elif topic == MARKET_STATUS:
+            self.status[asset] = {k: v for k, v in event.items() if k != "asset"}
+        self.updated_at = time.time()
+
+    def candle(self, asset):
+        """The newest bar of `asset`, None if nothing arrived yet."""
+        times = self.store.times.get(asset)
+        if not times:
+            return None
+        return self.store.candles[asset][times[-1]]
+
+    def is_open(self, asset):
+        status = self.status.get(asset)
+        return bool(status and status.get("open"))
+
+    async def follow(self, bus):
+        """Apply every event of `bus`, until cancelled."""
+        subscription = bus.subscribe(*TOPICS)
+        try:
+            async for topic, event in subscription:
+                try:
+                    self.apply(topic, event)
+                except (KeyError, TypeError) as e:
+                    logger.debug(f"Ignoring a malformed {topic} event: {e}")
+        finally:
+            subscription.close()
+
+    def start(self, bus):
+        return asyncio.create_task(self.follow(bus))
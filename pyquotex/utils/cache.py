@@ -0,0 +1,88 @@
+import time
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class CachedValue(object):
+    """Single async value cached with a TTL.
+
+    Concurrent callers share one in-flight load, `invalidate` may be called
+    from any thread (e.g. the websocket thread) and an optional background
+    refresher keeps the value warm.
+    """
+
+    def __init__(self, loader, ttl=300, refresh_interval=None, debounce=0.5):
+        """
+        :param loader: Coroutine function returning the fresh value.
+        :param float ttl: Seconds a loaded value stays fresh.
+        :param float refresh_interval: Seconds between background refreshes,
+            defaults to 80% of the TTL.
+        :param float debounce: Seconds the refresher waits after an
+            invalidation so bursts of events cost a single reload.
+        """
+        self.loader = loader
+        self.ttl = ttl
+        self.refresh_interval = refresh_interval or ttl * 0.8
+        self.debounce = debounce
+        self.value = None
+        self.loaded_at = None
+        self.expires_at = 0.0
+        self._inflight = None
+        self._refresher = None
+        self._wakeup = None
+        self._loop = None
+
+    @property
+    def is_fresh(self):
+        return self.loaded_at is not None and time.monotonic() < self.expires_at
+
+    async def get(self, force=False):
+        """Return the cached value, loading it when stale or forced."""
+        if not force and self.is_fresh:
+            return self.value
+        if self._inflight is None or self._inflight.done():
+            self._inflight = asyncio.ensure_future(self._load())
+        return await asyncio.shield(self._inflight)
+
+    async def _load(self):
+        value = await self.loader()
+        self.value = value
+        self.loaded_at = time.time()
+        self.expires_at = time.monotonic() + self.ttl
+        return value
+
+    def invalidate(self):
+        """Mark the value stale. Safe to call from any thread."""
+        self.expires_at = 0.0
+        if self._wakeup is not None and self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    def start_refresher(self):
+        """Start the background task keeping the value warm."""
+        if self._refresher is not None and not self._refresher.done():
+            return self._refresher
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._refresher = asyncio.create_task(self._refresh_loop())
+        return self._refresher
+
+    def stop_refresher(self):
+        if self._refresher is not None:
+            self._refresher.cancel()
+            self._refresher = None
+        self._wakeup = None
+
+    async def _refresh_loop(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.refresh_interval)
+                await asyncio.sleep(self.debounce)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.get(force=True)
+            except Exception as e:
+                logger.debug(f"Background refresh failed: {e}")
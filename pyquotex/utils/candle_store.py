@@ -0,0 +1,291 @@
+import time
+import heapq
+import asyncio
+import logging
+from bisect import bisect_left, bisect_right, insort
+
+logger = logging.getLogger(__name__)
+
+
+class CandleStore(object):
+    """Per-asset OHLC bars keyed by bar open time, kept sorted.
+
+    Live ticks update the current bar, history is merged in only for bar
+    times not already stored, so a backfill never rewrites live data.
+    """
+
+    def __init__(self, period=60, maxlen=None):
+        """
+        :param int period: Bar size in seconds.
+        :param int maxlen: (optional) Bars kept per asset, the oldest are dropped.
+        """
+        self.period = period
+        self.maxlen = maxlen
+        self.candles = {}
+        self.times = {}
+        self.holes = {}
+        self.last_update = {}
+
+    def __contains__(self, asset):
+        return asset in self.candles
+
+    def assets(self):
+        return list(self.candles)
+
+    def bar_time(self, timestamp):
+        return int(timestamp // self.period * self.period)
+
+    def last_closed(self, now=None):
+        """Open time of the last bar that has fully closed."""
+        return self.bar_time(now if now is not None else time.time()) - self.period
+
+    def _insert(self, asset, candle):
+        candles = self.candles.setdefault(asset, {})
+        times = self.times.setdefault(asset, [])
+        candles[candle["time"]] = candle
+        insort(times, candle["time"])
+        if self.maxlen and len(times) > self.maxlen:
+            for dropped in times[:len(times) - self.maxlen]:
+                del candles[dropped]
+            del times[:len(times) - self.maxlen]
+
+    def add_tick(self, asset, price, timestamp):
+        """Fold a tick into its bar.
+
+        :returns: The updated bar.
+        """
+        bar = self.bar_time(timestamp)
+        self.last_update[asset] = time.monotonic()
+        candle = self.candles.get(asset, {}).get(bar)
+        if candle is None:
+            candle = {"time": bar, "open": price, "high": price, "low": price, "close": price}
+            self._insert(asset, candle)
+        else:
+            candle["close"] = price
+            candle["high"] = max(candle["high"], price)
+            candle["low"] = min(candle["low"], price)
+        return candle
+
+    def merge(self, asset, candles):
+        """Insert the bars whose time is not stored yet, leaving the others untouched.
+
+        :returns: The list of inserted bars, oldest first.
+        """
+        known = self.candles.get(asset, {})
+        inserted = []
+        seen = set()
+        for candle in sorted(candles, key=lambda c: c["time"]):
+            bar = self.bar_time(candle["time"])
+            if bar in known or bar in seen:
+                continue
+            seen.add(bar)
+            candle = {
+                "time": bar,
+                "open": candle["open"],
+                "high": candle["high"],
+                "low": candle["low"],
+                "close": candle["close"],
+            }
+            self._insert(asset, candle)
+            known = self.candles[asset]
+            inserted.append(candle)
+        return inserted
+
+    def mark_holes(self, asset, start, end):
+        """Record bars in ``[start, end]`` the server has no data for."""
+        known = self.candles.get(asset, {})
+        holes = self.holes.setdefault(asset, set())
+        for bar in range(self.bar_time(start), end + 1, self.period):
+            if bar not in known:
+                holes.add(bar)
+
+    def series(self, asset, start=None, end=None):
+        times = self.times.get(asset, [])
+        lo = bisect_left(times, start) if start is not None else 0
+        hi = bisect_right(times, end) if end is not None else len(times)
+        return [self.candles[asset][t] for t in times[lo:hi]]
+
+    def gaps(self, asset, start=None, end=None):
+        """Missing bar ranges of `asset` as inclusive ``(first, last)`` open times.
+
+        :param start: First bar expected, defaults to the oldest stored bar.
+        :param end: Last bar expected, defaults to the newest stored bar.
+        """
+        times = self.times.get(asset)
+        if not times:
+            return []
+        start = self.bar_time(start) if start is not None else times[0]
+        end = self.bar_time(end) if end is not None else times[-1]
+        holes = self.holes.get(asset, ())
+        gaps = []
+        expected = start
+        for bar in times[bisect_left(times, start):bisect_right(times, end)] + [end + self.period]:
+            if bar > expected:
+                missing = [t for t in range(expected, bar, self.period) if t not in holes]
+                if missing:
+                    gaps.append((missing[0], missing[-1]))
+            expected = max(expected, bar + self.period)
+        return gaps
+
+    def completeness(self, asset, window=3600, now=None):
+        """Fraction of the closed bars of the last `window` seconds that are stored."""
+        end = self.last_closed(now)
+        start = end - window + self.period
+        times = self.times.get(asset, [])
+        expected = window // self.period
+        if not expected:
+            return 1.0
+        present = bisect_right(times, end) - bisect_left(times, start)
+        return present / expected
+
+    def completeness_report(self, window=3600, now=None):
+        return {asset: round(self.completeness(asset, window, now), 4) for asset in self.candles}
+
+    def stale_assets(self, timeout):
+        """Assets without a tick for more than `timeout` seconds."""
+        now = time.monotonic()
+        return [a for a, seen in self.last_update.items() if now - seen > timeout]
+
+
+class GapBackfiller(object):
+    """Find holes in a :class:`CandleStore` and fill them from the history API.
+
+    Scans run after every reconnect (seen as a replay of the subscription
+    manager) and for assets whose feed went stale. Missing ranges are queued
+    most recent first and fetched one at a time, because `Quotex.get_candles`
+    shares a single response slot.
+    """
+
+    def __init__(
+            self,
+            client,
+            store,
+            lookback=6 * 3600,
+            stale_timeout=120,
+            check_interval=15,
+            max_bars=200,
+            on_merge=None
+    ):
+        """
+        :param client: The instance of :class:`Quotex <pyquotex.stable_api.Quotex>`.
+        :param store: The :class:`CandleStore` to repair.
+        :param int lookback: Seconds back from now a scan looks for gaps.
+        :param float stale_timeout: Seconds without ticks before an asset is rescanned.
+        :param float check_interval: Seconds between reconnect and staleness checks.
+        :param int max_bars: Bars per history request.
+        :param on_merge: (optional) Callable or coroutine function receiving
+            ``(asset, candles)`` for every merged batch, e.g. to persist it.
+        """
+        self.client = client
+        self.store = store
+        self.lookback = lookback
+        self.stale_timeout = stale_timeout
+        self.check_interval = check_interval
+        self.max_bars = max_bars
+        self.on_merge = on_merge
+        self.bars_filled = 0
+        self.requests = 0
+        self._queue = []
+        self._queued = set()
+        self._seq = 0
+        self._replays = None
+        self._stale_scanned = {}
+        self._task = None
+
+    def schedule(self, asset, start, end):
+        """Queue the inclusive bar range ``[start, end]``, newest ranges first."""
+        period = self.store.period
+        while start <= end:
+            chunk_start = max(start, end - (self.max_bars - 1) * period)
+            key = (asset, chunk_start, end)
+            if key not in self._queued:
+                self._queued.add(key)
+                self._seq += 1
+                heapq.heappush(self._queue, (-end, self._seq, asset, chunk_start, end))
+            end = chunk_start - period
+
+    def scan(self, assets=None):
+        """Queue every gap of `assets` (all by default) inside the lookback window.
+
+        :returns: The number of missing bars found.
+        """
+        end = self.store.last_closed()
+        start = end - self.lookback
+        missing = 0
+        for asset in assets if assets is not None else self.store.assets():
+            for first, last in self.store.gaps(asset, start, end):
+                # Before the first stored bar is history, not a gap.
+                if first < self.store.times[asset][0]:
+                    continue
+                self.schedule(asset, first, last)
+                missing += (last - first) // self.store.period + 1
+        return missing
+
+    def pending(self):
+        return len(self._queue)
+
+    def _reconnected(self):
+        subscriptions = getattr(self.client, "subscriptions", None)
+        if subscriptions is None:
+            return False
+        replays, self._replays = self._replays, subscriptions.replays
+        return replays is not None and subscriptions.replays != replays
+
+    async def fill(self, asset, start, end):
+        """Fetch `[start, end]` and merge the bars that are missing."""
+        period = self.store.period
+        self.requests += 1
+        candles = await self.client.get_candles(asset, end + period, end - start + period, period)
+        candles = [c for c in candles or [] if start <= c["time"] <= end]
+        inserted = self.store.merge(asset, candles)
+        if candles:
+            # An empty answer may be a timeout, only a partial one proves the holes.
+            self.store.mark_holes(asset, start, end)
+        self.bars_filled += len(inserted)
+        if inserted and self.on_merge is not None:
+            result = self.on_merge(asset, inserted)
+            if asyncio.iscoroutine(result):
+                await result
+        return inserted
+
+    async def drain(self):
+        while self._queue:
+            _, _, asset, start, end = heapq.heappop(self._queue)
+            self._queued.discard((asset, start, end))
+            try:
+                await self.fill(asset, start, end)
+            except Exception as e:
+                logger.warning(f"Backfill of {asset} {start}-{end} failed: {e}")
+
+    async def run(self):
+        while True:
+            if self._reconnected():
+                self.scan()
+            stale = [
+                asset for asset in self.store.stale_assets(self.stale_timeout)
+                if self._stale_scanned.get(asset) != self.store.last_update[asset]
+            ]
+            if stale:
+                # Once per stale episode, a closed market must not be polled every check.
+                for asset in stale:
+                    self._stale_scanned[asset] = self.store.last_update[asset]
+                self.scan(stale)
+            await self.drain()
+            await asyncio.sleep(self.check_interval)
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run())
+        return self._task
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def stats(self):
+        return {
+            "pending": self.pending(),
+            "requests": self.requests,
+            "bars_filled": self.bars_filled,
+        }
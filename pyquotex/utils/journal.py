@@ -0,0 +1,236 @@
+"""Append-only journal of the raw websocket frames sent by the broker."""
+import io
+import os
+import gzip
+import json
+import time
+import queue
+import struct
+import logging
+import threading
+from bisect import bisect_left
+from pathlib import Path
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+# received_at, kind (0 text, 1 binary), payload length
+RECORD = struct.Struct("<dBI")
+EXTENSIONS = {"gzip": ".jnl.gz", "zstd": ".jnl.zst"}
+
+
+def _encode(received_at, frame):
+    if isinstance(frame, str):
+        payload, kind = frame.encode(), 0
+    else:
+        payload, kind = bytes(frame), 1
+    return RECORD.pack(received_at, kind, len(payload)) + payload
+
+
+def _decode(data):
+    offset = 0
+    while offset + RECORD.size <= len(data):
+        received_at, kind, length = RECORD.unpack_from(data, offset)
+        offset += RECORD.size
+        payload = data[offset:offset + length]
+        if len(payload) < length:
+            return
+        offset += length
+        yield received_at, payload.decode() if kind == 0 else payload
+
+
+class FrameJournal(object):
+    """Write raw frames with their receive time to rotated, compressed segments.
+
+    `append` only enqueues, a writer thread group-commits whatever arrived
+    within `commit_interval` as one independent compressed member (a gzip
+    member or a zstd frame), so a crash loses at most the batch in flight.
+    Every member gets a line in the segment's ``.idx`` file holding its time
+    range and byte offset, which :class:`JournalReader` uses to seek by time.
+    """
+
+    def __init__(
+            self,
+            directory,
+            compression="gzip",
+            segment_bytes=64 * 1024 * 1024,
+            segment_seconds=3600,
+            commit_interval=0.2,
+            max_batch=5000,
+            max_pending=100000,
+            fsync=False
+    ):
+        """
+        :param directory: Folder holding the segments, created if missing.
+        :param str compression: `gzip`, or `zstd` when :mod:`zstandard` is installed.
+        :param int segment_bytes: Compressed size after which a segment is rotated.
+        :param float segment_seconds: Age after which a segment is rotated.
+        :param float commit_interval: Seconds a batch is gathered before being written.
+        :param int max_batch: Frames written per member at most.
+        :param int max_pending: Frames queued before new ones are dropped.
+        :param bool fsync: Whether every commit is fsynced.
+        """
+        if compression not in EXTENSIONS:
+            raise ValueError(f"Unknown journal compression {compression!r}.")
+        if compression == "zstd" and zstandard is None:
+            raise ImportError("zstd journals need the `zstandard` package.")
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.compression = compression
+        self.segment_bytes = segment_bytes
+        self.segment_seconds = segment_seconds
+        self.commit_interval = commit_interval
+        self.max_batch = max_batch
+        self.fsync = fsync
+        self.frames_written = 0
+        self.frames_dropped = 0
+        self.commits = 0
+        self._queue = queue.Queue(max_pending)
+        self._segment = None
+        self._index = None
+        self._segment_started = None
+        self._compressor = zstandard.ZstdCompressor() if compression == "zstd" else None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="frame-journal", daemon=True)
+        self._thread.start()
+
+    def append(self, frame, received_at=None):
+        """Queue a frame, never blocks; frames are dropped when the writer lags."""
+        try:
+            self._queue.put_nowait((received_at or time.time(), frame))
+        except queue.Full:
+            self.frames_dropped += 1
+
+    def _compress(self, data):
+        if self._compressor is not None:
+            return self._compressor.compress(data)
+        return gzip.compress(data, compresslevel=6)
+
+    def _open_segment(self, started):
+        self._close_segment()
+        name = f"frames-{int(started * 1000)}"
+        self._segment = open(self.directory / (name + EXTENSIONS[self.compression]), "ab")
+        self._index = open(self.directory / (name + ".idx"), "a")
+        self._segment_started = started
+
+    def _close_segment(self):
+        if self._segment is not None:
+            self._segment.close()
+            self._index.close()
+            self._segment = self._index = None
+
+    def _commit(self, batch):
+        first, last = batch[0][0], batch[-1][0]
+        if (self._segment is None
+                or self._segment.tell() >= self.segment_bytes
+                or first - self._segment_started >= self.segment_seconds):
+            self._open_segment(first)
+        member = self._compress(b"".join(_encode(at, frame) for at, frame in batch))
+        offset = self._segment.tell()
+        self._segment.write(member)
+        self._segment.flush()
+        if self.fsync:
+            os.fsync(self._segment.fileno())
+        self._index.write(json.dumps([first, last, offset, len(member), len(batch)]) + "\n")
+        self._index.flush()
+        self.frames_written += len(batch)
+        self.commits += 1
+
+    def _run(self):
+        while not (self._stop.is_set() and self._queue.empty()):
+            try:
+                batch = [self._queue.get(timeout=0.5)]
+            except queue.Empty:
+                continue
+            deadline = time.monotonic() + self.commit_interval
+            while len(batch) < self.max_batch:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+            try:
+                self._commit(batch)
+            except Exception as e:
+                logger.error(f"Journal commit failed, {len(batch)} frames lost: {e}")
+        self._close_segment()
+
+    def close(self, timeout=5):
+        """Flush what is queued and stop the writer thread."""
+        self._stop.set()
+        self._thread.join(timeout)
+
+    def stats(self):
+        return {
+            "frames_written": self.frames_written,
+            "frames_dropped": self.frames_dropped,
+            "commits": self.commits,
+            "pending": self._queue.qsize(),
+        }
+
+
+class JournalReader(object):
+    """Read frames back from a :class:`FrameJournal` directory, in time order."""
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+
+    def segments(self):
+        """``(path, index entries)`` of every segment, oldest first."""
+        segments = []
+        for path in self.directory.glob("frames-*.jnl.*"):
+            index_path = path.with_name(path.name.split(".")[0] + ".idx")
+            entries = []
+            if index_path.exists():
+                with open(index_path) as f:
+                    for line in f:
+                        try:
+                            entries.append(json.loads(line))
+                        except ValueError:
+                            break
+            segments.append((int(path.name.split(".")[0].split("-")[1]), path, entries))
+        return [(path, entries) for _, path, entries in sorted(segments)]
+
+    @staticmethod
+    def _decompress(path, data):
+        if path.suffix == ".zst":
+            if zstandard is None:
+                raise ImportError("zstd journals need the `zstandard` package.")
+            reader = zstandard.ZstdDecompressor().stream_reader(io.BytesIO(data), read_across_frames=True)
+            return reader.read()
+        return gzip.decompress(data)
+
+    def read(self, start=None, end=None):
+        """Yield ``(received_at, frame)`` with `received_at` in ``[start, end]``.
+
+        Members ending before `start` are skipped through the index without
+        being read or decompressed.
+        """
+        for path, entries in self.segments():
+            if not entries:
+                continue
+            if end is not None and entries[0][0] > end:
+                break
+            if start is not None and entries[-1][1] < start:
+                continue
+            first = bisect_left([e[1] for e in entries], start) if start is not None else 0
+            with open(path, "rb") as f:
+                for first_at, last_at, offset, length, _ in entries[first:]:
+                    if end is not None and first_at > end:
+                        return
+                    f.seek(offset)
+                    for received_at, frame in _decode(self._decompress(path, f.read(length))):
+                        if start is not None and received_at < start:
+                            continue
+                        if end is not None and received_at > end:
+                            return
+                        yield received_at, frame
+
+    def __iter__(self):
+        return self.read()
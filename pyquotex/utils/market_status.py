@@ -0,0 +1,116 @@
+"""Market open/closed status shared between processes through one JSON file.
+
+The harvester writes it only when an asset opens, closes or appears, with an
+atomic rename, so a reader never sees a half-written file. Readers keep the
+parsed content and only parse again when the file's mtime changes, which
+costs one ``stat`` per lookup instead of a full parse.
+
+    store = MarketStatusStore("data/market_status.json")
+    store.get("EURUSD_otc")  # {"name": ..., "open": True, "last_checked": ..., "changed_at": ...}
+"""
+import os
+import json
+import time
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class MarketStatusStore(object):
+    """``{symbol: {"name", "open", "last_checked", "changed_at"}}`` on disk."""
+
+    def __init__(self, path, heartbeat=60):
+        """
+        :param path: The JSON file.
+        :param float heartbeat: Seconds after which :meth:`touch` rewrites an
+            unchanged status, so readers can tell a live harvester from a dead one.
+        """
+        self.path = str(path)
+        self.heartbeat = heartbeat
+        self.written_at = 0.0
+        self._status = {}
+        self._stamp = None
+        self._lock = threading.Lock()
+
+    def _reload(self):
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            self._status, self._stamp = {}, None
+            return
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        if stamp == self._stamp:
+            return
+        try:
+            with open(self.path) as f:
+                self._status = json.load(f)
+            self._stamp = stamp
+        except (OSError, ValueError) as e:
+            logger.debug(f"Keeping the previous market status: {e}")
+
+    def all(self):
+        """Every status, parsed again only if the file changed."""
+        with self._lock:
+            self._reload()
+            return self._status
+
+    def get(self, symbol):
+        return self.all().get(symbol)
+
+    def is_open(self, symbol):
+        status = self.get(symbol)
+        return bool(status and status.get("open"))
+
+    def update(self, changes, now=None):
+        """Merge ``{symbol: {"name": ..., "open": ...}}`` and write the file.
+
+        :returns: The symbols whose open state changed.
+        """
+        now = now or time.time()
+        flipped = []
+        with self._lock:
+            self._reload()
+            status = dict(self._status)
+            for symbol, change in changes.items():
+                entry = dict(status.get(symbol) or {})
+                if entry.get("open") != change.get("open"):
+                    entry["changed_at"] = now
+                    flipped.append(symbol)
+                entry.update(change)
+                status[symbol] = entry
+            self._write(status, now)
+        return flipped
+
+    def remove(self, symbols, now=None):
+        with self._lock:
+            self._reload()
+            status = {s: v for s, v in self._status.items() if s not in set(symbols)}
+            self._write(status, now or time.time())
+
+    def touch(self, now=None):
+        """Rewrite the unchanged status once `heartbeat` seconds went by.
+
+        :returns: True if written.
+        """
+        now = now or time.time()
+        if now - self.written_at < self.heartbeat:
+            return False
+        with self._lock:
+            self._reload()
+            self._write(dict(self._status), now)
+        return True
+
+    def _write(self, status, now):
+        for entry in status.values():
+            entry["last_checked"] = now
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(status, f, separators=(",", ":"))
+        os.replace(tmp, self.path)
+        stat = os.stat(self.path)
+        self._status, self._stamp = status, (stat.st_mtime_ns, stat.st_size)
+        self.written_at = now
@@ -0,0 +1,177 @@
+"""Drive :class:`WebsocketClient` from recorded or synthetic frames, without a broker."""
+import json
+import time
+import random
+import logging
+import threading
+import statistics
+from collections import defaultdict
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+from ..api import QuotexAPI
+from ..ws.client import WebsocketClient
+from .journal import JournalReader
+
+logger = logging.getLogger(__name__)
+
+PLACEHOLDER = '451-["%s",{"_placeholder":true,"num":0}]'
+
+
+def synthetic_frames(assets=("EURUSD_otc",), seconds=86400, ticks_per_second=1.0, start=None, seed=0):
+    """Generate a deterministic tick stream framed the way the platform sends it.
+
+    Every tick is a ``quotes/stream`` placeholder followed by its ``\\x04``
+    binary payload, prices follow a seeded random walk.
+
+    :returns: An iterator of ``(received_at, frame)``.
+    """
+    rng = random.Random(seed)
+    start = start if start is not None else 1_700_000_000.0
+    prices = {asset: 1.0 + rng.random() for asset in assets}
+    step = 1.0 / (ticks_per_second * len(assets))
+    placeholder = PLACEHOLDER % "quotes/stream"
+    now = start
+    count = int(seconds * ticks_per_second * len(assets))
+    for i in range(count):
+        asset = assets[i % len(assets)]
+        prices[asset] = round(prices[asset] * (1 + rng.gauss(0, 5e-5)), 5)
+        yield now, placeholder
+        yield now, b"\x04" + json.dumps([[asset, round(now, 3), prices[asset], 1]]).encode()
+        now = start + (i + 1) * step
+
+
+def journal_frames(directory, start=None, end=None):
+    """Frames of a :class:`FrameJournal <pyquotex.utils.journal.FrameJournal>` directory."""
+    return JournalReader(directory).read(start, end)
+
+
+class ReplaySocket(object):
+    """Stands in for the websocket, recording what the client sends back."""
+
+    def __init__(self):
+        self.sent = []
+
+    def send(self, data):
+        self.sent.append(data)
+
+    def close(self):
+        pass
+
+
+class ReplayDriver(object):
+    """Feed frames into `WebsocketClient.on_message` with their recorded timing.
+
+    The driver owns a real :class:`QuotexAPI <pyquotex.api.QuotexAPI>` that is
+    never connected, so anything reading ``driver.api`` (tick buffers,
+    candle stores, indicators, the dashboard fan-out) runs unchanged.
+    """
+
+    def __init__(self, frames, speed=None, api=None):
+        """
+        :param frames: Iterable of ``(received_at, frame)``, e.g. from
+            :func:`journal_frames` or :func:`synthetic_frames`.
+        :param float speed: ``1`` keeps the original inter-arrival times,
+            ``N`` plays N times faster, ``None`` or ``0`` as fast as possible.
+        :param api: (optional) The :class:`QuotexAPI <pyquotex.api.QuotexAPI>` to drive.
+        """
+        self.frames = frames
+        self.speed = speed or None
+        self.api = api or QuotexAPI("replay.local", None, None, "en")
+        # Every asset gets a tick buffer, as if all of them were subscribed.
+        self.api.realtime_price = defaultdict(list)
+        self.client = WebsocketClient(self.api)
+        self.client.wss = ReplaySocket()
+        self.api.websocket_client = self.client
+        self.recorded_at = None
+        self.frames_done = 0
+        self.stats = None
+        self._stop = threading.Event()
+        self._thread = None
+        self.client.clock = lambda: self.recorded_at
+
+    @staticmethod
+    def _stage(frame, pending_event):
+        if isinstance(frame, str):
+            if frame.startswith("451-"):
+                return "placeholder"
+            return "control"
+        return pending_event or "binary"
+
+    @staticmethod
+    def _rss_kb():
+        if resource is None:
+            return None
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    def run(self):
+        """Replay every frame, blocking until done or :meth:`stop`.
+
+        :returns: The report, also kept in `stats`.
+        """
+        latencies = defaultdict(list)
+        lags = []
+        pending_event = None
+        rss_before = self._rss_kb()
+        first_recorded = None
+        started = time.perf_counter()
+        on_message = self.client.on_message
+        wss = self.client.wss
+        for recorded_at, frame in self.frames:
+            if self._stop.is_set():
+                break
+            if first_recorded is None:
+                first_recorded = recorded_at
+            if self.speed:
+                target = started + (recorded_at - first_recorded) / self.speed
+                delay = target - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                else:
+                    lags.append(-delay)
+            self.recorded_at = recorded_at
+            stage = self._stage(frame, pending_event)
+            t0 = time.perf_counter()
+            on_message(wss, frame)
+            latencies[stage].append(time.perf_counter() - t0)
+            if stage == "placeholder":
+                pending_event = frame[6:frame.index('"', 6)]
+            elif not isinstance(frame, str):
+                pending_event = None
+            self.frames_done += 1
+        elapsed = time.perf_counter() - started
+        rss_after = self._rss_kb()
+        self.stats = {
+            "frames": self.frames_done,
+            "elapsed_s": elapsed,
+            "frames_per_s": self.frames_done / elapsed if elapsed else 0.0,
+            "recorded_span_s": (self.recorded_at - first_recorded) if first_recorded is not None else 0.0,
+            "max_lag_ms": max(lags) * 1000 if lags else 0.0,
+            "max_rss_growth_kb": rss_after - rss_before if rss_before is not None else None,
+            "stages": {
+                stage: {
+                    "count": len(values),
+                    "p50_us": statistics.median(values) * 1e6,
+                    "p99_us": sorted(values)[int(0.99 * (len(values) - 1))] * 1e6,
+                }
+                for stage, values in latencies.items()
+            },
+        }
+        return self.stats
+
+    def start(self):
+        """Replay on a background thread, the way frames arrive from the socket thread."""
+        self._thread = threading.Thread(target=self.run, name="replay", daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def stop(self):
+        self._stop.set()
+
+    def join(self, timeout=None):
+        if self._thread is not None:
+            self._thread.join(timeout)
+        return self.stats
@@ -0,0 +1,112 @@
+"""Partitioning of the asset universe across connections, and merging back.
+
+:func:`assign` spreads assets over shards with rendezvous hashing under a
+load cap: every shard gets at most ``ceil(assets / shards)`` of them, and
+when a shard leaves only its own assets move, so the surviving connections
+keep their subscriptions.
+
+:class:`OrderedMerge` turns the per-shard tick batches back into one stream
+ordered by server timestamp. Each shard reports a watermark, the time below
+which it will send nothing more; ticks are released once every live shard's
+watermark passed them.
+
+    shards = assign(["EURUSD_otc", "USDBRL_otc", ...], [0, 1, 2])
+    merge = OrderedMerge()
+    merge.push(0, [(1700000000.5, "EURUSD_otc", 1.0832)], watermark=1700000000.5)
+    merge.pop_ready()
+"""
+import math
+import heapq
+import zlib
+
+
+def _score(shard, asset):
+    # crc32 instead of hash(): the same on every process and every run.
+    return zlib.crc32(f"{shard}:{asset}".encode())
+
+
+def assign(assets, shards):
+    """Map every asset to a shard.
+
+    :param assets: The asset symbols.
+    :param shards: The live shard ids.
+    :returns: ``{shard: [asset]}`` with every shard present, even when empty.
+    """
+    shards = list(shards)
+    result = {shard: [] for shard in shards}
+    if not shards:
+        return result
+    assets = sorted(set(assets))
+    capacity = math.ceil(len(assets) / len(shards))
+    for asset in assets:
+        for shard in sorted(shards, key=lambda s: _score(s, asset), reverse=True):
+            if len(result[shard]) < capacity:
+                result[shard].append(asset)
+                break
+    return result
+
+
+class OrderedMerge(object):
+    """k-way merge of shard batches by tick timestamp."""
+
+    def __init__(self):
+        self.late = 0
+        self.last_emitted = float("-inf")
+        self._heap = []
+        self._watermarks = {}
+        self._seq = 0
+
+    def __len__(self):
+        return len(self._heap)
+
+    @property
+    def watermark(self):
+        """The time up to which the merged stream is complete."""
+        return min(self._watermarks.values()) if self._watermarks else float("inf")
+
+    def add_shard(self, shard):
+        """Hold the stream back for `shard` from now on."""
+        self._watermarks.setdefault(shard, float("-inf"))
+
+    def remove_shard(self, shard):
+        """Stop waiting for `shard`, e.g. once it died; its pending ticks stay."""
+        self._watermarks.pop(shard, None)
+
+    def push(self, shard, ticks, watermark):
+        """Queue a batch.
+
+        :param shard: The shard id.
+        :param ticks: ``(timestamp, asset, price)`` tuples.
+        :param float watermark: No later tick of `shard` will be older than this.
+        """
+        for timestamp, asset, price in ticks:
+            self._seq += 1
+            heapq.heappush(self._heap, (timestamp, self._seq, shard, asset, price))
+        if shard in self._watermarks:
+            self._watermarks[shard] = max(self._watermarks[shard], watermark)
+
+    def pop_ready(self):
+        """Ticks every live shard is past, oldest first.
+
+        :returns: ``(timestamp, shard, asset, price)`` tuples. A tick that
+            arrives after newer ones were released still goes out, and is
+            counted in :attr:`late`.
+        """
+        limit = self.watermark
+        ready = []
+        while self._heap and self._heap[0][0] <= limit:
+            timestamp, _, shard, asset, price = heapq.heappop(self._heap)
+            if timestamp < self.last_emitted:
+                self.late += 1
+            else:
+                self.last_emitted = timestamp
+            ready.append((timestamp, shard, asset, price))
+        return ready
+
+    def drain(self):
+        """Everything still queued, regardless of the watermarks."""
+        ready = []
+        while self._heap:
+            timestamp, _, shard, asset, price = heapq.heappop(self._heap)
+            ready.append((timestamp, shard, asset, price))
+        return ready
@@ -0,0 +1,271 @@
+"""Parallel parameter sweeps of :mod:`pyquotex.utils.backtest` strategies.
+
+The candles of every asset are copied once into a single shared memory
+block. Workers attach to it when they start and build numpy views on it, so
+a task only carries an asset name and a parameter set, never candles.
+
+    def sma_cross(candles, fast, slow):
+        return crossover(sma(candles.close, fast), sma(candles.close, slow))
+
+    sweep = Sweep({a: load_archive(a) for a in assets}, sma_cross,
+                  {"fast": [5, 10], "slow": [20, 50], "expiry": [60, 300]},
+                  payouts=load_payouts(), checkpoint="sweep.jsonl")
+    sweep.run()
+    print(format_table(sweep.ranked(top=20)))
+
+The strategy must be importable by the workers, i.e. a module-level function.
+"""
+import os
+import json
+import logging
+import itertools
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from .backtest import Backtest, Candles
+
+logger = logging.getLogger(__name__)
+
+COLUMNS = Candles._fields
+RUN_KEYS = ("expiry", "stake", "martingale", "multiplier", "overlapping")
+REPORT_KEYS = (
+    "trades", "wins", "losses", "ties", "win_rate", "ev_per_trade",
+    "ev_per_unit", "total_pnl", "max_drawdown", "longest_losing_streak"
+)
+
+
+class SharedCandles(object):
+    """Candle arrays of many assets in one shared memory block.
+
+    Every asset takes five consecutive 8-byte columns, the time column is
+    read through an int64 view of the block and the prices through a float64
+    one, so no column is ever copied.
+    """
+
+    def __init__(self, descriptor, shm, owner=False):
+        self.descriptor = descriptor
+        self.shm = shm
+        self.owner = owner
+        prices, times = self._buffers(shm, descriptor["rows"])
+        self._views = {}
+        for asset, (offset, length) in descriptor["index"].items():
+            columns = [times[offset:offset + length]]
+            columns += [prices[offset + i * length:offset + (i + 1) * length] for i in range(1, len(COLUMNS))]
+            self._views[asset] = Candles(*columns)
+
+    @staticmethod
+    def _buffers(shm, rows):
+        return (
+            np.ndarray((rows,), dtype=np.float64, buffer=shm.buf),
+            np.ndarray((rows,), dtype=np.int64, buffer=shm.buf),
+        )
+
+    @classmethod
+    def create(cls, candles):
+        """Copy ``{asset: Candles}`` into a new block.
+
+        :returns: The owning instance, call :meth:`close` to free the block.
+        """
+        index = {}
+        rows = 0
+        for asset, series in candles.items():
+            index[asset] = (rows, len(series.time))
+            rows += len(series.time) * len(COLUMNS)
+        shm = shared_memory.SharedMemory(create=True, size=max(rows, 1) * 8)
+        prices, times = cls._buffers(shm, rows)
+        for asset, series in candles.items():
+            offset, length = index[asset]
+            times[offset:offset + length] = series.time
+            for i in range(1, len(COLUMNS)):
+                prices[offset + i * length:offset + (i + 1) * length] = series[i]
+        del prices, times
+        return cls({"name": shm.name, "rows": rows, "index": index}, shm, owner=True)
+
+    @classmethod
+    def attach(cls, descriptor):
+        """Map an existing block by its descriptor, without copying it.
+
+        Pool workers share the resource tracker of the process that created
+        the block, their registration is a no-op and the owner still unlinks it.
+        """
+        shm = shared_memory.SharedMemory(name=descriptor["name"])
+        return cls(descriptor, shm)
+
+    def assets(self):
+        return list(self._views)
+
+    def __getitem__(self, asset):
+        return self._views[asset]
+
+    def close(self):
+        self._views = {}
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+def grid(parameters):
+    """Every combination of ``{name: [values]}`` as a list of dicts."""
+    names = list(parameters)
+    return [dict(zip(names, values)) for values in itertools.product(*(parameters[n] for n in names))]
+
+
+def cell_key(asset, params):
+    return json.dumps([asset, params], sort_keys=True)
+
+
+_worker = {}
+
+
+def _init_worker(descriptor, strategy, payouts, options):
+    _worker["candles"] = SharedCandles.attach(descriptor)
+    _worker["strategy"] = strategy
+    _worker["payouts"] = payouts
+    _worker["options"] = options
+
+
+def _run_cells(asset, cells):
+    """Evaluate the parameter sets `cells` on `asset` inside a worker."""
+    candles = _worker["candles"][asset]
+    payouts = _worker["payouts"]
+    backtest = Backtest(candles, payout=payouts.get(asset, payouts.get(None, 0.8)), asset=asset)
+    rows = []
+    for params in cells:
+        run = dict(_worker["options"])
+        run.update((k, v) for k, v in params.items() if k in RUN_KEYS)
+        strategy_params = {k: v for k, v in params.items() if k not in RUN_KEYS}
+        try:
+            report = backtest.run(lambda c: _worker["strategy"](c, **strategy_params), **run)
+            row = {key: report[key] for key in REPORT_KEYS}
+        except Exception as e:
+            row = {"error": str(e)}
+        row.update(asset=asset, params=params)
+        rows.append(row)
+    return rows
+
+
+class Sweep(object):
+    """Run ``assets × grid`` backtests on a process pool and rank the results."""
+
+    def __init__(
+            self,
+            candles,
+            strategy,
+            parameters,
+            payouts=None,
+            checkpoint=None,
+            workers=None,
+            cells_per_task=8,
+            **options
+    ):
+        """
+        :param candles: ``{asset: Candles}``.
+        :param strategy: Module-level ``strategy(candles, **params) -> signal``.
+        :param parameters: ``{name: [values]}``; `expiry`, `stake`, `martingale`,
+            `multiplier` and `overlapping` go to :meth:`Backtest.run
+            <pyquotex.utils.backtest.Backtest.run>`, the rest to the strategy.
+        :param payouts: (optional) ``{asset: payout}`` as from :func:`load_payouts
+            <pyquotex.utils.backtest.load_payouts>`, ``None`` key as default.
+        :param checkpoint: (optional) JSON-lines file results are appended to,
+            cells already in it are skipped.
+        :param int workers: Processes, all cores by default.
+        :param int cells_per_task: Parameter sets evaluated per task.
+        :param options: Defaults for the :meth:`Backtest.run` arguments.
+        """
+        self.candles = candles
+        self.strategy = strategy
+        self.cells = grid(parameters)
+        self.payouts = payouts or {}
+        self.checkpoint = checkpoint
+        self.workers = workers or os.cpu_count() or 1
+        self.cells_per_task = cells_per_task
+        self.options = options
+        self.results = {}
+        if checkpoint and os.path.exists(checkpoint):
+            self._load_checkpoint()
+
+    def _load_checkpoint(self):
+        with open(self.checkpoint) as f:
+            for line in f:
+                try:
+                    row = json.loads(line)
+                except ValueError:
+                    continue  # A line cut short by a crash.
+                self.results[cell_key(row["asset"], row["params"])] = row
+
+    def _open_checkpoint(self):
+        sink = open(self.checkpoint, "a")
+        if sink.tell():
+            with open(self.checkpoint, "rb") as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    # Terminate a line cut short by a crash before appending.
+                    sink.write("\n")
+        return sink
+
+    def pending(self):
+        """``[(asset, [params])]`` tasks not in the results yet."""
+        tasks = []
+        for asset in self.candles:
+            todo = [p for p in self.cells if cell_key(asset, p) not in self.results]
+            for i in range(0, len(todo), self.cells_per_task):
+                tasks.append((asset, todo[i:i + self.cells_per_task]))
+        return tasks
+
+    def run(self, on_result=None):
+        """Evaluate every pending cell.
+
+        :param on_result: (optional) Called with each row as it arrives.
+        :returns: The number of cells evaluated.
+        """
+        tasks = self.pending()
+        if not tasks:
+            return 0
+        shared = SharedCandles.create(self.candles)
+        done = 0
+        sink = self._open_checkpoint() if self.checkpoint else None
+        try:
+            with ProcessPoolExecutor(
+                    max_workers=min(self.workers, len(tasks)),
+                    initializer=_init_worker,
+                    initargs=(shared.descriptor, self.strategy, self.payouts, self.options)
+            ) as pool:
+                futures = [pool.submit(_run_cells, asset, cells) for asset, cells in tasks]
+                for future in as_completed(futures):
+                    for row in future.result():
+                        self.results[cell_key(row["asset"], row["params"])] = row
+                        if sink is not None:
+                            sink.write(json.dumps(row) + "\n")
+                        if on_result is not None:
+                            on_result(row)
+                        done += 1
+                    if sink is not None:
+                        sink.flush()
+        finally:
+            if sink is not None:
+                sink.close()
+            shared.close()
+        return done
+
+    def ranked(self, by="ev_per_trade", min_trades=30, top=None):
+        """Rows with at least `min_trades`, best `by` first."""
+        rows = [
+            r for r in self.results.values()
+            if "error" not in r and r["trades"] >= min_trades and r.get(by) is not None
+        ]
+        rows.sort(key=lambda r: r[by], reverse=True)
+        return rows[:top] if top else rows
+
+
+def format_table(rows, columns=("trades", "win_rate", "ev_per_trade", "total_pnl", "max_drawdown")):
+    """Plain-text table of ranked rows."""
+    lines = [f"{'asset':<16}{'params':<40}" + "".join(f"{c:>14}" for c in columns)]
+    for row in rows:
+        params = " ".join(f"{k}={v}" for k, v in row["params"].items())
+        cells = "".join(
+            f"{row[c]:>14.4f}" if isinstance(row[c], float) else f"{row[c]!s:>14}" for c in columns
+        )
+        lines.append(f"{row['asset']:<16}{params:<40}{cells}")
+    return "\n".join(lines)
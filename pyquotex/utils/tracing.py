@@ -0,0 +1,160 @@
+"""Sampled tracing of ticks from the socket thread to their last consumer.
+
+A sampled tick carries a :class:`Trace` in its ``"trace"`` key. Every stage
+that handles it calls :meth:`Trace.mark`, the last one calls
+:meth:`Tracer.finish`. All stamps are :func:`time.perf_counter` readings, so
+they are monotonic and comparable across threads.
+
+When the tracer is disabled the instrumented code only reads
+``TRACER.enabled``, nothing is allocated and no clock is read.
+"""
+import os
+import time
+import heapq
+import logging
+import threading
+from collections import deque
+
+from .metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+STAGE_SECONDS = REGISTRY.histogram(
+    "pyquotex_trace_stage_seconds",
+    "Latency of each lifecycle stage of sampled ticks, since the previous stage.",
+    ("stage",),
+    buckets=(0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+)
+
+
+class Trace(object):
+    __slots__ = ("asset", "stamps")
+
+    def __init__(self, received_at):
+        self.asset = None
+        self.stamps = [("receive", received_at)]
+
+    def mark(self, stage):
+        self.stamps.append((stage, time.perf_counter()))
+
+    def stages(self):
+        """``[(stage, seconds since the previous stage)]``."""
+        return [(stage, at - self.stamps[i][1]) for i, (stage, at) in enumerate(self.stamps[1:])]
+
+    def total(self):
+        return self.stamps[-1][1] - self.stamps[0][1]
+
+
+def _percentile(values, q):
+    return values[min(int(q * len(values)), len(values) - 1)]
+
+
+class Tracer(object):
+    """Samples one frame in `sample_every` and aggregates the finished traces."""
+
+    def __init__(self, sample_every=100, window=10000, slow_keep=20):
+        """
+        :param int sample_every: One frame in this many gets a trace.
+        :param int window: Stage latencies kept per stage for the percentiles.
+        :param int slow_keep: Slowest traces kept in the slow-path log.
+        """
+        self.enabled = False
+        self.sample_every = sample_every
+        self.window = window
+        self.slow_keep = slow_keep
+        self.started = 0
+        self.finished = 0
+        self._countdown = sample_every
+        self._latencies = {}
+        self._totals = deque(maxlen=window)
+        self._slowest = []
+        self._seq = 0
+        self._lock = threading.Lock()
+
+    def enable(self, sample_every=None):
+        if sample_every:
+            self.sample_every = sample_every
+        self._countdown = self.sample_every
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        with self._lock:
+            self.started = self.finished = 0
+            self._latencies = {}
+            self._totals = deque(maxlen=self.window)
+            self._slowest = []
+
+    def start(self, received_at):
+        """A new :class:`Trace` for one frame in `sample_every`, otherwise None."""
+        self._countdown -= 1
+        if self._countdown > 0:
+            return None
+        self._countdown = self.sample_every
+        self.started += 1
+        return Trace(received_at)
+
+    def finish(self, trace, stage=None):
+        """Close `trace`, optionally marking a last `stage` first."""
+        if stage is not None:
+            trace.mark(stage)
+        stages = trace.stages()
+        total = trace.total()
+        for name, seconds in stages:
+            STAGE_SECONDS.labels(name).observe(seconds)
+        with self._lock:
+            self.finished += 1
+            for name, seconds in stages:
+                latencies = self._latencies.get(name)
+                if latencies is None:
+                    latencies = self._latencies[name] = deque(maxlen=self.window)
+                latencies.append(seconds)
+            self._totals.append(total)
+            self._seq += 1
+            entry = (total, self._seq, {
+                "asset": trace.asset,
+                "total_ms": round(total * 1000, 3),
+                "stages": {name: round(seconds * 1000, 3) for name, seconds in stages},
+            })
+            if len(self._slowest) < self.slow_keep:
+                heapq.heappush(self._slowest, entry)
+            elif total > self._slowest[0][0]:
+                heapq.heapreplace(self._slowest, entry)
+            else:
+                return
+        logger.debug(f"Slow trace {entry[2]}")
+
+    @staticmethod
+    def _summary(values):
+        values = sorted(values)
+        return {
+            "count": len(values),
+            "p50_ms": round(_percentile(values, 0.5) * 1000, 3),
+            "p90_ms": round(_percentile(values, 0.9) * 1000, 3),
+            "p99_ms": round(_percentile(values, 0.99) * 1000, 3),
+            "max_ms": round(values[-1] * 1000, 3),
+        }
+
+    def report(self):
+        """Per-stage percentiles over the last `window` traces and the slowest traces."""
+        with self._lock:
+            latencies = {name: list(values) for name, values in self._latencies.items()}
+            totals = list(self._totals)
+            slowest = [entry for _, _, entry in sorted(self._slowest, reverse=True)]
+        return {
+            "enabled": self.enabled,
+            "sample_every": self.sample_every,
+            "started": self.started,
+            "finished": self.finished,
+            "stages": {name: self._summary(values) for name, values in latencies.items() if values},
+            "total": self._summary(totals) if totals else None,
+            "slowest": slowest,
+        }
+
+
+TRACER = Tracer()
+if os.getenv("PYQUOTEX_TRACE"):
+    # e.g. PYQUOTEX_TRACE=100 traces one frame in a hundred from start-up.
+    TRACER.enable(int(os.environ["PYQUOTEX_TRACE"]))
@@ -0,0 +1,192 @@
+import json
+import asyncio
+import sqlite3
+from collections import deque
+
+
+class TradeHistory(object):
+    """Local, ticket-indexed copy of the trader history of one account type.
+
+    Pages of `/api/v1/cabinets/trades/history` are newest first. `sync` only
+    walks forward until it meets a trade it already knows, `backfill` walks
+    older pages, and both fetch pages concurrently through a bounded pool.
+    Lookups are answered from the index and hit the network only on a miss.
+    """
+
+    def __init__(self, api, account_type, concurrency=4, max_pages=50, path=None):
+        """
+        :param api: The instance of :class:`QuotexAPI <pyquotex.api.QuotexAPI>`.
+        :param str account_type: `demo` or `live`.
+        :param int concurrency: Pages fetched at the same time.
+        :param int max_pages: Deepest page `backfill` will reach.
+        :param path: (optional) SQLite file persisting the table across runs.
+        """
+        self.api = api
+        self.account_type = account_type
+        self.concurrency = concurrency
+        self.max_pages = max_pages
+        self.trades = {}
+        self.tickets = deque()
+        self.deepest_page = 0
+        self.page_size = 0
+        self.exhausted = False
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._lock = asyncio.Lock()
+        self._db = None
+        if path:
+            self._open(path)
+
+    def __len__(self):
+        return len(self.trades)
+
+    def __contains__(self, ticket):
+        return ticket in self.trades
+
+    def _open(self, path):
+        self._db = sqlite3.connect(str(path))
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS trades ("
+            "account TEXT, seq INTEGER, ticket TEXT, data TEXT, "
+            "PRIMARY KEY (account, ticket))"
+        )
+        rows = self._db.execute(
+            "SELECT ticket, data FROM trades WHERE account = ? ORDER BY seq DESC",
+            (self.account_type,)
+        )
+        for ticket, data in rows:
+            self.trades[ticket] = json.loads(data)
+            self.tickets.append(ticket)
+
+    def _persist(self, trades, newest):
+        if self._db is None or not trades:
+            return
+        # Newer trades get higher sequence numbers so ORDER BY seq DESC is newest first.
+        row = self._db.execute(
+            "SELECT MIN(seq), MAX(seq) FROM trades WHERE account = ?",
+            (self.account_type,)
+        ).fetchone()
+        low, high = row[0] or 0, row[1] or 0
+        if newest:
+            rows = [(self.account_type, high + len(trades) - i, t["ticket"], json.dumps(t))
+                    for i, t in enumerate(trades)]
+        else:
+            rows = [(self.account_type, low - 1 - i, t["ticket"], json.dumps(t))
+                    for i, t in enumerate(trades)]
+        self._db.executemany("INSERT OR REPLACE INTO trades VALUES (?, ?, ?, ?)", rows)
+        self._db.commit()
+
+    def get_cached(self, ticket):
+        return self.trades.get(ticket)
+
+    def latest(self, limit=None):
+        """Known trades, newest first."""
+        tickets = list(self.tickets)[:limit] if limit else self.tickets
+        return [self.trades[t] for t in tickets]
+
+    async def fetch_page(self, page):
+        async with self._semaphore:
+            data = await self.api.get_trader_history(self.account_type, page)
+        return data if isinstance(data, list) else []
+
+    async def _fetch_window(self, first_page):
+        pages = range(first_page, first_page + self.concurrency)
+        return await asyncio.gather(*(self.fetch_page(p) for p in pages))
+
+    async def sync(self):
+        """Fetch the trades newer than the newest known one.
+
+        Every trade of the fetched pages is indexed, also the older ones
+        behind the first known ticket. The new trades push the older ones
+        down the pages, so the depth reached before moves down with them.
+
+        :returns: The number of new trades.
+        """
+        async with self._lock:
+            fresh = []
+            older = []
+            page = 1
+            reached_known = False
+            while not reached_known and page <= self.max_pages:
+                # The first page is usually enough, only widen when it is all new.
+                window = [await self.fetch_page(1)] if page == 1 else await self._fetch_window(page)
+                for items in window:
+                    if not items:
+                        reached_known = True
+                        break
+                    if page == 1:
+                        self.page_size = max(self.page_size, len(items))
+                    page += 1
+                    for item in items:
+                        ticket = item.get("ticket")
+                        if ticket in self.trades:
+                            reached_known = True
+                        elif reached_known:
+                            older.append(item)
+                        else:
+                            fresh.append(item)
+                    if reached_known:
+                        break
+                if not self.trades:
+                    # Empty table: one window is the initial snapshot, older pages load on a miss.
+                    break
+            # Pages 1..page-1 were indexed whole, the known ones sit len(fresh) trades lower now.
+            shifted = (len(fresh) + self.deepest_page * self.page_size) // self.page_size if self.page_size else 0
+            self.deepest_page = max(page - 1, shifted)
+            for item in reversed(fresh):
+                if item.get("ticket") not in self.trades:
+                    self.trades[item["ticket"]] = item
+                    self.tickets.appendleft(item["ticket"])
+            for item in older:
+                if item.get("ticket") not in self.trades:
+                    self.trades[item["ticket"]] = item
+                    self.tickets.append(item["ticket"])
+            self._persist(fresh, newest=True)
+            self._persist(older, newest=False)
+            return len(fresh)
+
+    async def backfill(self, ticket=None):
+        """Walk older pages until `ticket` is found, history ends or `max_pages`.
+
+        Once the end of the history was seen, later calls return at once.
+
+        :returns: The number of trades added.
+        """
+        async with self._lock:
+            added = []
+            page = self.deepest_page + 1
+            while not self.exhausted and page <= self.max_pages:
+                window = await self._fetch_window(page)
+                page += len(window)
+                exhausted = False
+                for items in window:
+                    if not items:
+                        exhausted = True
+                        break
+                    for item in items:
+                        if item.get("ticket") not in self.trades:
+                            self.trades[item["ticket"]] = item
+                            self.tickets.append(item["ticket"])
+                            added.append(item)
+                self.deepest_page = page - 1
+                self.exhausted = exhausted
+                if exhausted or (ticket is not None and ticket in self.trades):
+                    break
+            self._persist(added, newest=False)
+            return len(added)
+
+    async def get(self, ticket):
+        """Look a trade up by ticket, syncing and backfilling only on a miss."""
+        trade = self.trades.get(ticket)
+        if trade is not None:
+            return trade
+        await self.sync()
+        trade = self.trades.get(ticket)
+        if trade is None:
+            await self.backfill(ticket)
+            trade = self.trades.get(ticket)
+        return trade
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
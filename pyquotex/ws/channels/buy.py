@@ -9,11 +9,16 @@ class Buy(Base):
 
     name = "buy"
 
-    def __call__(self, price, asset, direction, duration, request_id, is_fast_option):
+    def __call__(self, price, asset, direction, duration, request_id, is_fast_option, armed=False):
+        """Send an order to the Quotex buy websocket channel.
+
+        :param armed: When the asset was pre-armed with :meth:`Quotex.arm_order`,
+            the chart settings are already stored and only `orders/open` is sent.
+        """
         option_type = 1
 
         expiration_time = get_expiration_time_quotex(
-            int(time.time()),
+            int(self.api.timesync.now_server()),
             duration
         )
         expiration = expiration_time
@@ -26,12 +31,13 @@ class Buy(Base):
             print(f"{duration}s duration is not allowed for this type of operation, except for OTC assets. "
                   f"60 seconds will be added to meet Quotex requirements.")
 
-        self.api.settings_apply(
-            asset,
-            expiration,
-            is_fast_option=is_fast_option,
-            end_time=expiration_time,
-        )
+        if not armed:
+            self.api.settings_apply(
+                asset,
+                expiration,
+                is_fast_option=is_fast_option,
+                end_time=expiration_time,
+            )
 
         payload = {
             "asset": asset,
@@ -44,9 +50,9 @@ class Buy(Base):
             "optionType": option_type
         }
 
-        data = f'42["tick"]'
-        self.send_websocket_request(data)
-
         data = f'42["orders/open",{json.dumps(payload)}]'
-        print(data)
+        if not armed:
+            self.send_websocket_request(f'42["tick"]')
+            print(data)
+        self.api.order_sent(request_id, time.perf_counter(), time.time())
         self.send_websocket_request(data)
@@ -4,9 +4,21 @@ import time
 import logging
 import websocket
 from .. import global_value
+from ..utils.metrics import REGISTRY
+from ..utils.tracing import TRACER
+from .state import CLOSED, OPEN, AUTHORIZED, READY, REJECTED
 
 logger = logging.getLogger(__name__)
 
+# Timing every frame would cost more than handling a tick, one in 16 is timed.
+FRAME_SAMPLE_MASK = 15
+FRAME_SECONDS = REGISTRY.histogram(
+    "pyquotex_ws_frame_seconds",
+    "Time spent handling one websocket frame in on_message, sampled 1 in 16.",
+    buckets=(0.000005, 0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.005, 0.025, 0.1)
+)
+TICKS = REGISTRY.counter("pyquotex_ticks_total", "Price ticks received per asset.", ("asset",))
+
 
 class WebsocketClient(object):
     """Class for work with Quotex API websocket."""
@@ -18,6 +30,11 @@ class WebsocketClient(object):
         trace_ws: Enables and disable `enableTrace` in WebSocket Client.
         """
         self.api = api
+        # Wall clock stamping received frames, swapped for the recorded time on replay.
+        self.clock = time.time
+        self._last_tick_second = None
+        self._frames = 0
+        self._tick_counters = {}
         self.headers = {
             "User-Agent": self.api.session_data.get("user_agent"),
             "Origin": self.api.https_url,
@@ -40,17 +57,30 @@ class WebsocketClient(object):
     def on_message(self, wss, message):
         """Method to process websocket messages."""
         global_value.ssl_Mutual_exclusion = True
-        current_time = time.localtime()
-        if current_time.tm_sec in [0, 5, 10, 15, 20, 30, 40, 50]:
+        self._frames += 1
+        timed = not self._frames & FRAME_SAMPLE_MASK
+        if timed:
+            started = time.perf_counter()
+        # Only binary frames can be ticks, placeholders are never sampled.
+        trace = TRACER.start(time.perf_counter()) if TRACER.enabled and not isinstance(message, str) else None
+        received_at = self.clock()
+        if self.api.journal is not None:
+            self.api.journal.append(message, received_at)
+        second = int(received_at)
+        if second != self._last_tick_second and second % 60 in (0, 5, 10, 15, 20, 30, 40, 50):
+            self._last_tick_second = second
             self.wss.send('42["tick"]')
         try:
             if "authorization/reject" in str(message):
                 print("Token rejected, making automatic reconnection.")
                 logger.debug("Token rejected, making automatic reconnection.")
                 global_value.check_rejected_connection = 1
+                self.api.state.transition(REJECTED)
             elif "s_authorization" in str(message):
                 global_value.check_accepted_connection = 1
                 global_value.check_rejected_connection = 0
+                self.api.subscriptions.on_authorized(self.api)
+                self.api.state.transition(AUTHORIZED)
             elif "instruments/list" in str(message):
                 global_value.started_listen_instruments = True
 
@@ -58,9 +88,14 @@ class WebsocketClient(object):
                 message = message[1:].decode()
                 logger.debug(message)
                 message = json.loads(message)
+                if trace is not None:
+                    trace.mark("parse")
                 self.api.wss_message = message
                 if "call" in str(message) or 'put' in str(message):
+                    self.api.catalog.reconcile(message)
                     self.api.instruments = message
+                    if self.api.state.state == AUTHORIZED:
+                        self.api.state.transition(READY)
                 if isinstance(message, dict):
                     if message.get("signals"):
                         time_in = message.get("time")
@@ -77,6 +112,7 @@ class WebsocketClient(object):
                                 self.api.signal_data[i[0]][time_in]["duration"] = i[1][0][0]
                     elif message.get("liveBalance") or message.get("demoBalance"):
                         self.api.account_balance = message
+                        self.api.profile_cache.invalidate()
                     elif message.get("position"):
                         self.api.top_list_leader = message
                     elif len(message) == 1 and message.get("profit", -1) > -1:
@@ -90,14 +126,25 @@ class WebsocketClient(object):
                     elif message.get("id") and not message.get("ticket"):
                         self.api.buy_successful = message
                         self.api.buy_id = message["id"]
+                        waiter = self.api.resolve_order_waiter(message)
+                        self.api.deals.open(message)
+                        # Only an ack matched by its requestId bounds that order's round trip.
+                        if (
+                            message.get("openTimestamp") and waiter is not None
+                            and waiter["sent_time"] and waiter["request_id"] == message.get("requestId")
+                        ):
+                            self.api.timesync.add_sample(
+                                message["openTimestamp"],
+                                waiter["sent_time"],
+                                received_at
+                            )
                         self.api.timesync.server_timestamp = message.get("closeTimestamp")
                     elif message.get("ticket") and not message.get("id"):
                         self.api.sold_options_respond = message
                     elif message.get("deals"):
                         for get_m in message["deals"]:
                             self.api.profit_in_operation = get_m["profit"]
-                            get_m["win"] = True if message["profit"] > 0 else False
-                            get_m["game_state"] = 1
+                            self.api.deals.close(get_m)
                             self.api.listinfodata.set(
                                 get_m["win"],
                                 get_m["game_state"],
@@ -105,11 +152,13 @@ class WebsocketClient(object):
                             )
                     elif message.get("isDemo") and message.get("balance"):
                         self.api.training_balance_edit_request = message
+                        self.api.profile_cache.invalidate()
                     elif message.get("error"):
                         global_value.websocket_error_reason = message.get("error")
                         global_value.check_websocket_if_error = True
                         if global_value.websocket_error_reason == "not_money":
                             self.api.account_balance = {"liveBalance": 0}
+                        self.api.resolve_order_waiter(None)
                     elif not message.get("list") == []:
                         self.api.wss_message = message
             except:
@@ -118,6 +167,7 @@ class WebsocketClient(object):
             if str(message) == "41":
                 logger.info("Disconnection event triggered by the platform, causing automatic reconnection.")
                 global_value.check_websocket_if_connect = 0
+                self.api.state.transition(CLOSED, "Disconnected by the platform.")
             if "51-" in str(message):
                 self.api._temp_status = str(message)
             elif self.api._temp_status == """451-["settings/list",{"_placeholder":true,"num":0}]""":
@@ -140,7 +190,21 @@ class WebsocketClient(object):
                     "time": message[0][1],
                     "price": message[0][2]
                 }
+                if trace is not None:
+                    trace.asset = message[0][0]
+                    trace.mark("dispatch")
+                    result["trace"] = trace
                 self.api.realtime_price[message[0][0]].append(result)
+                counter = self._tick_counters.get(message[0][0])
+                if counter is None:
+                    counter = self._tick_counters[message[0][0]] = TICKS.labels(message[0][0])
+                counter.value += 1
+                for listener in self.api.tick_listeners:
+                    try:
+                        listener(message[0][0], message[0][1], message[0][2])
+                    except Exception as e:
+                        logger.error(f"Tick listener failed: {e}")
+                self.api.timesync.add_push(message[0][1], received_at)
                 self.api.realtime_candles[self.api.current_asset] = message[0]
                 #print(self.api.realtime_candles)
             elif len(message[0]) == 2:
@@ -154,6 +218,8 @@ class WebsocketClient(object):
                     self.api.realtime_sentiment[i[0]] = result
         except:
             pass
+        if timed:
+            FRAME_SECONDS.observe(time.perf_counter() - started)
         global_value.ssl_Mutual_exclusion = False
 
     def on_error(self, wss, error):
@@ -161,11 +227,13 @@ class WebsocketClient(object):
         logger.error(error)
         global_value.websocket_error_reason = str(error)
         global_value.check_websocket_if_error = True
+        self.api.state.transition(CLOSED, str(error))
 
     def on_open(self, wss):
         """Method to process websocket open."""
         logger.info("Websocket client connected.")
         global_value.check_websocket_if_connect = 1
+        self.api.state.transition(OPEN)
         asset_name = self.api.current_asset
         period = self.api.current_period
         self.wss.send('42["tick"]')
@@ -181,6 +249,8 @@ class WebsocketClient(object):
         """Method to process websocket close."""
         logger.info("Websocket connection closed.")
         global_value.check_websocket_if_connect = 0
+        self.api.subscriptions.on_disconnected(self.api)
+        self.api.state.transition(CLOSED, close_msg or None)
 
     def on_ping(self, wss, ping_msg):
         pass
@@ -0,0 +1,200 @@
+"""Module for Quotex instrument catalog websocket object."""
+import os
+import gzip
+import json
+import time
+import asyncio
+import logging
+import threading
+from pyquotex.ws.objects.base import Base
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_VERSION = 1
+
+# Positions in an ``instruments/list`` row.
+ID = 0
+SYMBOL = 1
+NAME = 2
+PAYMENT = 5
+OPEN = 14
+TURBO_PAYMENT = 18
+
+
+def _put(queue, diff):
+    try:
+        queue.put_nowait(diff)
+    except asyncio.QueueFull:
+        pass
+
+
+class InstrumentCatalog(Base):
+    """The latest ``instruments/list``, persisted so lookups work before it arrives.
+
+    At start the catalog is filled from a gzipped snapshot of the previous
+    run (or any plain instruments dump such as ``all_instruments.json``).
+    Every live list is reconciled against it: only rows that were added,
+    removed or changed produce a diff, pushed to the subscribers, and the
+    snapshot is rewritten at most every `save_interval` seconds.
+    """
+
+    def __init__(self, path=None, save_interval=60, queue_size=100):
+        """
+        :param path: (optional) Snapshot file, nothing is persisted without it.
+        :param float save_interval: Seconds between two snapshot writes.
+        :param int queue_size: Diffs buffered per subscriber before dropping.
+        """
+        super().__init__()
+        self.__name = "instrumentCatalog"
+        self.path = path
+        self.save_interval = save_interval
+        self.queue_size = queue_size
+        self.source = None
+        self.updated_at = None
+        self.saved_at = 0.0
+        self._rows = {}
+        self._list = []
+        self._dirty = False
+        self._subscribers = []
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __contains__(self, symbol):
+        return symbol in self._rows
+
+    @property
+    def is_live(self):
+        return self.source == "live"
+
+    def rows(self):
+        """All rows, in the order of the last list."""
+        return self._list
+
+    def get(self, symbol):
+        """The row of `symbol`, None if unknown."""
+        return self._rows.get(symbol)
+
+    def load(self, path=None):
+        """Fill the catalog from a snapshot or a plain instruments dump.
+
+        :returns: The number of rows loaded, 0 when the file is missing or unreadable.
+        """
+        path = path or self.path
+        if not path or not os.path.exists(path):
+            return 0
+        try:
+            with open(path, "rb") as f:
+                raw = f.read()
+            if raw[:2] == b"\x1f\x8b":
+                raw = gzip.decompress(raw)
+            data = json.loads(raw)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring instrument snapshot {path}: {e}")
+            return 0
+        rows = data.get("rows", []) if isinstance(data, dict) else data
+        if not self.valid(rows):
+            return 0
+        with self._lock:
+            if self.is_live:
+                return 0
+            self._set(rows)
+            self.source = "snapshot"
+            self.updated_at = data.get("saved_at") if isinstance(data, dict) else os.path.getmtime(path)
+        return len(rows)
+
+    @staticmethod
+    def valid(rows):
+        return isinstance(rows, list) and all(isinstance(r, list) and len(r) > OPEN for r in rows)
+
+    def _set(self, rows):
+        self._list = rows
+        self._rows = {row[SYMBOL]: row for row in rows}
+
+    def reconcile(self, rows):
+        """Replace the catalog with a live list.
+
+        :param list rows: The ``instruments/list`` payload.
+        :returns: The diff ``{"added": [row], "removed": [symbol],
+            "changed": {symbol: {index: [old, new]}}}``, None if nothing changed.
+        """
+        if not self.valid(rows):
+            return None
+        added, changed = [], {}
+        with self._lock:
+            previous = self._rows
+            for row in rows:
+                old = previous.get(row[SYMBOL])
+                if old is None:
+                    added.append(row)
+                elif old != row:
+                    fields = {
+                        i: [old[i] if i < len(old) else None, value]
+                        for i, value in enumerate(row) if i >= len(old) or old[i] != value
+                    }
+                    changed[row[SYMBOL]] = fields
+            self._set(rows)
+            removed = [symbol for symbol in previous if symbol not in self._rows]
+            self.source = "live"
+            self.updated_at = time.time()
+            diff = None
+            if added or removed or changed:
+                diff = {"added": added, "removed": removed, "changed": changed, "time": self.updated_at}
+                self._dirty = True
+            subscribers = list(self._subscribers) if diff else []
+        for loop, queue in subscribers:
+            if not loop.is_closed():
+                loop.call_soon_threadsafe(_put, queue, diff)
+        if self._dirty and time.time() - self.saved_at >= self.save_interval:
+            self.save()
+        return diff
+
+    def save(self, path=None):
+        """Write the snapshot atomically, minified and gzipped.
+
+        :returns: True if written.
+        """
+        path = path or self.path
+        if not path or not self._list:
+            return False
+        with self._lock:
+            payload = {"version": SNAPSHOT_VERSION, "saved_at": time.time(), "rows": self._list}
+            self._dirty = False
+        data = gzip.compress(json.dumps(payload, separators=(",", ":")).encode(), 6)
+        tmp = f"{path}.tmp"
+        try:
+            with open(tmp, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except OSError as e:
+            logger.warning(f"Could not save instrument snapshot {path}: {e}")
+            self._dirty = True
+            return False
+        self.saved_at = payload["saved_at"]
+        return True
+
+    def flush(self):
+        """Save pending changes now, e.g. on shutdown."""
+        if self._dirty:
+            self.save()
+
+    def subscribe(self):
+        """Get a queue receiving every catalog diff from now on."""
+        queue = asyncio.Queue(self.queue_size)
+        with self._lock:
+            self._subscribers.append((asyncio.get_running_loop(), queue))
+        return queue
+
+    def unsubscribe(self, queue):
+        with self._lock:
+            self._subscribers = [s for s in self._subscribers if s[1] is not queue]
+
+    async def stream(self):
+        """Async iterator over catalog diffs."""
+        queue = self.subscribe()
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            self.unsubscribe(queue)
@@ -0,0 +1,148 @@
+"""Module for Quotex deal tracker websocket object."""
+import asyncio
+import threading
+from collections import OrderedDict
+from pyquotex.ws.objects.base import Base
+
+
+def _resolve(future, deal):
+    if not future.done():
+        future.set_result(deal)
+
+
+def _put(queue, deal):
+    try:
+        queue.put_nowait(deal)
+    except asyncio.QueueFull:
+        pass
+
+
+class DealTracker(Base):
+    """Track open positions and push their results when they close.
+
+    The websocket thread calls `open` on every order ack and `close` on every
+    deals frame; waiters get a per-ticket future and subscribers an
+    :class:`asyncio.Queue`, both resolved with ``call_soon_threadsafe``, so
+    waiting on any number of positions costs no polling.
+    """
+
+    def __init__(self, max_open=1000, max_closed=1000, queue_size=1000):
+        """
+        :param int max_open: Open positions kept, the oldest are dropped first.
+        :param int max_closed: Closed deals kept for late `wait` calls.
+        :param int queue_size: Events buffered per subscriber before dropping.
+        """
+        super().__init__()
+        self.__name = "dealTracker"
+        self.max_open = max_open
+        self.max_closed = max_closed
+        self.queue_size = queue_size
+        self.open_positions = OrderedDict()
+        self.closed_deals = OrderedDict()
+        self.realized_pnl = 0.0
+        self._waiters = {}
+        self._subscribers = []
+        self._lock = threading.Lock()
+
+    def open(self, ack):
+        """Record a position from an order ack.
+
+        :param dict ack: The ``s_orders/open`` payload.
+        """
+        position = {
+            "id": ack["id"],
+            "asset": ack.get("asset"),
+            "amount": ack.get("amount"),
+            "command": ack.get("command"),
+            "open_timestamp": ack.get("openTimestamp"),
+            "close_timestamp": ack.get("closeTimestamp"),
+            "request_id": ack.get("requestId"),
+        }
+        with self._lock:
+            self.open_positions[ack["id"]] = position
+            while len(self.open_positions) > self.max_open:
+                self.open_positions.popitem(last=False)
+
+    def close(self, deal):
+        """Settle a position from an entry of a deals frame.
+
+        :param dict deal: One item of ``message["deals"]``.
+        :returns: The deal with `win` and `game_state` filled in.
+        """
+        deal["win"] = deal.get("profit", 0) > 0
+        deal["game_state"] = 1
+        with self._lock:
+            position = self.open_positions.pop(deal["id"], None)
+            if position is not None:
+                deal.setdefault("asset", position["asset"])
+                deal.setdefault("amount", position["amount"])
+            self.closed_deals[deal["id"]] = deal
+            while len(self.closed_deals) > self.max_closed:
+                self.closed_deals.popitem(last=False)
+            self.realized_pnl += deal.get("profit", 0)
+            future = self._waiters.pop(deal["id"], None)
+            subscribers = list(self._subscribers)
+        if future is not None and not future.get_loop().is_closed():
+            future.get_loop().call_soon_threadsafe(_resolve, future, deal)
+        for loop, queue in subscribers:
+            if not loop.is_closed():
+                loop.call_soon_threadsafe(_put, queue, deal)
+        return deal
+
+    def wait(self, deal_id):
+        """Get a future resolved with the deal once it closes.
+
+        :param deal_id: The id of the order ack.
+        :returns: An :class:`asyncio.Future` bound to the running loop.
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            deal = self.closed_deals.get(deal_id)
+            future = self._waiters.get(deal_id)
+            if deal is None and future is None:
+                future = loop.create_future()
+                self._waiters[deal_id] = future
+        if deal is not None:
+            future = loop.create_future()
+            future.set_result(deal)
+        return future
+
+    def forget(self, deal_id):
+        with self._lock:
+            self._waiters.pop(deal_id, None)
+            self.closed_deals.pop(deal_id, None)
+
+    def subscribe(self):
+        """Get a queue receiving every closed deal from now on."""
+        queue = asyncio.Queue(self.queue_size)
+        with self._lock:
+            self._subscribers.append((asyncio.get_running_loop(), queue))
+        return queue
+
+    def unsubscribe(self, queue):
+        with self._lock:
+            self._subscribers = [s for s in self._subscribers if s[1] is not queue]
+
+    async def stream(self):
+        """Async iterator over closed deals."""
+        queue = self.subscribe()
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            self.unsubscribe(queue)
+
+    def get_position(self, deal_id):
+        return self.open_positions.get(deal_id)
+
+    def next_expiring(self):
+        """Get the open position with the earliest expected close time."""
+        with self._lock:
+            positions = [p for p in self.open_positions.values() if p["close_timestamp"]]
+        return min(positions, key=lambda p: p["close_timestamp"], default=None)
+
+    @property
+    def exposure(self):
+        """Sum of the amounts of the open positions."""
+        with self._lock:
+            return sum(p["amount"] or 0 for p in self.open_positions.values())
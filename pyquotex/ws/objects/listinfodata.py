@@ -1,24 +1,28 @@
 """Module for Quotex Candles websocket object."""
 
+from collections import OrderedDict
 from pyquotex.ws.objects.base import Base
 
 
 class ListInfoData(Base):
     """Class for Quotex Candles websocket object."""
 
-    def __init__(self):
+    def __init__(self, maxlen=1000):
         super(ListInfoData, self).__init__()
         self.__name = "listInfoData"
-        self.listinfodata_dict = {}
+        self.maxlen = maxlen
+        self.listinfodata_dict = OrderedDict()
 
     def set(self, win, game_state, id_number):
         self.listinfodata_dict[id_number] = {
             "win": win,
             "game_state": game_state
         }
+        while len(self.listinfodata_dict) > self.maxlen:
+            self.listinfodata_dict.popitem(last=False)
 
     def delete(self, id_number):
-        del self.listinfodata_dict[id_number]
+        self.listinfodata_dict.pop(id_number, None)
 
     def get(self, id_number):
         return self.listinfodata_dict.get(id_number)
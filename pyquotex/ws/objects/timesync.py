@@ -1,15 +1,42 @@
 import time
 import datetime
+from collections import deque
 from pyquotex.ws.objects.base import Base
 
+INF = float("inf")
+
+
 class TimeSync(Base):
-    """Class to manage time synchronization for Quotex WebSocket."""
+    """Class to manage time synchronization for Quotex WebSocket.
+
+    Besides the legacy `server_timestamp` slot, keeps a model of the server
+    clock fed by server timestamps seen on the socket. Each sample bounds the
+    offset ``server - local``:
 
-    def __init__(self):
+    * push frames (ticks) give a lower bound ``server - received``, since the
+      frame was stamped before it arrived;
+    * request/response pairs (order acks) also give an upper bound
+      ``server - sent``.
+
+    Samples are folded into fixed-width buckets keeping the tightest bounds,
+    which is the min-delay (min-RTT) filter. Drift is the least-squares slope
+    of the bucket lower bounds, and the offset is the middle of the
+    intersected bounds projected to the reference time.
+    """
+
+    def __init__(self, bucket_seconds=10, window_buckets=30, max_drift=5e-4):
         super().__init__()
         self.__name = "timeSync"
         self.__server_timestamp = time.time()
         self.__expiration_time_minutes = 1
+        self.__bucket_seconds = bucket_seconds
+        self.__max_drift = max_drift
+        self.__buckets = deque(maxlen=window_buckets)
+        self.__current = None
+        # (reference local time, offset at reference, drift, error bound)
+        self.__model = (time.time(), 0.0, 0.0, INF)
+        self.__dirty = False
+        self.samples = 0
 
     @property
     def server_timestamp(self):
@@ -71,3 +98,103 @@ class TimeSync(Base):
         """
         return time.mktime(self.expiration_datetime.timetuple())
 
+    def add_push(self, server_time, received_at=None):
+        """Feed a server timestamp carried by a pushed frame.
+
+        :param float server_time: The server timestamp in the frame.
+        :param float received_at: Local wall time the frame was received.
+        """
+        if received_at is None:
+            received_at = time.time()
+        self.__fold(received_at, server_time - received_at, INF)
+
+    def add_sample(self, server_time, sent_at, received_at=None):
+        """Feed a request/response sample, e.g. an order and its ack.
+
+        :param float server_time: The server timestamp in the response.
+        :param float sent_at: Local wall time the request was sent.
+        :param float received_at: Local wall time the response was received.
+        """
+        if received_at is None:
+            received_at = time.time()
+        if received_at < sent_at:
+            return
+        self.__fold(received_at, server_time - received_at, server_time - sent_at)
+        self.__update()
+
+    def __fold(self, local_time, low, high):
+        self.samples += 1
+        start = local_time - local_time % self.__bucket_seconds
+        current = self.__current
+        if current is not None and current[0] == start:
+            if low > current[1]:
+                current[1] = low
+                self.__dirty = True
+            if high < current[2]:
+                current[2] = high
+                self.__dirty = True
+            return
+        self.__current = [start, low, high]
+        self.__buckets.append(self.__current)
+        self.__update()
+
+    def __update(self):
+        self.__dirty = False
+        buckets = list(self.__buckets)
+        if not buckets:
+            return
+        reference = buckets[-1][0] + self.__bucket_seconds / 2
+        drift = 0.0
+        if len(buckets) >= 3:
+            xs = [b[0] - reference for b in buckets]
+            ys = [b[1] for b in buckets]
+            mean_x = sum(xs) / len(xs)
+            mean_y = sum(ys) / len(ys)
+            var_x = sum((x - mean_x) ** 2 for x in xs)
+            if var_x:
+                slope = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / var_x
+                if abs(slope) <= self.__max_drift:
+                    drift = slope
+        low = max(b[1] - drift * (b[0] - reference) for b in buckets)
+        high = min(b[2] - drift * (b[0] - reference) for b in buckets)
+        if high == INF:
+            offset, error = low, INF
+        elif high >= low:
+            offset, error = (low + high) / 2, (high - low) / 2
+        else:
+            # Bounds disagree (e.g. a stale ack); trust the tighter lower envelope.
+            offset, error = low, low - high
+        self.__model = (reference, offset, drift, error)
+
+    @property
+    def offset(self):
+        """Current estimate of ``server - local`` in seconds."""
+        reference, offset, drift, _ = self.__current_model()
+        return offset + drift * (time.time() - reference)
+
+    @property
+    def drift(self):
+        """Estimated drift of the server clock against the local one, in s/s."""
+        return self.__current_model()[2]
+
+    @property
+    def error_bound(self):
+        """Half-width of the offset interval in seconds.
+
+        Infinite until a request/response sample bounds the offset from above.
+        """
+        return self.__current_model()[3]
+
+    def __current_model(self):
+        if self.__dirty:
+            self.__update()
+        return self.__model
+
+    def now_server(self):
+        """Get the current server time from the clock model.
+
+        :returns: The estimated server UNIX timestamp in seconds.
+        """
+        now = time.time()
+        reference, offset, drift, _ = self.__current_model()
+        return now + offset + drift * (now - reference)
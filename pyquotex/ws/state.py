@@ -0,0 +1,121 @@
+"""Module for the Quotex websocket connection state."""
+import time
+import asyncio
+import logging
+import threading
+
+from ..utils.metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+CONNECTING = "connecting"
+OPEN = "open"
+AUTHORIZED = "authorized"
+READY = "ready"
+REJECTED = "rejected"
+
+# Progress of a healthy connection; CLOSED and REJECTED end a wait early.
+PHASES = (CONNECTING, OPEN, AUTHORIZED, READY)
+FAILURES = (CLOSED, REJECTED)
+
+PHASE_SECONDS = REGISTRY.histogram(
+    "pyquotex_connect_phase_seconds",
+    "Time spent reaching each connection state from the previous one.",
+    ("state",),
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+)
+
+
+def _rank(state):
+    return PHASES.index(state) if state in PHASES else -1
+
+
+class ConnectionState(object):
+    """connecting → open → authorized → ready, with awaitable transitions.
+
+    The websocket thread reports every step through :meth:`transition`;
+    coroutines block in :meth:`wait` until a state is reached or the
+    connection fails, instead of polling flags. Each step is timed from the
+    previous one into :data:`PHASE_SECONDS`, and :attr:`timings` keeps the
+    offsets of the current attempt from its start.
+    """
+
+    def __init__(self):
+        self.state = CLOSED
+        self.reason = None
+        self.timings = {}
+        self.loop = None
+        self._started = None
+        self._entered = None
+        self._waiters = []
+        self._lock = threading.Lock()
+
+    def bind(self, loop):
+        """Resolve waiters on `loop`, the one awaiting the connection."""
+        self.loop = loop
+
+    def reached(self, target):
+        """Whether the connection got at least to `target`."""
+        return _rank(self.state) >= _rank(target) >= 0
+
+    def transition(self, state, reason=None):
+        """Move to `state`. Safe to call from any thread.
+
+        :param str state: One of the module states.
+        :param str reason: (optional) Why, for failures.
+        """
+        now = time.perf_counter()
+        with self._lock:
+            previous = self.state
+            if state == previous:
+                return
+            self.state = state
+            self.reason = reason
+            if state == CONNECTING:
+                self._started = now
+                self.timings = {}
+            elif self._entered is not None and state not in FAILURES:
+                PHASE_SECONDS.labels(state).observe(now - self._entered)
+            self._entered = now
+            if self._started is not None:
+                self.timings[state] = now - self._started
+        logger.debug(f"Connection {previous} -> {state}" + (f" ({reason})" if reason else ""))
+        loop = self.loop
+        if loop is None or loop.is_closed():
+            return
+        loop.call_soon_threadsafe(self._wake, state)
+
+    def _wake(self, state):
+        # Waiters stay registered until they are met, and are checked against
+        # the current state too: a later transition may already have run.
+        with self._lock:
+            current = self.state
+            pending = []
+            for target, future in self._waiters:
+                if future.done():
+                    continue
+                ended = next((
+                    s for s in (state, current)
+                    if _rank(s) >= _rank(target) >= 0 or s in FAILURES
+                ), None)
+                if ended is None:
+                    pending.append((target, future))
+                else:
+                    future.set_result(ended)
+            self._waiters = pending
+
+    async def wait(self, target, timeout=None):
+        """Wait until `target` is reached or the connection fails.
+
+        :returns: The state that ended the wait, None after `timeout` seconds.
+        """
+        with self._lock:
+            if self.reached(target) or self.state in FAILURES:
+                return self.state
+            future = asyncio.get_running_loop().create_future()
+            self._waiters.append((target, future))
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            return None
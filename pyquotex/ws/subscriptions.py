@@ -0,0 +1,233 @@
+"""Module for Quotex websocket subscription bookkeeping."""
+import json
+import time
+import logging
+import threading
+from collections import OrderedDict, defaultdict
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_OWNER = "default"
+
+
+class SubscriptionManager(object):
+    """Reference-counted registry of live (asset, period) streams.
+
+    Every consumer names itself as `owner`; an asset is unsubscribed only once
+    no owner needs it anymore, and repeated requests from the same owner are
+    idempotent. Frames go through a deduplicating queue drained by a sender
+    thread at `rate` frames per second, and the whole live set is replayed
+    each time the socket is authorized again.
+    """
+
+    def __init__(self, api=None, rate=30, burst=15):
+        """
+        :param api: The instance of :class:`QuotexAPI <pyquotex.api.QuotexAPI>`.
+        :param float rate: Frames sent per second at most.
+        :param int burst: Frames sent back to back before pacing kicks in.
+        """
+        self.api = api
+        self.rate = rate
+        self.burst = burst
+        self.interests = defaultdict(set)
+        self.frames_sent = 0
+        self.frames_deduped = 0
+        self.replays = 0
+        self.resubscribe_seconds = None
+        self._pending = OrderedDict()
+        self._sent_assets = set()
+        self._unsubscribing = set()
+        self._connected = False
+        self._disconnected_at = None
+        self._replay_started = None
+        self._cond = threading.Condition()
+        self._thread = None
+
+    def bind(self, api):
+        """Point the manager at a new :class:`QuotexAPI <pyquotex.api.QuotexAPI>`."""
+        with self._cond:
+            self.api = api
+            self._connected = False
+            for asset in self.assets():
+                api.realtime_price.setdefault(asset, [])
+                api.realtime_candles.setdefault(asset, {})
+
+    def assets(self):
+        """Assets with at least one live interest."""
+        return {asset for asset, _ in self.interests}
+
+    def live(self):
+        """The live set as ``{(asset, period): owners}``."""
+        with self._cond:
+            return {key: set(owners) for key, owners in self.interests.items()}
+
+    def _has_asset(self, asset):
+        return any(key[0] == asset for key in self.interests)
+
+    @staticmethod
+    def _subscribe_frames(asset, period):
+        return [
+            f'42["instruments/update", {json.dumps({"asset": asset, "period": period})}]',
+            f'42["chart_notification/get", {json.dumps({"asset": asset, "version": "1.0.0"})}]',
+            f'42["depth/follow", {json.dumps(asset)}]',
+        ]
+
+    @staticmethod
+    def _unsubscribe_frames(asset):
+        return [
+            f'42["subfor", {json.dumps(asset)}]',
+            f'42["depth/unfollow", {json.dumps(asset)}]',
+        ]
+
+    def _queue(self, frames, asset, kind):
+        for frame in frames:
+            if frame in self._pending:
+                self.frames_deduped += 1
+                continue
+            self._pending[frame] = (asset, kind)
+        self._cond.notify()
+
+    def _drop_pending(self, asset, kind):
+        dropped = [f for f, tag in self._pending.items() if tag == (asset, kind)]
+        for frame in dropped:
+            del self._pending[frame]
+        self.frames_deduped += len(dropped)
+        return dropped
+
+    def acquire(self, asset, period=0, owner=DEFAULT_OWNER):
+        """Register `owner`'s interest in (asset, period).
+
+        :returns: True when new frames had to be queued.
+        """
+        with self._cond:
+            key = (asset, period)
+            owners = self.interests[key]
+            if owner in owners:
+                return False
+            new_key = not owners
+            owners.add(owner)
+            if not new_key:
+                return False
+            dropped = self._drop_pending(asset, "unsubscribe")
+            if asset in self._unsubscribing:
+                # The sender already took the unsubscribe frames, follow it again.
+                frames = self._subscribe_frames(asset, period)
+            elif dropped or asset in self._sent_assets:
+                # Still followed on the server, only the period is new.
+                frames = self._subscribe_frames(asset, period)[:1]
+            else:
+                frames = self._subscribe_frames(asset, period)
+            self._queue(frames, asset, "subscribe")
+            self._ensure_sender()
+            return True
+
+    def release(self, asset, period=None, owner=DEFAULT_OWNER):
+        """Drop `owner`'s interest in `asset`, for one period or all of them.
+
+        :returns: True when the asset is no longer needed by anyone.
+        """
+        with self._cond:
+            keys = [k for k in self.interests if k[0] == asset and (period is None or k[1] == period)]
+            for key in keys:
+                self.interests[key].discard(owner)
+                if not self.interests[key]:
+                    del self.interests[key]
+            if self._has_asset(asset):
+                return False
+            self._drop_pending(asset, "subscribe")
+            if asset in self._sent_assets:
+                self._queue(self._unsubscribe_frames(asset), asset, "unsubscribe")
+                self._ensure_sender()
+            return True
+
+    def replay(self):
+        """Queue the whole live set again, e.g. after the socket was reopened."""
+        with self._cond:
+            self._pending.clear()
+            self._sent_assets.clear()
+            self._unsubscribing.clear()
+            followed = set()
+            for asset, period in self.interests:
+                frames = self._subscribe_frames(asset, period)
+                if asset in followed:
+                    frames = frames[:1]
+                followed.add(asset)
+                self._queue(frames, asset, "subscribe")
+            if self._pending:
+                self.replays += 1
+                self._replay_started = time.perf_counter()
+                self._ensure_sender()
+
+    def on_authorized(self, api):
+        """Called from the websocket thread when `api`'s socket is authorized."""
+        if api is not self.api:
+            return
+        with self._cond:
+            self._connected = True
+        self.replay()
+
+    def on_disconnected(self, api):
+        """Called from the websocket thread when `api`'s socket is closed."""
+        if api is not self.api:
+            return
+        with self._cond:
+            self._connected = False
+            self._disconnected_at = time.perf_counter()
+
+    def stats(self):
+        with self._cond:
+            return {
+                "interests": len(self.interests),
+                "assets": len(self.assets()),
+                "pending_frames": len(self._pending),
+                "frames_sent": self.frames_sent,
+                "frames_deduped": self.frames_deduped,
+                "replays": self.replays,
+                "resubscribe_seconds": self.resubscribe_seconds,
+            }
+
+    def _ensure_sender(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._send_loop, daemon=True)
+            self._thread.start()
+
+    def _send_loop(self):
+        interval = 1.0 / self.rate
+        while True:
+            with self._cond:
+                while not (self._pending and self._connected):
+                    self._cond.wait()
+                batch = []
+                while self._pending and len(batch) < self.burst:
+                    batch.append(self._pending.popitem(last=False))
+                unsubscribing = {asset for _, (asset, kind) in batch if kind == "unsubscribe"}
+                self._unsubscribing |= unsubscribing
+                api = self.api
+            sent = 0
+            for frame, (asset, kind) in batch:
+                try:
+                    api.send_websocket_request(frame)
+                except Exception as e:
+                    logger.debug(f"Subscription frame not sent: {e}")
+                    break
+                sent += 1
+                with self._cond:
+                    if kind == "subscribe":
+                        self._sent_assets.add(asset)
+                    else:
+                        self._sent_assets.discard(asset)
+            with self._cond:
+                self.frames_sent += sent
+                self._unsubscribing -= unsubscribing
+                for frame, tag in reversed(batch[sent:]):
+                    if frame not in self._pending:
+                        self._pending[frame] = tag
+                        self._pending.move_to_end(frame, last=False)
+                if sent < len(batch):
+                    self._connected = False
+                elif not self._pending and self._replay_started is not None:
+                    started = self._disconnected_at or self._replay_started
+                    self.resubscribe_seconds = time.perf_counter() - started
+                    self._replay_started = None
+                    self._disconnected_at = None
+            time.sleep(sent * interval)
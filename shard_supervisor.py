@@ -0,0 +1,547 @@
+"""Sharded tick harvester: one supervisor, N broker connections.
+
+The open assets are split across worker processes, each logged in with its
+own session directory (``sessions/shard-N``) and its own ``QuotexAPI``, so
+no single websocket or event loop carries the whole universe. The workers
+send their ticks back in batches; the supervisor merges them into one
+stream ordered by server time and hands it to the API layer, as JSON lines
+on `--output`, on the `--bus` (see :mod:`pyquotex.utils.bus`) with the
+closed bars and market status changes, and through
+:meth:`Supervisor.subscribe` in-process.
+
+A worker that dies, stops reporting for `--heartbeat-timeout` seconds, or
+is not logged in `--startup-timeout` seconds after its start, has its
+assets moved to the live workers right away and is started again after a
+backoff; once it is back the assets move home.
+
+Per-shard throughput and lag are exported on `--metrics-port`:
+``pyquotex_shard_ticks_total``, ``pyquotex_shard_tick_rate``,
+``pyquotex_shard_lag_seconds``, ``pyquotex_shard_assets``.
+
+    python shard_supervisor.py --workers 4 --bus unix:///tmp/pyquotex.sock --metrics-port 9102
+"""
+import os
+import sys
+import json
+import time
+import queue
+import random
+import signal
+import asyncio
+import logging
+import argparse
+import importlib
+import threading
+import collections
+import multiprocessing
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from pyquotex.utils import bus as pubsub
+from pyquotex.utils.metrics import REGISTRY, CONTENT_TYPE
+from pyquotex.utils.shards import assign, OrderedMerge
+from pyquotex.utils.candle_store import CandleStore
+
+logger = logging.getLogger("shard_supervisor")
+
+OWNER = "shard"
+SESSION_ROOT = "sessions"
+DEFAULT_FACTORY = "shard_supervisor:connect_quotex"
+
+TICKS = REGISTRY.counter(
+    "pyquotex_shard_ticks_total", "Ticks received from each shard.", ("shard",)
+)
+TICK_RATE = REGISTRY.gauge(
+    "pyquotex_shard_tick_rate", "Ticks per second of each shard over the last report interval.", ("shard",)
+)
+LAG = REGISTRY.gauge(
+    "pyquotex_shard_lag_seconds",
+    "Seconds between a tick's server time and its release in the merged stream.",
+    ("shard",)
+)
+ASSETS = REGISTRY.gauge("pyquotex_shard_assets", "Assets assigned to each shard.", ("shard",))
+RESTARTS = REGISTRY.counter("pyquotex_shard_restarts_total", "Worker restarts of each shard.", ("shard",))
+MERGE_PENDING = REGISTRY.gauge(
+    "pyquotex_shard_merge_pending", "Ticks held back in the merge waiting for a slower shard."
+)
+MERGE_LATE = REGISTRY.gauge(
+    "pyquotex_shard_merge_late", "Ticks released after newer ones, since the supervisor started."
+)
+
+
+def load_factory(path):
+    """Resolve a ``module:function`` client factory."""
+    module, _, name = path.partition(":")
+    return getattr(importlib.import_module(module), name)
+
+
+async def connect_quotex(shard, options):
+    """Default client factory: a Quotex logged in with the shard's own session."""
+    from pyquotex.stable_api import Quotex
+    client = Quotex(
+        email=options.get("email"),
+        password=options.get("password"),
+        root_path=os.path.join(options.get("session_root", SESSION_ROOT), f"shard-{shard}")
+    )
+    check, reason = await client.connect()
+    if not check:
+        raise ConnectionError(reason)
+    return client
+
+
+def market_of(rows):
+    """``{symbol: {"name", "open"}}`` of instrument rows."""
+    return {row[1]: {"name": row[2], "open": bool(row[14])} for row in rows}
+
+
+def run_worker(shard, options, commands, events):
+    """Process entry point of one shard."""
+    logging.basicConfig(
+        level=options.get("log_level", "INFO"),
+        format=f"%(asctime)s - shard-{shard} - %(levelname)s - %(message)s"
+    )
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    try:
+        asyncio.run(_worker(shard, options, commands, events))
+    except Exception as e:
+        logger.error(f"Shard {shard} failed: {e}")
+        events.put(("failed", shard, str(e)))
+        sys.exit(1)
+
+
+async def _worker(shard, options, commands, events):
+    client = await load_factory(options.get("client_factory", DEFAULT_FACTORY))(shard, options)
+    buffer = collections.deque()
+    # Runs on the websocket thread, so it only appends.
+    client.add_tick_listener(lambda asset, timestamp, price: buffer.append((timestamp, asset, price)))
+    diffs = client.catalog.subscribe()
+    rows = await client.get_instruments(live=True)
+    events.put(("ready", shard, os.getpid(), market_of(rows or [])))
+
+    assigned = set()
+    last_tick = float("-inf")
+    interval = options.get("flush_interval", 0.1)
+    max_delay = options.get("max_delay", 0.25)
+    period = options.get("period", 60)
+    try:
+        while True:
+            try:
+                while True:
+                    command = commands.get_nowait()
+                    if command[0] == "stop":
+                        return
+                    wanted = set(command[1])
+                    for asset in assigned - wanted:
+                        client.stop_candles_stream(asset, owner=OWNER)
+                    for asset in sorted(wanted - assigned):
+                        client.start_candles_stream(asset, period, owner=OWNER)
+                    logger.info(f"Shard {shard}: {len(wanted)} assets (+{len(wanted - assigned)} -{len(assigned - wanted)})")
+                    assigned = wanted
+            except queue.Empty:
+                pass
+
+            if not diffs.empty():
+                while not diffs.empty():
+                    diffs.get_nowait()
+                events.put(("market", shard, market_of(client.catalog.rows())))
+
+            if not await client.check_connect():
+                # The supervisor reconnects through the factory, and covers the gap meanwhile.
+                raise ConnectionError(f"connection {client.api.state.state}")
+
+            ticks = sorted(buffer.popleft() for _ in range(len(buffer)))
+            if ticks:
+                last_tick = max(last_tick, ticks[-1][0])
+            # One socket delivers in server order, so nothing older than the last
+            # tick is still coming; nor older than `max_delay` on the server clock,
+            # which keeps a shard between two ticks from stalling the merge.
+            watermark = max(last_tick, client.api.timesync.now_server() - max_delay)
+            events.put(("ticks", shard, ticks, watermark))
+            await asyncio.sleep(interval)
+    finally:
+        await client.close()
+
+
+class Supervisor(object):
+    """Starts the shard workers, keeps the assignment balanced and merges their ticks."""
+
+    def __init__(
+            self,
+            workers,
+            options=None,
+            assets=None,
+            heartbeat_timeout=15.0,
+            startup_timeout=120.0,
+            restart_backoff=5.0,
+            report_interval=10.0,
+            output=None,
+            bus=None,
+            otc_only=False,
+            period=60,
+            status_interval=60.0
+    ):
+        """
+        :param int workers: Number of shards.
+        :param dict options: Passed to every worker, see :func:`run_worker`.
+        :param assets: (optional) Fixed asset universe, otherwise the open
+            assets reported by the workers.
+        :param float heartbeat_timeout: Seconds of silence after which a ready worker is failed.
+        :param float startup_timeout: Seconds a started worker has to log in and report ready.
+        :param float restart_backoff: Base delay before a failed worker is started again.
+        :param float report_interval: Seconds between throughput updates.
+        :param output: (optional) File object receiving the merged stream as JSON lines.
+        :param bus: (optional) A started :class:`pyquotex.utils.bus.Bus` receiving
+            ticks, closed bars and market status.
+        :param bool otc_only: Only harvest OTC assets.
+        :param int period: Bar size of the published closed bars.
+        :param float status_interval: Seconds between two full market status
+            publications, for readers that joined since the last change.
+        """
+        self.workers = workers
+        self.options = options or {}
+        self.fixed_assets = sorted(assets) if assets else None
+        self.universe = self.fixed_assets or []
+        self.heartbeat_timeout = heartbeat_timeout
+        self.startup_timeout = startup_timeout
+        self.restart_backoff = restart_backoff
+        self.report_interval = report_interval
+        self.output = output
+        self.bus = bus
+        self.otc_only = otc_only
+        self.status_interval = status_interval
+        self.market = {}
+        self.candles = CandleStore(period, maxlen=2)
+        self.merge = OrderedMerge()
+        self.shards = {}
+        self.assignment = {}
+        self.released = 0
+        self._context = multiprocessing.get_context("spawn")
+        self.events = self._context.Queue()
+        self._inbox = None
+        self._subscribers = []
+        self._stopping = False
+
+    def subscribe(self, maxsize=10000):
+        """Get a queue receiving every merged ``(timestamp, shard, asset, price)`` from now on."""
+        subscriber = asyncio.Queue(maxsize)
+        self._subscribers.append(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        self._subscribers = [s for s in self._subscribers if s is not subscriber]
+
+    def live(self):
+        return sorted(s for s, shard in self.shards.items() if shard["ready"] and shard["process"].is_alive())
+
+    def start_worker(self, shard):
+        commands = self._context.Queue()
+        process = self._context.Process(
+            target=run_worker,
+            args=(shard, self.options, commands, self.events),
+            name=f"shard-{shard}",
+            daemon=True
+        )
+        process.start()
+        previous = self.shards.get(shard, {})
+        self.shards[shard] = {
+            "process": process,
+            "commands": commands,
+            "ready": False,
+            "seen": time.monotonic(),
+            "restart_at": None,
+            "failures": previous.get("failures", 0),
+            "ticks": previous.get("ticks", 0),
+            "reported": previous.get("reported", 0),
+        }
+        logger.info(f"Started shard {shard} (pid {process.pid}).")
+
+    def rebalance(self):
+        assignment = assign(self.universe, self.live())
+        for shard, assets in assignment.items():
+            if self.assignment.get(shard) != assets:
+                self.shards[shard]["commands"].put(("assign", assets))
+            ASSETS.labels(shard).set(len(assets))
+        for shard in set(self.assignment) - set(assignment):
+            ASSETS.labels(shard).set(0)
+        self.assignment = assignment
+
+    def fail(self, shard, reason):
+        state = self.shards[shard]
+        if state["restart_at"] is not None:
+            return
+        logger.warning(f"Shard {shard} failed ({reason}), moving its {len(self.assignment.get(shard, []))} assets.")
+        process = state["process"]
+        if process.is_alive():
+            process.terminate()
+        state["ready"] = False
+        state["failures"] += 1
+        # Exponential backoff with jitter, so a broker outage is not hammered.
+        delay = min(self.restart_backoff * 2 ** (state["failures"] - 1), 300)
+        state["restart_at"] = time.monotonic() + delay * random.uniform(0.5, 1.0)
+        self.merge.remove_shard(shard)
+        self.rebalance()
+
+    def handle(self, event):
+        kind, shard = event[0], event[1]
+        state = self.shards.get(shard)
+        if state is None or state["restart_at"] is not None:
+            return
+        state["seen"] = time.monotonic()
+        if kind == "ticks":
+            _, _, ticks, watermark = event
+            if ticks:
+                TICKS.labels(shard).inc(len(ticks))
+                state["ticks"] += len(ticks)
+            self.merge.push(shard, ticks, watermark)
+        elif kind == "ready":
+            _, _, pid, market = event
+            state["ready"] = True
+            state["failures"] = 0
+            self.merge.add_shard(shard)
+            self._set_market(market)
+            self.rebalance()
+        elif kind == "market":
+            self._set_market(event[2])
+            self.rebalance()
+        elif kind == "failed":
+            self.fail(shard, event[2])
+
+    def _set_market(self, market):
+        # Every shard reports the same catalog, only actual changes go out.
+        now = time.time()
+        for symbol, status in market.items():
+            if self.market.get(symbol) != status:
+                self.market[symbol] = status
+                self._publish(pubsub.MARKET_STATUS, pubsub.market_status(symbol, status["name"], status["open"], now))
+        if self.fixed_assets is None and market:
+            self.universe = sorted(
+                symbol for symbol, status in self.market.items()
+                if status["open"] and (not self.otc_only or symbol.endswith("_otc"))
+            )
+
+    def publish_market(self):
+        now = time.time()
+        for symbol, status in self.market.items():
+            self._publish(pubsub.MARKET_STATUS, pubsub.market_status(symbol, status["name"], status["open"], now))
+
+    def _publish(self, topic, data):
+        if self.bus is not None:
+            self.bus.publish(topic, data)
+
+    def _publish_ticks(self, ready):
+        store = self.candles
+        for timestamp, shard, asset, price in ready:
+            times = store.times.get(asset)
+            if times and store.bar_time(timestamp) > times[-1]:
+                closed = store.candles[asset][times[-1]]
+                self._publish(pubsub.CANDLE_CLOSE, pubsub.candle_close(asset, store.period, closed))
+            store.add_tick(asset, price, timestamp)
+            self._publish(pubsub.TICK, pubsub.tick(asset, timestamp, price, shard))
+
+    def release(self):
+        ready = self.merge.pop_ready()
+        if not ready:
+            return
+        now = time.time()
+        lags = {}
+        for tick in ready:
+            lags[tick[1]] = now - tick[0]
+            for subscriber in self._subscribers:
+                try:
+                    subscriber.put_nowait(tick)
+                except asyncio.QueueFull:
+                    pass
+        for shard, lag in lags.items():
+            LAG.labels(shard).set(lag)
+        if self.bus is not None:
+            self._publish_ticks(ready)
+        if self.output is not None:
+            self.output.write("".join(
+                json.dumps({"t": t, "asset": asset, "price": price, "shard": shard}, separators=(",", ":")) + "\n"
+                for t, shard, asset, price in ready
+            ))
+            self.output.flush()
+        self.released += len(ready)
+        MERGE_LATE.set(self.merge.late)
+
+    def check(self):
+        now = time.monotonic()
+        for shard, state in self.shards.items():
+            if state["restart_at"] is not None:
+                if now >= state["restart_at"] and not self._stopping:
+                    RESTARTS.labels(shard).inc()
+                    self.start_worker(shard)
+            elif not state["process"].is_alive():
+                self.fail(shard, f"exit code {state['process'].exitcode}")
+            elif not state["ready"]:
+                # A login with its retries takes longer than a heartbeat period.
+                if now - state["seen"] > self.startup_timeout:
+                    self.fail(shard, f"not ready after {now - state['seen']:.0f}s")
+            elif now - state["seen"] > self.heartbeat_timeout:
+                self.fail(shard, f"silent for {now - state['seen']:.0f}s")
+        MERGE_PENDING.set(len(self.merge))
+
+    def report(self, elapsed):
+        rates = []
+        for shard, state in sorted(self.shards.items()):
+            rate = (state["ticks"] - state["reported"]) / elapsed
+            state["reported"] = state["ticks"]
+            TICK_RATE.labels(shard).set(rate)
+            lag = LAG.labels(shard).get()
+            rates.append(f"{shard}: {len(self.assignment.get(shard, []))} assets {rate:.1f}/s lag {lag * 1000:.0f}ms")
+        logger.info(" | ".join(rates))
+
+    def _read_events(self, loop):
+        while not self._stopping:
+            try:
+                event = self.events.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            except (EOFError, OSError):
+                return
+            loop.call_soon_threadsafe(self._inbox.put_nowait, event)
+
+    async def run(self, duration=None):
+        """Supervise until :meth:`stop`, or for `duration` seconds."""
+        loop = asyncio.get_running_loop()
+        self._inbox = asyncio.Queue()
+        for shard in range(self.workers):
+            self.start_worker(shard)
+        reader = threading.Thread(target=self._read_events, args=(loop,), daemon=True)
+        reader.start()
+        started = reported = published = time.monotonic()
+        try:
+            while not self._stopping:
+                if duration is not None and time.monotonic() - started >= duration:
+                    break
+                try:
+                    event = await asyncio.wait_for(self._inbox.get(), 0.5)
+                    self.handle(event)
+                    while not self._inbox.empty():
+                        self.handle(self._inbox.get_nowait())
+                except asyncio.TimeoutError:
+                    pass
+                self.release()
+                self.check()
+                if time.monotonic() - reported >= self.report_interval:
+                    self.report(time.monotonic() - reported)
+                    reported = time.monotonic()
+                if self.bus is not None and time.monotonic() - published >= self.status_interval:
+                    self.publish_market()
+                    published = time.monotonic()
+        finally:
+            await self.shutdown()
+
+    def stop(self):
+        self._stopping = True
+
+    async def shutdown(self):
+        self._stopping = True
+        # Flush what was received before the workers take their time to close.
+        for shard in list(self.shards):
+            self.merge.remove_shard(shard)
+        self.release()
+        for state in self.shards.values():
+            if state["process"].is_alive():
+                state["commands"].put(("stop",))
+        for state in self.shards.values():
+            await asyncio.to_thread(state["process"].join, 10)
+            if state["process"].is_alive():
+                state["process"].terminate()
+
+
+def serve_metrics(port):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            body = REGISTRY.render().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("0.0.0.0", port), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--workers", type=int, default=int(os.getenv("SHARD_WORKERS", 4)))
+    parser.add_argument("--assets", nargs="*", help="Fixed asset universe instead of every open asset.")
+    parser.add_argument("--otc-only", action="store_true")
+    parser.add_argument("--period", type=int, default=60)
+    parser.add_argument("--output", help="File receiving the merged stream as JSON lines, - for stdout.")
+    parser.add_argument(
+        "--bus", default=os.getenv("LUX_BUS"),
+        help="Publish ticks, closed bars and market status, e.g. unix:///tmp/pyquotex.sock or redis://host:6379."
+    )
+    parser.add_argument("--metrics-port", type=int, default=int(os.getenv("SHARD_METRICS_PORT", 0)))
+    parser.add_argument("--heartbeat-timeout", type=float, default=15.0)
+    parser.add_argument("--startup-timeout", type=float, default=120.0)
+    parser.add_argument("--restart-backoff", type=float, default=5.0)
+    parser.add_argument("--report-interval", type=float, default=10.0)
+    parser.add_argument("--flush-interval", type=float, default=0.1)
+    parser.add_argument(
+        "--max-delay", type=float, default=0.25,
+        help="Seconds a tick may take to reach its worker; later ones leave the merged order."
+    )
+    parser.add_argument("--session-root", default=SESSION_ROOT)
+    parser.add_argument("--client-factory", default=DEFAULT_FACTORY)
+    parser.add_argument("--log-level", default=os.getenv("SHARD_LOG_LEVEL", "INFO").upper())
+    return parser.parse_args(argv)
+
+
+async def main(argv=None):
+    args = parse_args(argv)
+    logging.basicConfig(level=args.log_level, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    from pyquotex.config import credentials
+    email, password = credentials()
+    options = {
+        "email": email,
+        "password": password,
+        "period": args.period,
+        "flush_interval": args.flush_interval,
+        "max_delay": args.max_delay,
+        "session_root": args.session_root,
+        "client_factory": args.client_factory,
+        "log_level": args.log_level,
+    }
+    output = None
+    if args.output == "-":
+        output = sys.stdout
+    elif args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        output = open(args.output, "a")
+    if args.metrics_port:
+        serve_metrics(args.metrics_port)
+    bus = await pubsub.open_bus(args.bus, serve=True) if args.bus else None
+    supervisor = Supervisor(
+        args.workers,
+        options,
+        assets=args.assets,
+        heartbeat_timeout=args.heartbeat_timeout,
+        startup_timeout=args.startup_timeout,
+        restart_backoff=args.restart_backoff,
+        report_interval=args.report_interval,
+        output=output,
+        bus=bus,
+        otc_only=args.otc_only,
+        period=args.period
+    )
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, supervisor.stop)
+    try:
+        await supervisor.run()
+    finally:
+        if output not in (None, sys.stdout):
+            output.close()
+        if bus is not None:
+            await bus.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
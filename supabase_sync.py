@@ -4,10 +4,16 @@ import time
 import asyncio
 from pathlib import Path
 from supabase_db import save_candles, cleanup_old_data, init_db
+from pyquotex.utils.bus import open_bus, CANDLE_CLOSE
 
 DATA_DIR = Path(__file__).parent / "data"
 RECENT_DIR = DATA_DIR / "recent"
 
+# Record the closed bars published by the ingest process instead of re-reading
+# data/recent every 10 minutes, e.g. LUX_BUS=unix:///tmp/pyquotex.sock
+BUS_URL = os.getenv("LUX_BUS")
+BATCH_SECONDS = 5
+
 async def sync_task():
     print("🚀 Starting Supabase Sync Engine...")
     init_db()
@@ -51,5 +57,35 @@ async def sync_task():
             print(f"⚠️ Sync Loop Error: {e}")
             await asyncio.sleep(30)
 
+async def record_task():
+    print(f"🚀 Starting Supabase Recorder on {BUS_URL}...")
+    init_db()
+    closes = (await open_bus(BUS_URL)).subscribe(CANDLE_CLOSE)
+    last_cleanup = time.time()
+
+    while True:
+        try:
+            # Wait for one bar, then take what else arrives within the batch window
+            _, c = await closes.get()
+            rows = [(c['asset'], c['time'], c['open'], c['high'], c['low'], c['close'])]
+            deadline = time.monotonic() + BATCH_SECONDS
+            while time.monotonic() < deadline:
+                try:
+                    _, c = await asyncio.wait_for(closes.get(), deadline - time.monotonic())
+                except asyncio.TimeoutError:
+                    break
+                rows.append((c['asset'], c['time'], c['open'], c['high'], c['low'], c['close']))
+
+            await asyncio.to_thread(save_candles, rows)
+            print(f"✅ Recorded {len(rows)} closed candles to Supabase.")
+
+            if time.time() - last_cleanup > 600:
+                await asyncio.to_thread(cleanup_old_data, days=30)
+                last_cleanup = time.time()
+
+        except Exception as e:
+            print(f"⚠️ Recorder Loop Error: {e}")
+            await asyncio.sleep(5)
+
 if __name__ == "__main__":
-    asyncio.run(sync_task())
+    asyncio.run(record_task() if BUS_URL else sync_task())
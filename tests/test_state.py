@@ -0,0 +1,38 @@
+import asyncio
+import threading
+
+from pyquotex.ws.state import ConnectionState, OPEN, AUTHORIZED, READY, CLOSED, CONNECTING
+
+
+def test_wait_survives_back_to_back_transitions():
+    async def run():
+        state = ConnectionState()
+        state.bind(asyncio.get_running_loop())
+        state.transition(OPEN)
+        waiter = asyncio.create_task(state.wait(READY, 2))
+        await asyncio.sleep(0)
+
+        def report():
+            state.transition(AUTHORIZED)
+            state.transition(READY)
+
+        thread = threading.Thread(target=report)
+        thread.start()
+        thread.join()
+        return await waiter
+
+    assert asyncio.run(run()) == READY
+
+
+def test_wait_ends_on_a_failure_already_left_behind():
+    async def run():
+        state = ConnectionState()
+        state.bind(asyncio.get_running_loop())
+        state.transition(CONNECTING)
+        waiter = asyncio.create_task(state.wait(READY, 2))
+        await asyncio.sleep(0)
+        state.transition(CLOSED)
+        state.transition(CONNECTING)
+        return await waiter
+
+    assert asyncio.run(run()) == CLOSED
@@ -0,0 +1,158 @@
+import json
+import time
+import asyncio
+import threading
+
+from pyquotex.api import QuotexAPI
+from pyquotex.stable_api import Quotex
+from pyquotex.ws.subscriptions import SubscriptionManager
+
+ASSET = "EURUSD_otc"
+
+
+class FakeAPI(object):
+    """Records the frames the sender thread sends; `hold` blocks it mid-batch."""
+
+    def __init__(self):
+        self.realtime_price = {}
+        self.realtime_candles = {}
+        self.frames = []
+        self.hold = None
+        self.entered = threading.Event()
+
+    def send_websocket_request(self, frame):
+        if self.hold is not None:
+            self.entered.set()
+            self.hold.wait(5)
+        self.frames.append(frame)
+
+
+def connected(rate=1000, burst=100):
+    api = FakeAPI()
+    manager = SubscriptionManager(api, rate=rate, burst=burst)
+    manager.on_authorized(api)
+    return api, manager
+
+
+def wait_frames(api, count, timeout=2):
+    deadline = time.monotonic() + timeout
+    while len(api.frames) < count and time.monotonic() < deadline:
+        time.sleep(0.005)
+    return api.frames
+
+
+def event(frame):
+    return json.loads(frame[2:])[0]
+
+
+def test_owners_share_a_stream():
+    manager = SubscriptionManager(FakeAPI())
+    assert manager.acquire(ASSET, 60, "dashboard")
+    assert not manager.acquire(ASSET, 60, "paper")
+    assert not manager.release(ASSET, owner="dashboard")
+    assert manager.live() == {(ASSET, 60): {"paper"}}
+    assert manager.release(ASSET, owner="paper")
+    assert manager.live() == {}
+
+
+def test_repeated_requests_are_deduplicated():
+    manager = SubscriptionManager(FakeAPI())
+    manager.acquire(ASSET, 60, "dashboard")
+    assert not manager.acquire(ASSET, 60, "dashboard")
+    manager.acquire(ASSET, 300, "dashboard")
+    stats = manager.stats()
+    # The second period only adds its instruments/update, the follow frames are queued once.
+    assert stats["pending_frames"] == 4
+    assert stats["frames_deduped"] == 2
+    manager.release(ASSET, owner="dashboard")
+    assert manager.stats()["pending_frames"] == 0
+
+
+def test_fetches_and_orders_do_not_pin_the_stream(tmp_path):
+    async def run():
+        client = Quotex(email="mock@localhost", password="mock", root_path=str(tmp_path))
+        api = QuotexAPI(
+            "127.0.0.1",
+            client.email,
+            client.password,
+            client.lang,
+            resource_path=client.resource_path,
+            subscriptions=client.subscriptions,
+            catalog=client.catalog
+        )
+        client.api = api
+        sent = []
+
+        def send(frame):
+            sent.append(frame)
+            if frame.startswith('42["orders/open"'):
+                order = json.loads(frame[2:])[1]
+                api.resolve_order_waiter({
+                    "id": "deal-1",
+                    "requestId": order["requestId"],
+                    "asset": order["asset"],
+                    "amount": order["amount"],
+                    "command": 0 if order["action"] == "call" else 1,
+                })
+
+        api.send_websocket_request = send
+        client.start_candles_stream(ASSET, 60, owner="dashboard")
+        client.request_chart("GBPUSD_otc", 60)
+        status, _ = await client.buy(1, ASSET, "call", 60)
+        await client.buy_many([(1, ASSET, "put", 60), (1, "AUDCAD_otc", "call", 60)])
+        live = client.subscriptions.live()
+        client.stop_candles_stream(ASSET, owner="dashboard")
+        return status, live, client.subscriptions.live(), sent
+
+    status, live, after, sent = asyncio.run(run())
+    assert status
+    assert live == {(ASSET, 60): {"dashboard"}}
+    assert after == {}
+    assert '42["instruments/update", {"asset": "GBPUSD_otc", "period": 60}]' in sent
+
+
+def test_reacquire_while_unsubscribe_is_being_sent():
+    api, manager = connected(burst=2)
+    manager.acquire(ASSET, 60)
+    wait_frames(api, 3)
+    api.hold = threading.Event()
+    manager.release(ASSET)
+    # The sender took subfor and depth/unfollow off the queue and is sending them.
+    assert api.entered.wait(2)
+    manager.acquire(ASSET, 60)
+    api.hold.set()
+    frames = wait_frames(api, 8)
+    assert [event(f) for f in frames[3:5]] == ["subfor", "depth/unfollow"]
+    assert sorted(event(f) for f in frames[5:]) == ["chart_notification/get", "depth/follow", "instruments/update"]
+
+
+def test_replay_sends_the_live_set():
+    api, manager = connected()
+    manager.acquire(ASSET, 60, "dashboard")
+    manager.acquire(ASSET, 300, "paper")
+    manager.acquire("GBPUSD_otc", 60, "dashboard")
+    manager.release("GBPUSD_otc", owner="dashboard")
+    wait_frames(api, 4)
+    time.sleep(0.05)
+    manager.on_disconnected(api)
+    api.frames = []
+    manager.on_authorized(api)
+    frames = wait_frames(api, 4)
+    time.sleep(0.05)
+    assert sorted(frames) == sorted([
+        f'42["instruments/update", {json.dumps({"asset": ASSET, "period": 60})}]',
+        f'42["instruments/update", {json.dumps({"asset": ASSET, "period": 300})}]',
+        f'42["chart_notification/get", {json.dumps({"asset": ASSET, "version": "1.0.0"})}]',
+        f'42["depth/follow", {json.dumps(ASSET)}]',
+    ])
+    assert manager.stats()["replays"] == 1
+
+
+def test_frames_are_paced():
+    api, manager = connected(rate=20, burst=2)
+    started = time.perf_counter()
+    manager.acquire(ASSET, 60)
+    manager.acquire("GBPUSD_otc", 60)
+    wait_frames(api, 6)
+    # Three batches of two, each followed by 2 / 20 s before the next one.
+    assert time.perf_counter() - started >= 0.2
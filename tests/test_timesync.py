@@ -0,0 +1,71 @@
+import math
+import time
+
+from pyquotex.ws.objects.timesync import TimeSync
+
+
+def pushes(sync, start, seconds, offset, delays):
+    """One push per second from `start`, the n-th arriving `delays[n % len(delays)]` late."""
+    for n in range(seconds):
+        received = start + n
+        sync.add_push(received - delays[n % len(delays)] + offset(received), received)
+
+
+def test_pushes_only_bound_the_offset_from_below():
+    sync = TimeSync()
+    start = time.time() - 5
+    pushes(sync, start, 5, lambda t: 2.0, [0.4, 0.05, 0.2])
+    # The least delayed frame of the bucket wins.
+    assert math.isclose(sync.offset, 1.95, abs_tol=1e-6)
+    assert sync.error_bound == math.inf
+    assert sync.drift == 0.0
+
+
+def test_acks_close_the_interval():
+    sync = TimeSync()
+    start = time.time() - 5
+    pushes(sync, start, 5, lambda t: 2.0, [0.4, 0.05, 0.2])
+    sent = start + 4.5
+    # Stamped 20 ms after sending, received 100 ms after sending.
+    sync.add_sample(sent + 0.02 + 2.0, sent, sent + 0.1)
+    # Lower bound from the fastest push, upper one from the ack.
+    assert math.isclose(sync.offset, (1.95 + 2.02) / 2, abs_tol=1e-6)
+    assert math.isclose(sync.error_bound, (2.02 - 1.95) / 2, abs_tol=1e-6)
+    assert abs(sync.now_server() - (time.time() + 2.0)) < sync.error_bound
+
+
+def test_drift_is_the_slope_of_the_bucket_minima():
+    sync = TimeSync(bucket_seconds=10, window_buckets=30)
+    # Aligned on the buckets, so each one holds a least delayed frame.
+    start = time.time() // 10 * 10 - 200
+    drift = 1e-4
+    pushes(sync, start, 200, lambda t: 1.0 + drift * (t - start), [0.3, 0.01, 0.12, 0.5, 0.07])
+    assert math.isclose(sync.drift, drift, rel_tol=0.05)
+    now = time.time()
+    expected = now + 1.0 + drift * (now - start) - 0.01
+    assert abs(sync.now_server() - expected) < 0.005
+
+
+def test_implausible_drift_is_ignored():
+    sync = TimeSync(max_drift=5e-4)
+    start = time.time() - 100
+    pushes(sync, start, 100, lambda t: 0.01 * (t - start), [0.01])
+    assert sync.drift == 0.0
+
+
+def test_disagreeing_bounds_trust_the_lower_envelope():
+    sync = TimeSync()
+    now = time.time()
+    sync.add_push(now + 3.0, now)
+    # An ack whose upper bound is below the pushes' lower bound, e.g. paired with the wrong send.
+    sync.add_sample(now + 2.5, now - 0.1, now)
+    assert math.isclose(sync.offset, 3.0, abs_tol=1e-3)
+    assert math.isclose(sync.error_bound, 3.0 - 2.6, abs_tol=1e-6)
+
+
+def test_responses_before_their_request_are_dropped():
+    sync = TimeSync()
+    now = time.time()
+    sync.add_sample(now + 1.0, now, now - 0.5)
+    assert sync.samples == 0
+    assert sync.error_bound == math.inf
@@ -0,0 +1,57 @@
+import asyncio
+
+from pyquotex.utils.trade_history import TradeHistory
+
+
+class FakeHistoryAPI(object):
+    """Paged trader history, newest first, like `/api/v1/cabinets/trades/history`."""
+
+    def __init__(self, count, per_page=10):
+        self.per_page = per_page
+        self.history = []
+        self.add(count)
+
+    def add(self, count):
+        base = len(self.history)
+        self.history = [{"ticket": f"t{base + i:03d}"} for i in reversed(range(count))] + self.history
+
+    async def get_trader_history(self, account_type, page):
+        start = (page - 1) * self.per_page
+        return self.history[start:start + self.per_page]
+
+
+def tickets(api):
+    return [trade["ticket"] for trade in api.history]
+
+
+def test_backfill_after_new_trades_shift_the_pages():
+    async def run():
+        api = FakeHistoryAPI(100)
+        history = TradeHistory(api, "demo")
+        await history.sync()
+        # 12 new trades: page 1 is all new and the known ones moved 1.2 pages down.
+        api.add(12)
+        assert await history.sync() == 12
+        await history.backfill()
+        return api, history
+
+    api, history = asyncio.run(run())
+    assert len(history) == 112
+    assert list(history.tickets) == tickets(api)
+    assert history.exhausted
+
+
+def test_backfill_resumes_below_the_shifted_depth():
+    async def run():
+        api = FakeHistoryAPI(100)
+        history = TradeHistory(api, "demo", concurrency=2)
+        await history.sync()
+        await history.backfill("t080")
+        api.add(25)
+        await history.sync()
+        found = await history.get("t000")
+        return api, history, found
+
+    api, history, found = asyncio.run(run())
+    assert found == {"ticket": "t000"}
+    assert list(history.tickets) == tickets(api)